@@ -1,5 +1,5 @@
 # PyTab module initializer
-from .descriptive import summarize_numeric
+from .descriptive import summarize_numeric, weighted_quantile, weighted_mean_std
 from .outliers import (
     zscore_series,
     detect_outliers_zscore,
@@ -9,6 +9,8 @@ from .outliers import (
 
 __all__ = [
     "summarize_numeric",
+    "weighted_quantile",
+    "weighted_mean_std",
     "zscore_series",
     "detect_outliers_zscore",
     "detect_outliers_iqr",
@@ -2,15 +2,148 @@
 pytab.stats.descriptive
 -----------------------
 Funções de estatística descritiva para DataFrames.
+
+Todas as funções aceitam pesos de frequência opcionais: cada linha conta
+como `peso` observações idênticas. Assim, dados pré-agregados (valor +
+contagem) podem ser analisados sem expandir as linhas com `np.repeat`.
 """
 
+from typing import Optional, Sequence, Union
+
+import numpy as np
 import pandas as pd
 
 
-def summarize_numeric(df: pd.DataFrame) -> pd.DataFrame:
+ArrayLike = Union[pd.Series, np.ndarray, Sequence[float]]
+
+
+def _clean_weighted(values: ArrayLike, weights: ArrayLike):
+    """
+    Converte valores e pesos para float, remove valores nulos e pesos
+    nulos/zerados. Pesos negativos, infinitos ou fracionários geram
+    ValueError: são pesos de frequência (contagens), não pesos amostrais.
+    """
+    x = np.asarray(values, dtype=float).ravel()
+    w = np.asarray(weights, dtype=float).ravel()
+
+    if x.shape != w.shape:
+        raise ValueError("Valores e pesos precisam ter o mesmo tamanho.")
+    if np.any(w < 0):
+        raise ValueError("Pesos de frequência não podem ser negativos.")
+
+    keep = ~np.isnan(x) & ~np.isnan(w) & (w > 0)
+    x, w = x[keep], w[keep]
+    if not np.all(np.isfinite(w) & (w == np.floor(w))):
+        raise ValueError(
+            "Pesos de frequência precisam ser inteiros (contagens de linhas idênticas); "
+            "pesos fracionários não são suportados."
+        )
+    return x, w
+
+
+def weighted_quantile(
+    values: ArrayLike,
+    weights: ArrayLike,
+    q: Union[float, Sequence[float]],
+) -> Union[float, np.ndarray]:
+    """
+    Quantis com pesos de frequência.
+
+    Usa a mesma interpolação linear do pandas (`Series.quantile`), de modo
+    que, para pesos inteiros, o resultado é idêntico ao de
+    `np.quantile(np.repeat(values, weights), q)` — sem materializar a
+    série expandida.
+
+    Retorna float para `q` escalar e np.ndarray para uma sequência de `q`.
+    """
+    x, w = _clean_weighted(values, weights)
+    q_arr = np.atleast_1d(np.asarray(q, dtype=float))
+
+    if x.size == 0:
+        out = np.full(q_arr.shape, np.nan)
+        return float(out[0]) if np.ndim(q) == 0 else out
+
+    order = np.argsort(x, kind="mergesort")
+    x = x[order]
+    cw = np.cumsum(w[order])
+    total = cw[-1]
+
+    # posição (base 0) na série expandida e seus vizinhos inteiros
+    h = (total - 1.0) * q_arr
+    lo = np.floor(h)
+    hi = np.minimum(lo + 1.0, max(total - 1.0, 0.0))
+    frac = h - lo
+
+    # a posição k da série expandida pertence ao primeiro bloco com cw > k
+    x_lo = x[np.minimum(np.searchsorted(cw, lo, side="right"), x.size - 1)]
+    x_hi = x[np.minimum(np.searchsorted(cw, hi, side="right"), x.size - 1)]
+
+    out = x_lo + frac * (x_hi - x_lo)
+    return float(out[0]) if np.ndim(q) == 0 else out
+
+
+def weighted_mean_std(
+    values: ArrayLike,
+    weights: ArrayLike,
+    ddof: int = 1,
+) -> tuple:
+    """
+    Retorna (n, média, desvio padrão) com pesos de frequência.
+
+    n é a soma dos pesos válidos; o desvio usa `n - ddof` no denominador,
+    como se cada linha fosse repetida `peso` vezes.
+    """
+    x, w = _clean_weighted(values, weights)
+    n = float(w.sum())
+
+    if n == 0:
+        return 0.0, np.nan, np.nan
+
+    mean = float(np.dot(w, x) / n)
+    if n - ddof <= 0:
+        return n, mean, np.nan
+
+    var = float(np.dot(w, (x - mean) ** 2) / (n - ddof))
+    return n, mean, float(np.sqrt(var))
+
+
+def _summarize_weighted(numeric_df: pd.DataFrame, w: pd.Series) -> pd.DataFrame:
+    rows = {}
+    w_values = w.to_numpy(dtype=float)
+
+    for col in numeric_df.columns:
+        x_all = numeric_df[col].to_numpy(dtype=float)
+        x, wx = _clean_weighted(x_all, w_values)
+        n, mean, std = weighted_mean_std(x, wx, ddof=1)
+        q1, median, q3 = weighted_quantile(x, wx, [0.25, 0.5, 0.75])
+
+        rows[col] = {
+            "count": n,
+            "missing": float(np.nansum(w_values[np.isnan(x_all)])),
+            "mean": mean,
+            "std": std,
+            "min": float(x.min()) if x.size else np.nan,
+            "q1": q1,
+            "median": median,
+            "q3": q3,
+            "max": float(x.max()) if x.size else np.nan,
+        }
+
+    return pd.DataFrame.from_dict(rows, orient="index")
+
+
+def summarize_numeric(
+    df: pd.DataFrame,
+    weights: Optional[str] = None,
+) -> pd.DataFrame:
     """
     Gera estatísticas descritivas para colunas numéricas de um DataFrame.
 
+    weights:
+        nome opcional de uma coluna de pesos de frequência (ex.: contagem
+        de dados pré-agregados). A coluna de pesos não é sumarizada e
+        `count`/`missing` passam a ser somas de pesos.
+
     Retorna um DataFrame com:
         - count: número de valores não nulos
         - missing: número de valores nulos
@@ -28,27 +161,37 @@ def summarize_numeric(df: pd.DataFrame) -> pd.DataFrame:
 
     numeric_df = df.select_dtypes(include="number")
 
+    if weights is not None:
+        if weights not in df.columns:
+            raise ValueError(f"Coluna de pesos '{weights}' não existe no DataFrame.")
+        numeric_df = numeric_df.drop(columns=[weights], errors="ignore")
+
     if numeric_df.empty:
         return pd.DataFrame()
 
-    desc = numeric_df.describe(percentiles=[0.25, 0.5, 0.75]).T
-
-    # Renomeia colunas para nomes mais claros
-    desc = desc.rename(
-        columns={
-            "count": "count",
-            "mean": "mean",
-            "std": "std",
-            "min": "min",
-            "25%": "q1",
-            "50%": "median",
-            "75%": "q3",
-            "max": "max",
-        }
-    )
+    if weights is not None:
+        w = pd.to_numeric(df[weights], errors="coerce")
+        desc = _summarize_weighted(numeric_df, w)
+    else:
+        desc = numeric_df.describe(percentiles=[0.25, 0.5, 0.75]).T
+
+        # Renomeia colunas para nomes mais claros
+        desc = desc.rename(
+            columns={
+                "count": "count",
+                "mean": "mean",
+                "std": "std",
+                "min": "min",
+                "25%": "q1",
+                "50%": "median",
+                "75%": "q3",
+                "max": "max",
+            }
+        )
+
+        desc["missing"] = numeric_df.isna().sum()
 
-    # Calcula missing e coeficiente de variação
-    desc["missing"] = numeric_df.isna().sum()
+    # Calcula coeficiente de variação
     desc["cv"] = desc["std"] / desc["mean"]
 
     # Reordena colunas
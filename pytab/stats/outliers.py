@@ -2,17 +2,42 @@
 pytab.stats.outliers
 --------------------
 Funções para cálculo de z-score e detecção de outliers.
+
+Todas as funções aceitam `weights` (pesos de frequência alinhados à série),
+para dados pré-agregados. Nesse caso as contagens do resumo são somas de
+pesos e a máscara continua sendo por linha; linhas com peso 0 ou ausente
+nunca são marcadas como outlier. Os pesos precisam ser inteiros.
 """
 
-from typing import Literal, Dict, Any
+from typing import Literal, Dict, Any, Optional
 
 import numpy as np
 import pandas as pd
 
+from .descriptive import weighted_mean_std, weighted_quantile
+
+
+def _align_weights(s: pd.Series, weights: Optional[pd.Series]) -> Optional[pd.Series]:
+    """Alinha os pesos ao índice da série (pesos ausentes valem 0)."""
+    if weights is None:
+        return None
+    if not isinstance(weights, pd.Series):
+        weights = pd.Series(np.asarray(weights, dtype=float), index=s.index)
+    return pd.to_numeric(weights, errors="coerce").reindex(s.index).fillna(0.0)
+
+
+def _count(s: pd.Series, w: Optional[pd.Series], mask: Optional[pd.Series] = None) -> float:
+    """Número de observações válidas (ou soma dos pesos) — opcionalmente sob máscara."""
+    valid = s.notna() if mask is None else (s.notna() & mask)
+    if w is None:
+        return int(valid.sum())
+    return float(w[valid].sum())
+
 
 def zscore_series(
     s: pd.Series,
-    ddof: int = 1
+    ddof: int = 1,
+    weights: Optional[pd.Series] = None,
 ) -> pd.Series:
     """
     Calcula o z-score de uma série numérica.
@@ -22,11 +47,18 @@ def zscore_series(
     ddof:
         0 -> desvio populacional
         1 -> desvio amostral
+
+    weights:
+        pesos de frequência opcionais; média e desvio passam a ser ponderados.
     """
     s = pd.to_numeric(s, errors="coerce")
+    w = _align_weights(s, weights)
 
-    mean = s.mean()
-    std = s.std(ddof=ddof)
+    if w is None:
+        mean = s.mean()
+        std = s.std(ddof=ddof)
+    else:
+        _, mean, std = weighted_mean_std(s, w, ddof=ddof)
 
     if std == 0 or np.isnan(std):
         # Tudo igual ou série vazia: z-score não faz sentido
@@ -40,7 +72,8 @@ def zscore_series(
 def detect_outliers_zscore(
     s: pd.Series,
     threshold: float = 3.0,
-    ddof: int = 1
+    ddof: int = 1,
+    weights: Optional[pd.Series] = None,
 ) -> Dict[str, Any]:
     """
     Detecta outliers em uma série numérica usando z-score.
@@ -54,21 +87,24 @@ def detect_outliers_zscore(
         - outliers: DataFrame com índice original, valor e z-score
         - summary: dict com resumo (n, n_outliers, pct_outliers, threshold)
     """
-    z = zscore_series(s, ddof=ddof)
+    z = zscore_series(s, ddof=ddof, weights=weights)
+    w = _align_weights(s, weights)
     mask = z.abs() >= threshold
+    if w is not None:
+        mask &= w > 0
 
     outliers_df = pd.DataFrame({
         "value": s,
         "zscore": z,
     }).loc[mask]
 
-    n = s.notna().sum()
-    n_out = mask.sum()
+    n = _count(s, w)
+    n_out = _count(s, w, mask)
     pct_out = (n_out / n * 100) if n > 0 else 0.0
 
     summary = {
-        "n": int(n),
-        "n_outliers": int(n_out),
+        "n": n,
+        "n_outliers": n_out,
         "pct_outliers": round(pct_out, 2),
         "threshold": threshold,
     }
@@ -83,7 +119,8 @@ def detect_outliers_zscore(
 
 def detect_outliers_iqr(
     s: pd.Series,
-    factor: float = 1.5
+    factor: float = 1.5,
+    weights: Optional[pd.Series] = None,
 ) -> Dict[str, Any]:
     """
     Detecta outliers usando o método do IQR (Interquartile Range).
@@ -99,8 +136,13 @@ def detect_outliers_iqr(
         - summary: dict com n, n_outliers, pct_outliers, factor
     """
     s = pd.to_numeric(s, errors="coerce")
-    q1 = s.quantile(0.25)
-    q3 = s.quantile(0.75)
+    w = _align_weights(s, weights)
+
+    if w is None:
+        q1 = s.quantile(0.25)
+        q3 = s.quantile(0.75)
+    else:
+        q1, q3 = weighted_quantile(s, w, [0.25, 0.75])
     iqr = q3 - q1
 
     if pd.isna(iqr) or iqr == 0:
@@ -117,7 +159,7 @@ def detect_outliers_iqr(
             "outliers": pd.DataFrame(columns=["value"]),
             "bounds": bounds,
             "summary": {
-                "n": int(s.notna().sum()),
+                "n": _count(s, w),
                 "n_outliers": 0,
                 "pct_outliers": 0.0,
                 "factor": factor,
@@ -128,13 +170,15 @@ def detect_outliers_iqr(
     upper = q3 + factor * iqr
 
     mask = (s < lower) | (s > upper)
+    if w is not None:
+        mask &= w > 0
 
     outliers_df = pd.DataFrame({
         "value": s,
     }).loc[mask]
 
-    n = s.notna().sum()
-    n_out = mask.sum()
+    n = _count(s, w)
+    n_out = _count(s, w, mask)
     pct_out = (n_out / n * 100) if n > 0 else 0.0
 
     bounds = {
@@ -146,8 +190,8 @@ def detect_outliers_iqr(
     }
 
     summary = {
-        "n": int(n),
-        "n_outliers": int(n_out),
+        "n": n,
+        "n_outliers": n_out,
         "pct_outliers": round(pct_out, 2),
         "factor": factor,
     }
@@ -166,6 +210,7 @@ def detect_outliers(
     threshold: float = 3.0,
     factor: float = 1.5,
     ddof: int = 1,
+    weights: Optional[pd.Series] = None,
 ) -> Dict[str, Any]:
     """
     Função de alto nível para detecção de outliers em uma série.
@@ -173,10 +218,13 @@ def detect_outliers(
     method:
         - "zscore": usa detect_outliers_zscore
         - "iqr": usa detect_outliers_iqr
+
+    weights:
+        pesos de frequência opcionais, repassados ao método escolhido.
     """
     if method == "zscore":
-        return detect_outliers_zscore(s, threshold=threshold, ddof=ddof)
+        return detect_outliers_zscore(s, threshold=threshold, ddof=ddof, weights=weights)
     elif method == "iqr":
-        return detect_outliers_iqr(s, factor=factor)
+        return detect_outliers_iqr(s, factor=factor, weights=weights)
     else:
         raise ValueError(f"Método de outlier não suportado: {method}")
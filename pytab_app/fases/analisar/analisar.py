@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 import streamlit as st
 
@@ -11,17 +12,68 @@ from pytab_app.modules.testes_estatisticos import (
     teste_t_pareado,
     narrativa_t,
     anova_oneway,
+    anova_welch,
     narrativa_anova,
     teste_quiquadrado,
     narrativa_quiquadrado,
+    matriz_quiquadrado,
+    heatmap_associacao_figure,
     teste_normalidade,
     qqplot_figure,
     narrativa_normalidade,
+    testes_em_lote,
+    teste_mann_whitney,
+    teste_wilcoxon,
+    kruskal_wallis,
+    narrativa_nao_parametrico,
+    posthoc_comparacoes,
+    narrativa_posthoc,
+)
+from pytab_app.modules.testes_permutacao import (
+    permutacao_duas_amostras,
+    permutacao_pareado,
+    permutacao_anova,
+    narrativa_permutacao,
+)
+from pytab_app.modules.triagem_alvo import triagem_alvo, narrativa_triagem
+from pytab_app.modules.poder_amostral import (
+    tamanho_amostral,
+    efeito_proporcoes,
+    grade_poder,
+    curva_poder_figure,
+    narrativa_poder,
 )
 
 apply_pytab_theme()
 
 
+def _painel_poder(teste: str, chave: str, efeito_padrao: float = 0.5, k: int | None = None) -> None:
+    """Tamanho amostral e curva de poder × n para o teste selecionado."""
+    c1, c2, c3 = st.columns(3)
+    if teste == "proporcoes":
+        p1 = c1.number_input("Proporção no grupo 1", 0.0, 1.0, 0.30, 0.01, key=f"{chave}_p1")
+        p2 = c1.number_input("Proporção no grupo 2", 0.0, 1.0, 0.20, 0.01, key=f"{chave}_p2")
+        efeito = float(abs(efeito_proporcoes(p1, p2)))
+    else:
+        rotulo = "Efeito mínimo (f de Cohen)" if teste == "anova" else "Efeito mínimo (d de Cohen)"
+        efeito = c1.number_input(
+            rotulo, min_value=0.01, value=round(max(abs(efeito_padrao), 0.01), 2), step=0.05,
+            key=f"{chave}_efeito",
+        )
+    alpha = c2.number_input("α", 0.001, 0.2, 0.05, 0.01, format="%.3f", key=f"{chave}_alpha")
+    poder = c3.number_input("Poder alvo", 0.5, 0.99, 0.80, 0.05, key=f"{chave}_poder")
+
+    params = {"k": k} if teste == "anova" else {}
+    n_nec = float(tamanho_amostral(teste, poder=poder, efeito=efeito, alpha=alpha, **params))
+    st.markdown(narrativa_poder(teste, efeito, n_nec, poder=poder, alpha=alpha, k=k))
+
+    # curva: efeito informado e dois vizinhos, até ~1,5× o n necessário
+    n_max = int(min(max(1.5 * n_nec, 20), 100_000)) if not np.isnan(n_nec) else 1_000
+    n_grade = np.unique(np.linspace(2, n_max, 300).astype(int))
+    grade = grade_poder(teste, n=n_grade, efeito=[efeito * 0.5, efeito, efeito * 1.5], alpha=alpha, **params)
+    st.plotly_chart(curva_poder_figure(grade, poder_alvo=poder), use_container_width=True)
+
+
 def fase_analisar(df: pd.DataFrame) -> None:
     st.header("Fase Analisar — Identificação de causas")
 
@@ -31,6 +83,7 @@ def fase_analisar(df: pd.DataFrame) -> None:
             "Pareto",
             "Regressão",
             "Testes estatísticos",
+            "Triagem por KPI",
             "Narrativa automática",
         ]
     )
@@ -78,8 +131,14 @@ def fase_analisar(df: pd.DataFrame) -> None:
                 "Teste t — 2 amostras",
                 "Teste t — Pareado",
                 "ANOVA One-Way",
+                "Mann–Whitney (2 amostras, não paramétrico)",
+                "Wilcoxon (pareado, não paramétrico)",
+                "Kruskal–Wallis (não paramétrico)",
                 "Qui-Quadrado",
+                "Associação entre categóricas (matriz)",
                 "Normalidade",
+                "Triagem em lote (t / ANOVA)",
+                "Poder e tamanho amostral (planejamento)",
             ],
         )
 
@@ -123,6 +182,13 @@ def fase_analisar(df: pd.DataFrame) -> None:
                     res = teste_t_uma_amostra(df[col], mu0)
                     st.markdown(narrativa_t(res, "1-amostra"))
 
+                    with st.expander("Poder e tamanho amostral"):
+                        sd = float(s.std(ddof=1)) if len(s) > 1 else 0.0
+                        _painel_poder(
+                            "uma_amostra", "pw_t1",
+                            efeito_padrao=(mean_obs - mu0) / sd if sd > 0 else 0.5,
+                        )
+
         # ---------------------- TESTE t 2 AMOSTRAS ----------------------
         elif tipo == "Teste t — 2 amostras":
             if not num_cols or not cat_cols:
@@ -148,6 +214,16 @@ def fase_analisar(df: pd.DataFrame) -> None:
                         res = teste_t_duas_amostras(g1, g2)
                         st.markdown(narrativa_t(res, "2-amostras"))
 
+                        if st.checkbox("Calcular também o p-valor por permutação", key="perm_t2"):
+                            st.markdown(narrativa_permutacao(permutacao_duas_amostras(g1, g2, seed=42)))
+
+                        with st.expander("Poder e tamanho amostral"):
+                            d_obs = 0.5
+                            if res.get("std1") and res.get("std2"):
+                                sd = np.sqrt((res["std1"] ** 2 + res["std2"] ** 2) / 2.0)
+                                d_obs = (res["mean1"] - res["mean2"]) / sd if sd > 0 else 0.5
+                            _painel_poder("duas_amostras", "pw_t2", efeito_padrao=d_obs)
+
         # ---------------------- TESTE t PAREADO ----------------------
         elif tipo == "Teste t — Pareado":
             if len(num_cols) < 2:
@@ -163,6 +239,14 @@ def fase_analisar(df: pd.DataFrame) -> None:
                 res = teste_t_pareado(df[col1], df[col2])
                 st.markdown(narrativa_t(res, "pareado"))
 
+                if st.checkbox("Calcular também o p-valor por permutação", key="perm_par"):
+                    st.markdown(narrativa_permutacao(permutacao_pareado(df[col1], df[col2], seed=42)))
+
+                with st.expander("Poder e tamanho amostral"):
+                    dif = (df[col1] - df[col2]).dropna()
+                    sd = float(dif.std(ddof=1)) if len(dif) > 1 else 0.0
+                    _painel_poder("pareado", "pw_par", efeito_padrao=float(dif.mean()) / sd if sd > 0 else 0.5)
+
         # ---------------------- ANOVA ----------------------
         elif tipo == "ANOVA One-Way":
             if not num_cols or not cat_cols:
@@ -170,17 +254,93 @@ def fase_analisar(df: pd.DataFrame) -> None:
             else:
                 numcol = st.selectbox("Variável numérica", num_cols)
                 cat = st.selectbox("Variável categórica (fatores)", cat_cols)
+                welch = st.checkbox(
+                    "Variâncias desiguais entre grupos (ANOVA de Welch)",
+                    value=False,
+                )
 
                 try:
-                    res = anova_oneway(df, numcol, cat)
+                    res = anova_welch(df, numcol, cat) if welch else anova_oneway(df, numcol, cat)
                     if "anova" in res:
                         st.write(res["anova"])
                     elif "anova_table" in res:
                         st.write(res["anova_table"])
                     st.markdown(narrativa_anova(res))
+
+                    if st.checkbox("Calcular também o p-valor por permutação", key="perm_anova"):
+                        st.markdown(narrativa_permutacao(permutacao_anova(df, numcol, cat, seed=42)))
+
+                    with st.expander("Poder e tamanho amostral"):
+                        k_grupos = int(df[cat].nunique())
+                        f_obs = 0.25
+                        tabela_anova = res.get("anova_table")
+                        if tabela_anova is not None:
+                            ss = tabela_anova["sum_sq"].to_numpy(dtype=float)
+                            f_obs = float(np.sqrt(ss[0] / ss[1])) if ss[1] > 0 else 0.25
+                        _painel_poder("anova", "pw_anova", efeito_padrao=f_obs, k=max(k_grupos, 2))
+
+                    if res.get("p_value") is not None and res["p_value"] < 0.05:
+                        metodo_ph = st.selectbox(
+                            "Comparações post-hoc (todos os pares)",
+                            ["Tukey HSD", "Games–Howell (variâncias desiguais)"],
+                            index=1 if welch else 0,
+                        )
+                        ph = posthoc_comparacoes(
+                            df, numcol, cat,
+                            metodo="tukey" if metodo_ph == "Tukey HSD" else "games_howell",
+                        )
+                        st.dataframe(ph, use_container_width=True)
+                        st.markdown(narrativa_posthoc(ph))
                 except Exception as e:
                     st.error(f"Erro ao executar ANOVA: {e}")
 
+        # ---------------------- MANN–WHITNEY ----------------------
+        elif tipo == "Mann–Whitney (2 amostras, não paramétrico)":
+            if not num_cols or not cat_cols:
+                st.warning("É necessário ter ao menos uma variável numérica e uma categórica.")
+            else:
+                numcol = st.selectbox("Variável numérica", num_cols, key="mw_num")
+                cat = st.selectbox("Variável categórica (grupos)", cat_cols, key="mw_cat")
+
+                grupos = df[cat].dropna().unique()
+                if len(grupos) < 2:
+                    st.warning("A variável categórica selecionada precisa ter pelo menos 2 grupos.")
+                else:
+                    g1_label = st.selectbox("Grupo 1", grupos, index=0, key="mw_g1")
+                    g2_label = st.selectbox(
+                        "Grupo 2", [g for g in grupos if g != g1_label], index=0, key="mw_g2"
+                    )
+                    res = teste_mann_whitney(
+                        df[df[cat] == g1_label][numcol],
+                        df[df[cat] == g2_label][numcol],
+                    )
+                    st.markdown(narrativa_nao_parametrico(res))
+
+        # ---------------------- WILCOXON ----------------------
+        elif tipo == "Wilcoxon (pareado, não paramétrico)":
+            if len(num_cols) < 2:
+                st.warning("São necessárias pelo menos duas variáveis numéricas.")
+            else:
+                col1 = st.selectbox("Primeira variável", num_cols, index=0, key="wx_1")
+                col2 = st.selectbox(
+                    "Segunda variável", [c for c in num_cols if c != col1], index=0, key="wx_2"
+                )
+                res = teste_wilcoxon(df[col1], df[col2])
+                st.markdown(narrativa_nao_parametrico(res))
+
+        # ---------------------- KRUSKAL–WALLIS ----------------------
+        elif tipo == "Kruskal–Wallis (não paramétrico)":
+            if not num_cols or not cat_cols:
+                st.warning("É necessário ter ao menos uma variável numérica e uma categórica.")
+            else:
+                numcol = st.selectbox("Variável numérica", num_cols, key="kw_num")
+                cat = st.selectbox("Variável categórica (fatores)", cat_cols, key="kw_cat")
+                try:
+                    res = kruskal_wallis(df, numcol, cat)
+                    st.markdown(narrativa_nao_parametrico(res))
+                except Exception as e:
+                    st.error(f"Erro ao executar Kruskal–Wallis: {e}")
+
         # ---------------------- QUI-QUADRADO ----------------------
         elif tipo == "Qui-Quadrado":
             if len(cat_cols) < 2:
@@ -196,21 +356,119 @@ def fase_analisar(df: pd.DataFrame) -> None:
                     st.write(res["table"])
                 st.markdown(narrativa_quiquadrado(res))
 
+        # ---------------------- MATRIZ DE ASSOCIAÇÃO ----------------------
+        elif tipo == "Associação entre categóricas (matriz)":
+            if len(cat_cols) < 2:
+                st.warning("São necessárias pelo menos duas variáveis categóricas.")
+            else:
+                cols = st.multiselect("Variáveis categóricas", cat_cols, default=cat_cols, key="assoc_cols")
+                if len(cols) >= 2:
+                    res = matriz_quiquadrado(df, cols)
+                    st.plotly_chart(heatmap_associacao_figure(res["cramers_v"]), use_container_width=True)
+                    st.caption("p-valores do teste Qui-Quadrado para cada par de variáveis:")
+                    st.dataframe(res["p_value"].round(4), use_container_width=True)
+
         # ---------------------- NORMALIDADE ----------------------
         elif tipo == "Normalidade":
             if not num_cols:
                 st.warning("Não há colunas numéricas para testar normalidade.")
             else:
                 col = st.selectbox("Variável numérica", num_cols)
-                res = teste_normalidade(df[col])
+                metodos = {
+                    "Automático (pelo tamanho da amostra)": "auto",
+                    "Shapiro–Wilk": "shapiro",
+                    "Anderson–Darling": "anderson",
+                    "D'Agostino K²": "dagostino",
+                    "Jarque–Bera": "jarque_bera",
+                }
+                metodo = st.selectbox("Teste", list(metodos))
+                res = teste_normalidade(df[col], metodo=metodos[metodo])
                 st.markdown(narrativa_normalidade(res))
                 fig = qqplot_figure(df[col])
                 st.plotly_chart(fig, use_container_width=True)
 
+        # ---------------------- TRIAGEM EM LOTE ----------------------
+        elif tipo == "Triagem em lote (t / ANOVA)":
+            if not num_cols or not cat_cols:
+                st.warning("É necessário ter ao menos uma variável numérica e uma categórica.")
+            else:
+                cat = st.selectbox("Variável categórica (grupos)", cat_cols, key="lote_cat")
+                cols = st.multiselect("Variáveis numéricas", num_cols, default=num_cols, key="lote_cols")
+
+                correcoes = {
+                    "Nenhuma": None,
+                    "Holm (FWER)": "holm",
+                    "Benjamini–Hochberg (FDR)": "bh",
+                    "Bonferroni": "bonferroni",
+                }
+                correcao = st.selectbox("Correção para múltiplos testes", list(correcoes), index=1, key="lote_corr")
+
+                if cols:
+                    try:
+                        res = testes_em_lote(df, cat, cols, correcao=correcoes[correcao])
+                        st.caption(
+                            "Teste t de Welch para cada par de grupos e ANOVA One-Way para cada variável, "
+                            "ordenados pelo p-valor."
+                        )
+                        st.dataframe(res.sort_values("p_value"), use_container_width=True)
+                    except Exception as e:
+                        st.error(f"Erro na triagem em lote: {e}")
+
+        # ---------------------- PODER E TAMANHO AMOSTRAL ----------------------
+        elif tipo == "Poder e tamanho amostral (planejamento)":
+            st.caption(
+                "Use antes de coletar dados: quantas observações são necessárias para detectar "
+                "o menor efeito que importa para o processo."
+            )
+            testes_poder = {
+                "Teste t — 2 amostras": "duas_amostras",
+                "Teste t — 1 amostra": "uma_amostra",
+                "Teste t — Pareado": "pareado",
+                "ANOVA One-Way": "anova",
+                "Duas proporções (ex.: taxa de defeitos)": "proporcoes",
+            }
+            escolha = st.selectbox("Teste planejado", list(testes_poder), key="pw_teste")
+            teste = testes_poder[escolha]
+            k = None
+            if teste == "anova":
+                k = int(st.number_input("Número de grupos", min_value=2, value=3, step=1, key="pw_k"))
+            _painel_poder(teste, "pw_plan", efeito_padrao=0.25 if teste == "anova" else 0.5, k=k)
+
     # ============================================================
-    # ABA 5 — NARRATIVA AUTOMÁTICA (CONSOLIDADA)
+    # ABA 5 — TRIAGEM POR KPI
     # ============================================================
     with abas[4]:
+        st.subheader("Triagem de variáveis contra um KPI")
+        st.caption(
+            "Ordena todas as demais colunas pela força de associação com o KPI: Pearson/Spearman "
+            "para numéricas, ponto-bisserial para flags e η² (ANOVA) para categóricas."
+        )
+
+        if not num_cols:
+            st.warning("É necessário ter ao menos uma variável numérica para usar como KPI.")
+        else:
+            alvo = st.selectbox("KPI (variável alvo)", num_cols, key="triagem_alvo")
+            c1, c2 = st.columns(2)
+            metodo_num = c1.selectbox("Medida para numéricas", ["pearson", "spearman"], key="triagem_metodo")
+            correcoes = {
+                "Benjamini–Hochberg (FDR)": "bh",
+                "Holm (FWER)": "holm",
+                "Bonferroni": "bonferroni",
+                "Nenhuma": None,
+            }
+            correcao = c2.selectbox("Correção para múltiplos testes", list(correcoes), key="triagem_corr")
+
+            try:
+                tabela = triagem_alvo(df, alvo, metodo=metodo_num, correcao=correcoes[correcao])
+                st.markdown(narrativa_triagem(tabela, alvo))
+                st.dataframe(tabela.round({"valor": 4, "forca": 4}), use_container_width=True, hide_index=True)
+            except Exception as e:
+                st.error(f"Erro na triagem: {e}")
+
+    # ============================================================
+    # ABA 6 — NARRATIVA AUTOMÁTICA (CONSOLIDADA)
+    # ============================================================
+    with abas[5]:
         st.subheader("Narrativa automática consolidada (em desenvolvimento)")
         st.info(
             "Aqui o PyTab vai integrar os principais achados de Correlação, Pareto, "
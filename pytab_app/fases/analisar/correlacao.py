@@ -4,61 +4,144 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 import streamlit as st
 from pytab.charts.theme import apply_pytab_theme
+from pytab_app.modules.correlacoes import (
+    acumular_comomentos,
+    correlacao_de_comomentos,
+    correlacao_parcial,
+    maiores_correlacoes,
+    matriz_correlacao,
+    ordem_agrupada,
+    significancia_correlacao,
+)
+from pytab_app.modules.testes_estatisticos import _fmt_num_user, _fmt_p_user
 
 apply_pytab_theme()
 
 PRIMARY = "#1f77b4"
 SECONDARY = "#ec7f00"
 
+# Acima deste número de colunas o heatmap fica ilegível: mostra-se só o ranking
+LIMITE_HEATMAP = 30
 
-def calcular_correlacao(df: pd.DataFrame) -> pd.DataFrame:
+
+def calcular_correlacao(
+    df,
+    metodo: str = "pearson",
+    precisao: str = "float64",
+    bloco: int | None = None,
+) -> pd.DataFrame:
     """
     Retorna:
       - matriz de correlação (pandas.DataFrame)
       - par de maior correlação entre variáveis distintas
       - valor da correlação
-    """
-    num_cols = df.select_dtypes(include=["number"]).columns.tolist()
 
-    if len(num_cols) < 2:
-        return None, None, None
-
-    corr = df[num_cols].corr()
+    df:
+      um DataFrame, um acumulador de co-momentos (`acumular_comomentos`)
+      ou um iterável de DataFrames em blocos (`pd.read_csv(chunksize=...)`,
+      consultas paginadas). Os dois últimos não concatenam os dados e
+      aceitam apenas Pearson.
+    metodo:
+      "pearson", "spearman" (relações monótonas, robusta a outliers)
+      ou "kendall".
+    precisao / bloco:
+      repassados a `matriz_correlacao` ("float32" e blocos de colunas
+      para tabelas muito largas).
+    """
+    if isinstance(df, pd.DataFrame):
+        num_cols = df.select_dtypes(include=["number"]).columns.tolist()
+        if len(num_cols) < 2:
+            return None, None, None
+        corr = matriz_correlacao(df, num_cols, metodo=metodo, precisao=precisao, bloco=bloco)
+    else:
+        if metodo != "pearson":
+            raise ValueError("Dados em blocos aceitam apenas correlação de Pearson (postos exigem todos os dados).")
+        acumulado = df if isinstance(df, dict) else acumular_comomentos(df)
+        if acumulado is None or len(acumulado["colunas"]) < 2:
+            return None, None, None
+        num_cols = acumulado["colunas"]
+        corr = correlacao_de_comomentos(acumulado)
 
-    corr_abs = corr.abs().copy()
-    # Remove diagonal (correlação da variável com ela mesma)
-    np.fill_diagonal(corr_abs.values, np.nan)
+    # Maior |r| no triângulo superior (sem a diagonal)
+    i, j = np.triu_indices(len(num_cols), k=1)
+    abs_r = np.abs(corr.to_numpy()[i, j])
 
     # Caso especial: nenhuma correlação válida
-    if corr_abs.isna().all().all():
+    if np.isnan(abs_r).all():
         return corr, None, None
 
-    # Encontrar maior correlação |valor|
-    idx_max = corr_abs.unstack().idxmax()
-    var1, var2 = idx_max
+    pos = int(np.nanargmax(abs_r))
+    var1, var2 = num_cols[i[pos]], num_cols[j[pos]]
     maior = corr.loc[var1, var2]
 
     return corr, (var1, var2), maior
 
 
-def classificar_correlacao(valor: float) -> str:
+def classificar_correlacao(
+    valor: float,
+    n: int | None = None,
+    p_value: float | None = None,
+    alpha: float = 0.05,
+    metodo: str = "pearson",
+) -> str:
     """
     Retorna uma classificação textual da correlação.
+
+    Com `n` (pares válidos) ou `p_value`, a intensidade é qualificada pela
+    significância: em amostras pequenas, um |r| alto sem significância
+    vira "forte, mas não significativa" em vez de "forte".
     """
-    if valor is None:
+    if valor is None or (isinstance(valor, float) and np.isnan(valor)):
         return "sem correlação relevante"
 
     v = abs(valor)
     if v < 0.2:
-        return "muito fraca"
+        forca = "muito fraca"
     elif v < 0.4:
-        return "fraca"
+        forca = "fraca"
     elif v < 0.6:
-        return "moderada"
+        forca = "moderada"
     elif v < 0.8:
-        return "forte"
+        forca = "forte"
     else:
-        return "muito forte"
+        forca = "muito forte"
+
+    if n is not None and n < 3:
+        return f"indeterminada (apenas {int(n)} pares válidos)"
+    if p_value is None and n is not None:
+        p_value = significancia_correlacao(valor, n, metodo)["p_value"]
+    if p_value is not None and not np.isnan(p_value) and p_value >= alpha:
+        return f"{forca}, mas não significativa"
+    return forca
+
+
+def _anotacoes_significancia(corr: pd.DataFrame, p_value: pd.DataFrame) -> np.ndarray:
+    """Rótulos do heatmap: r com 2 casas + asteriscos de significância."""
+    p = p_value.to_numpy()
+    estrelas = np.select([p < 0.001, p < 0.01, p < 0.05], ["***", "**", "*"], default="")
+    np.fill_diagonal(estrelas, "")
+    valores = np.char.mod("%.2f", np.nan_to_num(corr.to_numpy(), nan=0.0))
+    rotulos = np.char.add(valores, estrelas)
+    return np.where(np.isnan(corr.to_numpy()), "", rotulos)
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _matrizes_heatmap(df: pd.DataFrame, colunas: tuple, metodo: str) -> dict:
+    """
+    Tudo o que o heatmap precisa, calculado uma vez por dataset, conjunto
+    de colunas e método: trocar a vista (total/parcial) ou a ordem não
+    recalcula nada.
+    """
+    corr, n_pares = matriz_correlacao(df, list(colunas), metodo=metodo, retornar_n=True)
+    parcial = correlacao_parcial(corr)
+    n_controle = max(int((~np.isnan(np.diagonal(parcial.to_numpy()))).sum()) - 2, 0)
+    return {
+        "corr": corr,
+        "p_value": significancia_correlacao(corr, n_pares, metodo)["p_value"],
+        "parcial": parcial,
+        "p_parcial": significancia_correlacao(parcial, n_pares, metodo, n_controle=n_controle)["p_value"],
+        "ordem": ordem_agrupada(corr),
+    }
 
 
 def direcao(valor: float) -> str:
@@ -74,33 +157,104 @@ def mostrar_correlacao_streamlit(df: pd.DataFrame):
     """
     st.subheader("Correlação entre Variáveis Numéricas")
 
-    corr, par, valor = calcular_correlacao(df)
+    metodos = {
+        "Pearson (linear)": "pearson",
+        "Spearman (monótona, por postos)": "spearman",
+        "Kendall (tau-b, por postos)": "kendall",
+    }
+    escolha = st.selectbox("Método", list(metodos), key="corr_metodo")
+    metodo = metodos[escolha]
 
-    if corr is None:
+    num_cols = df.select_dtypes(include=["number"]).columns.tolist()
+    if len(num_cols) < 2:
         st.info("É necessário pelo menos duas variáveis numéricas.")
         return
 
-    # ----- Heatmap -----
-    fig, ax = plt.subplots(figsize=(8, 5))
-    sns.heatmap(corr, annot=True, cmap="Blues", ax=ax)
-    ax.set_title("Matriz de Correlação", fontsize=12)
-    st.pyplot(fig)
-    plt.close(fig)
+    c1, c2 = st.columns(2)
+    k = c1.slider("Pares no ranking", min_value=5, max_value=50, value=10, step=5, key="corr_k")
+    limiar = c2.number_input(
+        "|r| mínimo", min_value=0.0, max_value=1.0, value=0.0, step=0.05, key="corr_limiar"
+    )
+
+    # ----- Heatmap (apenas para poucas variáveis) -----
+    if len(num_cols) <= LIMITE_HEATMAP:
+        c3, c4 = st.columns(2)
+        vista = c3.radio("Vista do heatmap", ["Correlação", "Correlação parcial"], horizontal=True, key="corr_vista")
+        agrupar = c4.checkbox("Agrupar variáveis correlacionadas", value=False, key="corr_agrupar")
+
+        matrizes = _matrizes_heatmap(df, tuple(num_cols), metodo)
+        parcial = vista == "Correlação parcial"
+        corr = matrizes["parcial" if parcial else "corr"]
+        p_valores = matrizes["p_parcial" if parcial else "p_value"]
+        if agrupar:
+            ordem = matrizes["ordem"]
+            corr, p_valores = corr.loc[ordem, ordem], p_valores.loc[ordem, ordem]
+        anotar = len(num_cols) <= 15
+
+        fig, ax = plt.subplots(figsize=(8, 5))
+        sns.heatmap(
+            corr,
+            annot=_anotacoes_significancia(corr, p_valores) if anotar else False,
+            fmt="",
+            cmap="Blues",
+            ax=ax,
+        )
+        titulo = "Correlação Parcial" if parcial else "Matriz de Correlação"
+        ax.set_title(f"{titulo} ({escolha.split(' ')[0]})", fontsize=12)
+        st.pyplot(fig)
+        plt.close(fig)
+        if anotar:
+            st.caption("* p < 0,05   ** p < 0,01   *** p < 0,001 (pares válidos de cada célula)")
+        if parcial:
+            st.caption(
+                "Correlação parcial: cada par controlado por todas as outras variáveis "
+                "(remove associações explicadas por fatores em comum)."
+            )
+    else:
+        st.caption(
+            f"{len(num_cols)} variáveis numéricas: o heatmap completo foi substituído "
+            "pelo ranking dos pares mais correlacionados."
+        )
+
+    # ----- Ranking dos pares -----
+    ranking = maiores_correlacoes(df, k=k, colunas=num_cols, metodo=metodo, limiar=limiar or None)
+    if not ranking.empty:
+        tabela = ranking.rename(
+            columns={
+                "var1": "Variável 1",
+                "var2": "Variável 2",
+                "n": "n (pares válidos)",
+                "p_value": "p-valor",
+                "ic_inf": "IC 95% inf",
+                "ic_sup": "IC 95% sup",
+            }
+        )
+        tabela["Intensidade"] = [
+            classificar_correlacao(r, n, p) for r, n, p in zip(ranking["r"], ranking["n"], ranking["p_value"])
+        ]
+        st.dataframe(
+            tabela.drop(columns="abs_r").round({"r": 3, "IC 95% inf": 3, "IC 95% sup": 3}),
+            use_container_width=True,
+            hide_index=True,
+        )
 
     # ----- Narrativa -----
     st.markdown("### Narrativa automática")
 
-    if par is None:
+    if ranking.empty:
         st.markdown("Não foram identificadas correlações relevantes entre variáveis distintas.")
         return
 
-    var1, var2 = par
-    intensidade = classificar_correlacao(valor)
+    topo = ranking.iloc[0]
+    var1, var2, valor = topo["var1"], topo["var2"], float(topo["r"])
+    intensidade = classificar_correlacao(valor, int(topo["n"]), float(topo["p_value"]))
     sentido = direcao(valor)
 
     st.markdown(f"""
 A maior correlação **entre variáveis distintas** é **{valor:.2f}**,  
 entre **{var1}** e **{var2}**.  
 
-Essa relação pode ser classificada como **{intensidade}** e **{sentido}**.
+Essa relação pode ser classificada como **{intensidade}** e **{sentido}**
+(n = {int(topo["n"])} pares, p-valor = {_fmt_p_user(topo["p_value"])},
+IC 95% de {_fmt_num_user(topo["ic_inf"])} a {_fmt_num_user(topo["ic_sup"])}).
 """)
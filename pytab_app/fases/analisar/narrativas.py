@@ -72,3 +72,44 @@ def gerar_narrativa_regressao(summary: dict | None) -> str:
         f"Em média, a cada aumento de uma unidade em **{x}**, **{y}** tende a {direcao} em cerca de {abs(a):.2f} unidades. "
         "Essa relação pode ser usada para estimativas aproximadas e para discutir quais variáveis têm maior influência sobre o indicador."
     )
+
+
+def gerar_narrativa_logistica(summary: dict | None, alpha: float = 0.05) -> str:
+    if not summary:
+        return "Não foi possível ajustar um modelo de regressão logística confiável com os dados atuais."
+
+    y = summary["alvo"]
+    evento = summary["sucesso"]
+    r2 = summary["pseudo_r2"]
+    p = summary["p_value"]
+    coefs = summary["coeficientes"].drop(index="Intercepto", errors="ignore").dropna(subset=["coef"])
+    sig = coefs[coefs["p_value"] < alpha].sort_values("p_value")
+
+    if r2 < 0.1:
+        explicacao = "o modelo separa pouco os casos de cada resultado"
+    elif r2 < 0.3:
+        explicacao = "o modelo separa moderadamente os casos de cada resultado"
+    else:
+        explicacao = "o modelo separa bem os casos de cada resultado"
+
+    if p is not None and p < alpha:
+        global_txt = f"O modelo é estatisticamente significativo (p ≈ {p:.3g}) e apresentou pseudo-R² de McFadden ≈ {r2:.2f}, indicando que {explicacao}."
+    else:
+        global_txt = f"O modelo **não** é estatisticamente significativo (pseudo-R² ≈ {r2:.2f}): as preditoras não alteram de forma clara a chance de **{y} = {evento}**."
+
+    if sig.empty:
+        efeitos = "Nenhuma preditora isolada altera significativamente a chance do evento, mantendo as demais constantes."
+    else:
+        itens = []
+        for termo, linha in sig.head(5).iterrows():
+            odds = linha["odds_ratio"]
+            variacao = f"multiplica a chance por {odds:.2f}" if odds >= 1 else f"reduz a chance em {100 * (1 - odds):.0f}%"
+            itens.append(f"**{termo}** ({variacao}, IC {linha['or_ic_inf']:.2f}–{linha['or_ic_sup']:.2f})")
+        efeitos = "Mantendo as demais constantes: " + "; ".join(itens) + "."
+
+    return (
+        f"A regressão logística ajustada para a chance de **{y} = {evento}** usou {summary['n']} registros. "
+        f"{global_txt} {efeitos} "
+        "Razões de chances (odds ratios) acima de 1 aumentam a probabilidade do evento; abaixo de 1, diminuem. "
+        "Para categorias, a comparação é sempre com o nível de referência."
+    )
@@ -4,13 +4,32 @@ import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
 from pytab.charts.theme import PRIMARY, SECONDARY, style_plotly
+from pytab_app.modules.aggregation import _PERIODICITY_TO_RULE, detect_date_column
+from pytab_app.modules.pareto import calcular_pareto, cubo_pareto, pareto_do_cubo, tendencia_pareto
+
+# Cor da barra "Outros" (categorias fora do top N)
+COR_OUTROS = "#9e9e9e"
+
+SEM_DETALHE = "(não detalhar)"
+
+MEDIDAS = ["Soma de uma métrica", "Contagem de ocorrências", "Contagem ponderada"]
+
+# Categorias (mais frequentes) com peso editável na contagem ponderada
+MAX_PESOS_EDITAVEIS = 50
+
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _cubo_cacheado(df: pd.DataFrame, dimensoes: tuple, valor: str | None) -> dict:
+    """Cubo de Pareto calculado uma vez por dataset, hierarquia de dimensões e métrica (None = contagem)."""
+    return cubo_pareto(df, list(dimensoes), valor)
 
 
 def analisar_pareto(df: pd.DataFrame):
     """
     Renderiza a análise de Pareto na aba correspondente.
 
-    - Usuário escolhe uma dimensão categórica e uma métrica numérica
+    - Usuário escolhe uma dimensão categórica e a medida: soma de uma
+      métrica numérica, contagem de ocorrências ou contagem ponderada
     - Exibe gráfico de Pareto (barras + linha de % acumulado)
     - Exibe narrativa automática em texto
     """
@@ -19,45 +38,83 @@ def analisar_pareto(df: pd.DataFrame):
     cat_cols = df.select_dtypes(include=["object", "category"]).columns.tolist()
     num_cols = df.select_dtypes(include=["number"]).columns.tolist()
 
-    if not cat_cols or not num_cols:
-        st.info("É necessário ao menos uma coluna categórica e uma numérica para a análise de Pareto.")
+    if not cat_cols:
+        st.info("É necessário ao menos uma coluna categórica para a análise de Pareto.")
         return None
 
     col_cat = st.selectbox("Dimensão (categórica)", cat_cols)
-    col_val = st.selectbox("Métrica (numérica)", num_cols)
+    medida = st.radio("Medida", MEDIDAS, horizontal=True, key="pareto_medida")
 
-    dados = df[[col_cat, col_val]].dropna()
-    if dados.empty:
-        st.warning("Não há dados suficientes após remoção de valores ausentes.")
-        return None
+    # col_val: coluna somada (None = contagem); rotulo_val: nome exibido
+    col_val, pesos = None, None
+    if medida == "Soma de uma métrica":
+        if not num_cols:
+            st.info("Não há colunas numéricas: use a contagem de ocorrências.")
+            return None
+        col_val = st.selectbox("Métrica (numérica)", num_cols)
+        rotulo_val = col_val
+    elif medida == "Contagem de ocorrências":
+        rotulo_val = "ocorrências"
+    else:
+        pesos = _editar_pesos(df, col_cat)
+        rotulo_val = "ocorrências ponderadas"
+
+    modos = ["Pareto geral", "Evolução por período"] if pesos is None else ["Pareto geral"]
+    modo = st.radio("Modo", modos, horizontal=True, key="pareto_modo")
+    if modo == "Evolução por período":
+        return _mostrar_tendencia(df, col_cat, col_val, rotulo_val)
 
-    serie = (
-        dados.groupby(col_cat)[col_val]
-        .sum()
-        .sort_values(ascending=False)
+    top_n = st.slider(
+        "Categorias exibidas (as demais viram \"Outros\")",
+        min_value=5, max_value=100, value=20, step=5, key="pareto_top_n",
     )
 
-    if serie.empty:
+    outras = [c for c in cat_cols if c != col_cat] if pesos is None else []
+    niveis = st.multiselect("Detalhar por (drill-down, na ordem)", outras, key="pareto_drill") if outras else []
+
+    filtros = {}
+    if niveis:
+        # drill-down: um cubo por dataset/dimensões/métrica; cada clique é uma consulta
+        dims = [col_cat] + niveis
+        cubo = _cubo_cacheado(df, tuple(dims), col_val)
+        for dim, proxima in zip(dims[:-1], dims[1:]):
+            nivel = pareto_do_cubo(cubo, dim, filtros, top_n=top_n)["tabela"]
+            opcoes = nivel.loc[nivel["n_categorias"] == 1, "categoria"].tolist()
+            escolha = st.selectbox(
+                f"{dim}: detalhar por {proxima}", [SEM_DETALHE] + opcoes, key=f"pareto_drill_{dim}"
+            )
+            if escolha == SEM_DETALHE:
+                break
+            filtros[dim] = escolha
+        dimensao = dims[len(filtros)]
+        resultado = pareto_do_cubo(cubo, dimensao, filtros, top_n=top_n)
+    else:
+        dimensao = col_cat
+        try:
+            resultado = calcular_pareto(df, col_cat, col_val, top_n=top_n, pesos=pesos)
+        except ValueError as e:
+            st.warning(str(e))
+            return None
+    tabela = resultado["tabela"]
+
+    if tabela.empty:
         st.warning("Não foi possível calcular a distribuição de Pareto para esta combinação.")
         return None
 
-    total = serie.sum()
-    perc = serie / total * 100.0
-    cum = perc.cumsum()
-
     # ---------------------------
     # Gráfico Pareto (Plotly)
     # ---------------------------
     fig = make_subplots(specs=[[{"secondary_y": True}]])
 
-    categorias = serie.index.astype(str)
+    categorias = tabela["categoria"].astype(str)
+    cores = [PRIMARY if n == 1 else COR_OUTROS for n in tabela["n_categorias"]]
 
     fig.add_trace(
         go.Bar(
             x=categorias,
-            y=serie.values,
+            y=tabela["valor"].to_numpy(),
             name="Valor",
-            marker_color=PRIMARY,
+            marker_color=cores,
         ),
         secondary_y=False,
     )
@@ -65,7 +122,7 @@ def analisar_pareto(df: pd.DataFrame):
     fig.add_trace(
         go.Scatter(
             x=categorias,
-            y=cum.values,
+            y=tabela["percentual_acumulado"].to_numpy(),
             name="% acumulado",
             mode="lines+markers",
             line=dict(color=SECONDARY, width=3),
@@ -81,9 +138,10 @@ def analisar_pareto(df: pd.DataFrame):
         showgrid=False,
     )
 
+    caminho = " | ".join(f"{d} = {v}" for d, v in filtros.items())
     fig.update_layout(
-        title=f"Pareto de {col_val} por {col_cat}",
-        xaxis_title=col_cat,
+        title=f"Pareto de {rotulo_val} por {dimensao}" + (f" ({caminho})" if caminho else ""),
+        xaxis_title=dimensao,
         bargap=0.15,
     )
 
@@ -94,30 +152,143 @@ def analisar_pareto(df: pd.DataFrame):
     # Narrativa automática
     # ---------------------------
     # Regra 80/20 aproximada
-    n_top = (cum <= 80).sum()
-    if n_top == 0:
-        n_top = 1
-    top_cats = serie.index[:n_top].tolist()
-    share = float(cum.iloc[n_top - 1])
+    n_top = resultado["n_vitais"]
+    top_cats = resultado["vitais"]
+    share = resultado["share_vitais"]
 
-    st.markdown(_narrativa_pareto(col_cat, col_val, top_cats, share))
+    if resultado["n_categorias"] > len(tabela):
+        st.caption(
+            f"{resultado['n_categorias']:,} categorias observadas".replace(",", ".")
+            + f": exibidas as {top_n} maiores; o % acumulado considera o total de todas."
+        )
+    st.markdown(_narrativa_pareto(dimensao, rotulo_val, top_cats, share, n_top))
 
     # Retorna um resumo técnico (se quiser reaproveitar depois)
     return {
-        "dimensao": col_cat,
-        "metricao": col_val,
+        "dimensao": dimensao,
+        "filtros": filtros,
+        "metricao": rotulo_val,
         "top_categorias": top_cats,
         "top_share": share,
         "n_top": int(n_top),
     }
 
 
-def _narrativa_pareto(col_cat: str, col_val: str, top_cats, share: float) -> str:
+def _editar_pesos(df: pd.DataFrame, col_cat: str) -> dict:
+    """Tabela editável de pesos (ex.: severidade) para as categorias mais frequentes."""
+    frequentes = calcular_pareto(df, col_cat, top_n=MAX_PESOS_EDITAVEIS)["tabela"]
+    frequentes = frequentes.loc[frequentes["n_categorias"] == 1, ["categoria"]].assign(peso=1.0)
+    st.caption(
+        f"Peso de cada categoria (ex.: severidade). Mostradas as {len(frequentes)} mais frequentes; "
+        "as demais usam peso 1."
+    )
+    editado = st.data_editor(
+        frequentes,
+        column_config={
+            "categoria": st.column_config.Column("Categoria", disabled=True),
+            "peso": st.column_config.NumberColumn("Peso", min_value=0.0),
+        },
+        hide_index=True,
+        use_container_width=True,
+        key=f"pareto_pesos_{col_cat}",
+    )
+    # célula apagada volta ao peso padrão
+    return dict(zip(editado["categoria"], editado["peso"].astype(float).fillna(1.0)))
+
+
+def _mostrar_tendencia(df: pd.DataFrame, col_cat: str, col_val: str | None, rotulo_val: str):
+    """Evolução da participação e da posição das principais categorias por período."""
+    date_cols = df.select_dtypes(include=["datetime64[ns]", "datetime64[ns, UTC]", "datetimetz"]).columns.tolist()
+    if not date_cols:
+        try:
+            detectada = detect_date_column(df)
+        except Exception:
+            detectada = None
+        date_cols = [detectada] if detectada else []
+    if not date_cols:
+        st.info("Nenhuma coluna de datas foi detectada: a evolução por período fica indisponível.")
+        return None
+
+    c1, c2, c3 = st.columns(3)
+    col_data = c1.selectbox("Coluna de datas", date_cols, key="pareto_data")
+    periodicidade = c2.selectbox("Periodicidade", list(_PERIODICITY_TO_RULE), index=2, key="pareto_periodicidade")
+    top_n = c3.slider("Categorias acompanhadas", min_value=3, max_value=10, value=5, key="pareto_top_tendencia")
+
+    resultado = tendencia_pareto(df, col_data, col_cat, col_val, periodicidade, top_n=top_n)
+    serie = resultado["serie"]
+    if serie.empty:
+        st.warning("Não há dados suficientes (data, categoria e métrica válidas) para a evolução por período.")
+        return None
+
+    fig = go.Figure()
+    for categoria, dados in serie.groupby("categoria", sort=False):
+        fig.add_trace(
+            go.Scatter(
+                x=dados["periodo"],
+                y=dados["participacao"],
+                customdata=dados["posicao"],
+                name=str(categoria),
+                mode="lines+markers",
+                hovertemplate="%{x|%d/%m/%Y}: %{y:.1f}% do total (posição %{customdata})<extra>"
+                + str(categoria) + "</extra>",
+            )
+        )
+    fig.update_layout(
+        title=f"Participação de cada {col_cat} em {rotulo_val} ({periodicidade.lower()})",
+        xaxis_title="Período",
+        yaxis_title="% do total do período",
+    )
+    fig = style_plotly(fig)
+    st.plotly_chart(fig, use_container_width=True)
+    st.caption("A posição no ranking de cada período aparece ao passar o mouse sobre os pontos.")
+
+    st.markdown(_narrativa_tendencia(col_cat, rotulo_val, resultado["lideres"]))
+    return {
+        "dimensao": col_cat,
+        "metricao": rotulo_val,
+        "periodicidade": periodicidade,
+        "lideres": resultado["lideres"],
+    }
+
+
+def _narrativa_tendencia(col_cat: str, col_val: str, lideres: pd.Series) -> str:
+    """Texto sobre as trocas de liderança do Pareto ao longo dos períodos."""
+    if lideres.empty:
+        return "Não foi possível identificar a categoria líder em nenhum período."
+
+    trocas = lideres[lideres.ne(lideres.shift()) & lideres.shift().notna()]
+    if trocas.empty:
+        return f"""
+### Narrativa — Evolução do Pareto
+
+**{lideres.iloc[0]}** liderou o total de **{col_val}** por **{col_cat}** em todos os
+{len(lideres)} períodos analisados: o principal foco de melhoria não mudou.
+"""
+
+    anteriores = lideres.shift()
+    itens = [
+        f"em {periodo:%m/%Y}, de **{anteriores[periodo]}** para **{lider}**"
+        for periodo, lider in trocas.tail(5).items()
+    ]
+    if len(trocas) > 5:
+        itens[0] = "as mais recentes: " + itens[0]
+    return f"""
+### Narrativa — Evolução do Pareto
+
+A categoria líder de **{col_val}** por **{col_cat}** mudou {len(trocas)} vez(es): {"; ".join(itens)}.
+Hoje a liderança é de **{lideres.iloc[-1]}**. Compare as trocas com as datas das ações de
+melhoria para verificar se o problema atacado de fato perdeu participação.
+"""
+
+
+def _narrativa_pareto(col_cat: str, col_val: str, top_cats, share: float, n_top: int | None = None) -> str:
     """Gera texto em português explicando o resultado do Pareto."""
     if not top_cats:
         return "Não foi possível identificar categorias dominantes para esta métrica."
 
     lista_str = ", ".join(str(c) for c in top_cats)
+    if n_top is not None and n_top > len(top_cats):
+        lista_str += f" e mais {n_top - len(top_cats)} categorias"
 
     return f"""
 ### Narrativa — Análise de Pareto
@@ -4,12 +4,51 @@ import streamlit as st
 import plotly.graph_objects as go
 
 from pytab.charts.theme import PRIMARY, SECONDARY, style_plotly
+from pytab_app.fases.analisar.narrativas import gerar_narrativa_logistica
+from pytab_app.modules.regressao import (
+    amostra_diagnosticos,
+    diagnosticos_regressao,
+    narrativa_regressao_multipla,
+    regressao_logistica,
+    regressao_multipla,
+)
+from pytab_app.modules.testes_estatisticos import _fmt_num_user, _fmt_p_user
+
+# Categóricas com mais níveis que isso não são oferecidas como preditoras
+MAX_NIVEIS_PREDITORA = 50
+
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _ajuste_cacheado(df: pd.DataFrame, alvo: str, preditoras: tuple) -> dict:
+    """Regressão múltipla calculada uma vez por dataset, alvo e preditoras (reruns não reajustam)."""
+    return regressao_multipla(df, alvo, list(preditoras))
+
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _diagnosticos_cacheados(df: pd.DataFrame, alvo: str, preditoras: tuple) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Diagnósticos completos (n linhas) e a amostra para os gráficos, uma vez por ajuste."""
+    diag = diagnosticos_regressao(df, _ajuste_cacheado(df, alvo, preditoras))
+    return diag, amostra_diagnosticos(diag)
 
 
 def analisar_regressao(df: pd.DataFrame) -> None:
     """
-    Regressão linear simples (Y ~ X) com narrativa automática.
+    Regressão linear (simples Y ~ X ou múltipla) ou logística (alvo
+    aprovado/reprovado), com narrativa automática.
     """
+    tipo = st.radio(
+        "Tipo de regressão",
+        ["Simples (Y ~ X)", "Múltipla", "Logística (alvo binário)"],
+        horizontal=True,
+        key="regressao_tipo",
+    )
+    if tipo == "Múltipla":
+        _regressao_multipla_streamlit(df)
+        return
+    if tipo == "Logística (alvo binário)":
+        _regressao_logistica_streamlit(df)
+        return
+
     st.subheader("Regressão Linear Simples")
 
     num_cols = df.select_dtypes(include=["number"]).columns.tolist()
@@ -93,3 +132,206 @@ Para cada aumento de 1 unidade em **{col_x}**, o modelo estima um aumento médio
 **{slope:.3f}** unidades em **{col_y}**, em média.
 """)
 
+
+
+def _regressao_multipla_streamlit(df: pd.DataFrame) -> None:
+    """Regressão linear múltipla: coeficientes, ajuste, VIF e narrativa."""
+    st.subheader("Regressão Linear Múltipla")
+
+    num_cols = df.select_dtypes(include=["number"]).columns.tolist()
+    if not num_cols:
+        st.info("É necessária ao menos uma coluna numérica como variável alvo.")
+        return
+    cat_cols = [
+        c for c in df.select_dtypes(include=["object", "category", "bool"]).columns
+        if df[c].nunique(dropna=True) <= MAX_NIVEIS_PREDITORA
+    ]
+
+    col_y = st.selectbox("Variável alvo (Y)", num_cols, key="regressao_multipla_y")
+    candidatas = [c for c in num_cols + cat_cols if c != col_y]
+    preditoras = st.multiselect(
+        "Variáveis explicativas (X)",
+        candidatas,
+        default=[c for c in num_cols if c != col_y][:3],
+        key="regressao_multipla_x",
+    )
+    if not preditoras:
+        st.info("Escolha ao menos uma variável explicativa.")
+        return
+
+    try:
+        res = _ajuste_cacheado(df, col_y, tuple(preditoras))
+    except ValueError as e:
+        st.warning(str(e))
+        return
+
+    c1, c2, c3, c4 = st.columns(4)
+    c1.metric("R²", _fmt_num_user(res["r2"], 3))
+    c2.metric("R² ajustado", _fmt_num_user(res["r2_ajustado"], 3))
+    c3.metric("p-valor (F)", _fmt_p_user(res["p_value"]))
+    c4.metric("n", f"{res['n']:,}".replace(",", "."))
+
+    tabela = res["coeficientes"].rename(
+        columns={
+            "coef": "Coeficiente",
+            "erro_padrao": "Erro padrão",
+            "p_value": "p-valor",
+            "ic_inf": "IC 95% inf",
+            "ic_sup": "IC 95% sup",
+            "vif": "VIF",
+        }
+    )
+    st.dataframe(tabela.round(4), use_container_width=True)
+    st.caption(
+        "Categóricas entram como dummies: termo[nível] é a diferença média em relação ao "
+        "primeiro nível, mantendo as demais variáveis constantes. VIF > 10 indica multicolinearidade."
+    )
+
+    st.markdown(narrativa_regressao_multipla(res))
+
+    with st.expander("Diagnósticos e pontos influentes"):
+        _diagnosticos_streamlit(df, res, col_y, tuple(preditoras))
+
+
+def _diagnosticos_streamlit(df: pd.DataFrame, res: dict, alvo: str, preditoras: tuple) -> None:
+    """Resíduos × ajustados, alavancagem × resíduo studentizado e linhas mais influentes."""
+    diag, pontos = _diagnosticos_cacheados(df, alvo, preditoras)
+    n, k = len(diag), res["cov"].shape[0]
+    limite_cook = 4.0 / n
+    limite_h = 2.0 * k / n
+    influentes = diag[(diag["distancia_cook"] > limite_cook) & (diag["alavancagem"] > limite_h)]
+
+    if len(pontos) < n:
+        st.caption(
+            f"Gráficos com {len(pontos):,} de {n:,} pontos (os mais influentes sempre incluídos).".replace(",", ".")
+        )
+
+    fig = go.Figure(
+        go.Scattergl(
+            x=pontos["ajustado"],
+            y=pontos["residuo"],
+            mode="markers",
+            marker=dict(color=PRIMARY, size=5, opacity=0.6),
+            name="Resíduos",
+        )
+    )
+    fig.add_hline(y=0, line=dict(color=SECONDARY, dash="dash"))
+    fig.update_layout(title="Resíduos × valores ajustados", xaxis_title="Ajustado", yaxis_title="Resíduo")
+    st.plotly_chart(style_plotly(fig), use_container_width=True)
+
+    fig = go.Figure(
+        go.Scattergl(
+            x=pontos["alavancagem"],
+            y=pontos["residuo_studentizado"],
+            mode="markers",
+            marker=dict(
+                color=pontos["distancia_cook"],
+                colorscale="Reds",
+                size=6,
+                colorbar=dict(title="Cook"),
+            ),
+            text=pontos.index.astype(str),
+            hovertemplate="linha %{text}<br>h = %{x:.4f}<br>t = %{y:.2f}<extra></extra>",
+            name="Linhas",
+        )
+    )
+    fig.add_vline(x=limite_h, line=dict(color=SECONDARY, dash="dot"))
+    for y in (-3, 3):
+        fig.add_hline(y=y, line=dict(color=SECONDARY, dash="dot"))
+    fig.update_layout(
+        title="Alavancagem × resíduo studentizado",
+        xaxis_title="Alavancagem (h)",
+        yaxis_title="Resíduo studentizado",
+    )
+    st.plotly_chart(style_plotly(fig), use_container_width=True)
+
+    st.markdown(
+        f"**{len(influentes)}** linha(s) com alta alavancagem (h > {_fmt_num_user(limite_h, 4)}) e "
+        f"distância de Cook acima de 4/n ({_fmt_num_user(limite_cook, 4)})."
+    )
+    st.dataframe(
+        diag.nlargest(10, "distancia_cook").rename(
+            columns={
+                "ajustado": "Ajustado",
+                "residuo": "Resíduo",
+                "alavancagem": "Alavancagem",
+                "residuo_studentizado": "Resíduo studentizado",
+                "distancia_cook": "Distância de Cook",
+            }
+        ).round(4),
+        use_container_width=True,
+    )
+
+
+def _regressao_logistica_streamlit(df: pd.DataFrame) -> None:
+    """Regressão logística (IRLS): odds ratios, IC e narrativa."""
+    st.subheader("Regressão Logística")
+
+    binarias = [c for c in df.columns if df[c].nunique(dropna=True) == 2]
+    if not binarias:
+        st.info("É necessária uma coluna com exatamente dois valores (ex.: aprovado/reprovado) como alvo.")
+        return
+    num_cols = df.select_dtypes(include=["number"]).columns.tolist()
+    cat_cols = [
+        c for c in df.select_dtypes(include=["object", "category", "bool"]).columns
+        if df[c].nunique(dropna=True) <= MAX_NIVEIS_PREDITORA
+    ]
+
+    col_y = st.selectbox("Variável alvo (resultado)", binarias, key="regressao_logistica_y")
+    niveis = df[col_y].dropna().unique().tolist()
+    try:
+        niveis = sorted(niveis)
+    except TypeError:
+        pass
+    sucesso = st.selectbox("Evento modelado", niveis, index=len(niveis) - 1, key="regressao_logistica_evento")
+
+    candidatas = [c for c in num_cols + cat_cols if c != col_y]
+    preditoras = st.multiselect(
+        "Variáveis explicativas (X)",
+        candidatas,
+        default=[c for c in num_cols if c != col_y][:3],
+        key="regressao_logistica_x",
+    )
+    if not preditoras:
+        st.info("Escolha ao menos uma variável explicativa.")
+        return
+
+    try:
+        res = regressao_logistica(df, col_y, preditoras, sucesso=sucesso)
+    except (ValueError, np.linalg.LinAlgError) as e:
+        st.warning(str(e))
+        return
+
+    c1, c2, c3, c4 = st.columns(4)
+    c1.metric("Pseudo-R² (McFadden)", _fmt_num_user(res["pseudo_r2"], 3))
+    c2.metric("p-valor (razão de verossimilhança)", _fmt_p_user(res["p_value"]))
+    c3.metric("AIC", _fmt_num_user(res["aic"], 1))
+    c4.metric("n", f"{res['n']:,}".replace(",", "."))
+
+    if not res["convergiu"]:
+        st.warning(f"O ajuste não convergiu em {res['iteracoes']} iterações; interprete os coeficientes com cautela.")
+    if res["separacao"]:
+        st.warning(
+            "Há separação (quase) completa: alguma combinação de preditoras prevê o resultado sem erro, "
+            "e as odds ratios desses termos tendem a valores extremos."
+        )
+    if res["aliased"]:
+        st.caption(f"Termos redundantes (colineares) removidos do ajuste: {', '.join(res['aliased'])}.")
+
+    tabela = res["coeficientes"][["coef", "erro_padrao", "p_value", "odds_ratio", "or_ic_inf", "or_ic_sup"]].rename(
+        columns={
+            "coef": "Coeficiente (log-odds)",
+            "erro_padrao": "Erro padrão",
+            "p_value": "p-valor",
+            "odds_ratio": "Odds ratio",
+            "or_ic_inf": "OR IC 95% inf",
+            "or_ic_sup": "OR IC 95% sup",
+        }
+    )
+    st.dataframe(tabela.round(4), use_container_width=True)
+    st.caption(
+        f"Odds ratio é quanto a chance de {col_y} = {sucesso} é multiplicada por unidade da preditora "
+        "(ou em relação ao primeiro nível, para categorias), mantendo as demais constantes."
+    )
+
+    st.markdown(gerar_narrativa_logistica(res))
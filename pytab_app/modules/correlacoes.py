@@ -0,0 +1,641 @@
+"""
+pytab_app.modules.correlacoes
+-----------------------------
+
+Motor de correlação do PyTab (aba Correlação da fase Analisar).
+
+Pearson com casos completos por par (pairwise-complete, como
+`DataFrame.corr()`), calculado com produtos matriciais mascarados:
+contagens, somas, somas de quadrados e produtos cruzados de cada par de
+colunas saem de multiplicações de matrizes (BLAS), sem laço em Python
+sobre os pares.
+
+Métodos:
+- "pearson";
+- "spearman": cada coluna é convertida em postos uma única vez e o mesmo
+  núcleo de Pearson é reaproveitado. Sem NaN, o resultado é idêntico ao
+  do pandas; com NaN, os postos de cada coluna usam todos os seus valores
+  válidos (o pandas recalcula os postos para cada par);
+- "kendall": tau-b pelo algoritmo de Knight, O(n log n) por par
+  (`scipy.stats.kendalltau`), apenas nas linhas válidas de cada par.
+
+Modos:
+- precisao="float32": metade da memória e produtos ~2× mais rápidos
+  (erro típico < 1e-5 em r, pois os dados são centralizados antes);
+- bloco=k: processa as colunas em blocos de k × k, limitando a memória
+  intermediária para matrizes com milhares de colunas.
+
+Para tabelas largas, `maiores_correlacoes` devolve só os k pares mais
+fortes, varrendo os blocos com um heap limitado (sem a matriz p × p).
+
+Para dados que chegam em blocos (vários arquivos, SQL paginado, arquivo
+acompanhado ao vivo), `acumular_comomentos` mantém contagens, médias e
+co-momentos por par, combináveis sem concatenar os dados, e
+`correlacao_de_comomentos` devolve a matriz atual a qualquer momento.
+
+Para heatmaps: `correlacao_parcial` (cada par controlado por todas as
+outras variáveis, com uma única inversão da matriz) e `ordem_agrupada`
+(ordem das variáveis por agrupamento hierárquico, blocos correlacionados
+lado a lado).
+"""
+
+from __future__ import annotations
+
+import heapq
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from scipy import special, stats
+from scipy.cluster import hierarchy
+from scipy.spatial.distance import squareform
+
+from pytab_app.modules.testes_estatisticos import _postos_ordenados
+
+
+# Tolerância relativa para considerar uma variância nula (cancelamento numérico)
+_TOL_VARIANCIA = 64 * np.finfo(np.float64).eps
+
+_PRECISOES = {"float64": np.float64, "float32": np.float32}
+
+METODOS_CORRELACAO = ("pearson", "spearman", "kendall")
+
+
+# ============================================================
+# 1) Pearson pairwise-complete por produtos matriciais
+# ============================================================
+
+def _postos_colunas(X: np.ndarray) -> np.ndarray:
+    """Postos médios de cada coluna (NaN preservado), com uma ordenação por coluna."""
+    R = np.full_like(X, np.nan)
+    ordem = np.argsort(X, axis=0)          # NaN vai para o fim
+    validos = (~np.isnan(X)).sum(axis=0)
+    for j in range(X.shape[1]):
+        linhas = ordem[: validos[j], j]
+        R[linhas, j], _ = _postos_ordenados(X[linhas, j])
+    return R
+
+
+def _preparar_matriz(
+    df: pd.DataFrame,
+    colunas: list | None = None,
+    postos: bool = False,
+) -> tuple[np.ndarray, list]:
+    """
+    Matriz float64 (n × p) das colunas numéricas, centralizada pela média
+    de cada coluna. Com `postos=True`, os valores são antes substituídos
+    pelos postos médios de cada coluna (Spearman).
+    """
+    if colunas is None:
+        colunas = df.select_dtypes(include=["number"]).columns.tolist()
+    X = df[colunas].to_numpy(dtype=np.float64, na_value=np.nan, copy=True)
+    if postos:
+        X = _postos_colunas(X)
+
+    # centralizar não altera r, mas evita cancelamento em Σx² − (Σx)²/n
+    with np.errstate(invalid="ignore"), warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        medias = np.nanmean(X, axis=0)
+        constantes = np.nanmax(X, axis=0) == np.nanmin(X, axis=0) if X.size else np.zeros(X.shape[1], bool)
+    X -= np.nan_to_num(medias)
+
+    # colunas constantes viram zeros exatos (r = NaN, como no pandas)
+    X[:, constantes] = np.where(np.isnan(X[:, constantes]), np.nan, 0.0)
+    return X, list(colunas)
+
+
+def _somas_pareadas(Xa: np.ndarray, Xb: np.ndarray, dtype=np.float64) -> dict:
+    """
+    Somas suficientes de cada par (coluna de Xa, coluna de Xb), usando só
+    as linhas em que as duas colunas são válidas:
+
+        n   = Mᵃᵀ Mᵇ         sa  = Aᵀ Mᵇ        sb  = Mᵃᵀ B
+        saa = (A∘A)ᵀ Mᵇ      sbb = Mᵃᵀ (B∘B)    sab = Aᵀ B
+
+    onde M são as máscaras de valores válidos e A, B os dados com NaN → 0.
+    """
+    Ma = ~np.isnan(Xa)
+    A = np.where(Ma, Xa, 0.0).astype(dtype, copy=False)
+    Ma = Ma.astype(dtype)
+
+    if Xb is Xa:
+        B, Mb = A, Ma
+    else:
+        Mb = ~np.isnan(Xb)
+        B = np.where(Mb, Xb, 0.0).astype(dtype, copy=False)
+        Mb = Mb.astype(dtype)
+
+    return {
+        "n": Ma.T @ Mb,
+        "sa": A.T @ Mb,
+        "sb": Ma.T @ B,
+        "saa": (A * A).T @ Mb,
+        "sbb": Ma.T @ (B * B),
+        "sab": A.T @ B,
+    }
+
+
+def _r_de_somas(s: dict) -> np.ndarray:
+    """Coeficiente de Pearson a partir das somas de `_somas_pareadas`."""
+    n = s["n"].astype(np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cab = s["sab"] - s["sa"] * s["sb"] / n
+        vaa = s["saa"] - s["sa"] ** 2 / n
+        vbb = s["sbb"] - s["sb"] ** 2 / n
+        r = cab / np.sqrt(vaa * vbb)
+
+    invalido = (n < 2) | (vaa <= _TOL_VARIANCIA * s["saa"]) | (vbb <= _TOL_VARIANCIA * s["sbb"])
+    r = np.where(invalido, np.nan, r)
+    return np.clip(r, -1.0, 1.0)
+
+
+def _padronizar_completo(X: np.ndarray, dtype=np.float64) -> np.ndarray:
+    """Sem NaN: colunas com norma unitária, de modo que r = Zᵀ Z."""
+    norma = np.sqrt((X * X).sum(axis=0))
+    with np.errstate(divide="ignore"):
+        escala = np.where(norma > 0, 1.0 / norma, np.nan)
+    return (X * escala).astype(dtype, copy=False)
+
+
+def _fatias(p: int, bloco: int | None):
+    passo = p if not bloco else max(int(bloco), 1)
+    return [slice(i, min(i + passo, p)) for i in range(0, p, passo)]
+
+
+def _pearson_blocos(X: np.ndarray, dtype=np.float64, bloco: int | None = None):
+    """
+    Gera (fatia_i, fatia_j, r, n) para os blocos de colunas com i ≤ j.
+
+    Base comum da matriz completa e das buscas por blocos.
+    """
+    p = X.shape[1]
+    fatias = _fatias(p, bloco)
+    completo = not np.isnan(X).any()
+    Z = _padronizar_completo(X, dtype) if completo else None
+    n_linhas = X.shape[0]
+
+    for a, fa in enumerate(fatias):
+        for fb in fatias[a:]:
+            if completo:
+                r = np.clip(Z[:, fa].T @ Z[:, fb], -1.0, 1.0)
+                n = np.full(r.shape, n_linhas, dtype=np.int64)
+                if n_linhas < 2:
+                    r[:] = np.nan
+            else:
+                Xa = X[:, fa]
+                Xb = Xa if fa == fb else X[:, fb]
+                s = _somas_pareadas(Xa, Xb, dtype)
+                r = _r_de_somas(s)
+                n = np.rint(s["n"]).astype(np.int64)
+            yield fa, fb, r, n
+
+
+def _kendall_bloco(Xa: np.ndarray, Xb: np.ndarray, mesmo_bloco: bool) -> tuple[np.ndarray, np.ndarray]:
+    """Tau-b de Kendall de cada par (coluna de Xa, coluna de Xb)."""
+    # colunas contíguas: o kendalltau ordena cada coluna várias vezes
+    Xa = np.asfortranarray(Xa)
+    Xb = Xa if mesmo_bloco else np.asfortranarray(Xb)
+    validos_a = ~np.isnan(Xa)
+    validos_b = validos_a if mesmo_bloco else ~np.isnan(Xb)
+    r = np.full((Xa.shape[1], Xb.shape[1]), np.nan)
+    n = validos_a.T.astype(np.int64) @ validos_b.astype(np.int64)
+
+    for i in range(Xa.shape[1]):
+        for j in range(i + 1 if mesmo_bloco else 0, Xb.shape[1]):
+            if n[i, j] < 2:
+                continue
+            linhas = validos_a[:, i] & validos_b[:, j]
+            x, y = Xa[:, i], Xb[:, j]
+            if not linhas.all():
+                x, y = x[linhas], y[linhas]
+            if x.min() == x.max() or y.min() == y.max():
+                continue
+            r[i, j] = stats.kendalltau(x, y).statistic
+
+    if mesmo_bloco:
+        superior = np.triu_indices_from(r, k=1)
+        r.T[superior] = r[superior]
+        np.fill_diagonal(r, 1.0)
+    return r, n
+
+
+def _correlacao_blocos(
+    X: np.ndarray,
+    metodo: str = "pearson",
+    dtype=np.float64,
+    bloco: int | None = None,
+    n_workers: int = 1,
+):
+    """
+    Como `_pearson_blocos`, para qualquer método (X já em postos no Spearman).
+
+    No Kendall, os blocos de pares podem ser distribuídos em um pool de
+    processos (`n_workers`).
+    """
+    if metodo != "kendall":
+        yield from _pearson_blocos(X, dtype, bloco)
+        return
+
+    p = X.shape[1]
+    if bloco is None and n_workers > 1:
+        bloco = int(np.ceil(p / n_workers))
+    fatias = _fatias(p, bloco)
+    pares = [(fa, fb) for a, fa in enumerate(fatias) for fb in fatias[a:]]
+
+    if n_workers > 1 and len(pares) > 1:
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            resultados = executor.map(
+                _kendall_bloco,
+                [X[:, fa] for fa, _ in pares],
+                [X[:, fb] for _, fb in pares],
+                [fa == fb for fa, fb in pares],
+            )
+            for (fa, fb), (r, n) in zip(pares, resultados):
+                yield fa, fb, r.astype(dtype, copy=False), n
+        return
+
+    for fa, fb in pares:
+        r, n = _kendall_bloco(X[:, fa], X[:, fb], fa == fb)
+        yield fa, fb, r.astype(dtype, copy=False), n
+
+
+def matriz_correlacao(
+    df: pd.DataFrame,
+    colunas: list | None = None,
+    metodo: str = "pearson",
+    precisao: str = "float64",
+    bloco: int | None = None,
+    retornar_n: bool = False,
+    n_workers: int = 1,
+):
+    """
+    Matriz de correlação pairwise-complete (mesmo resultado de
+    `df.corr(method=metodo)`; ver a observação sobre Spearman com NaN).
+
+    metodo:
+        "pearson", "spearman" ou "kendall".
+    precisao:
+        "float64" (padrão) ou "float32".
+    bloco:
+        tamanho do bloco de colunas; None calcula tudo de uma vez.
+    retornar_n:
+        se True, retorna também a matriz com o número de pares válidos
+        usados em cada coeficiente.
+    n_workers:
+        processos para o Kendall (o custo por par é O(n log n); com
+        100 mil linhas e 50 colunas são ~1.200 pares de ~25 ms cada).
+    """
+    if metodo not in METODOS_CORRELACAO:
+        raise ValueError(f"Método de correlação desconhecido: {metodo}. Use um de {list(METODOS_CORRELACAO)}.")
+    if precisao not in _PRECISOES:
+        raise ValueError(f"precisao deve ser um de {list(_PRECISOES)}.")
+
+    X, nomes = _preparar_matriz(df, colunas, postos=metodo == "spearman")
+    p = X.shape[1]
+    dtype = _PRECISOES[precisao]
+
+    r = np.empty((p, p), dtype=dtype)
+    n = np.empty((p, p), dtype=np.int64)
+    for fa, fb, r_blk, n_blk in _correlacao_blocos(X, metodo, dtype, bloco, n_workers):
+        r[fa, fb] = r_blk
+        r[fb, fa] = r_blk.T
+        n[fa, fb] = n_blk
+        n[fb, fa] = n_blk.T
+
+    # diagonal exata: 1 para colunas com variância, NaN para constantes
+    diag = np.diagonal(r).copy()
+    np.fill_diagonal(r, np.where(np.isnan(diag), np.nan, 1.0))
+
+    corr = pd.DataFrame(r, index=nomes, columns=nomes)
+    if retornar_n:
+        return corr, pd.DataFrame(n, index=nomes, columns=nomes)
+    return corr
+
+
+# ============================================================
+# 2) Pares mais correlacionados (top-k) sem a matriz densa
+# ============================================================
+
+def maiores_correlacoes(
+    df: pd.DataFrame,
+    k: int = 10,
+    colunas: list | None = None,
+    metodo: str = "pearson",
+    limiar: float | None = None,
+    bloco: int = 256,
+    precisao: str = "float64",
+    n_workers: int = 1,
+) -> pd.DataFrame:
+    """
+    Os k pares de variáveis distintas com maior |r|.
+
+    Percorre a matriz em blocos de colunas e mantém apenas um heap com os
+    k melhores pares: a memória é O(bloco² + k), nunca O(p²).
+
+    limiar:
+        descarta pares com |r| < limiar (ex.: 0.5).
+
+    Retorna DataFrame (ordenado por |r| decrescente) com:
+        var1, var2, r, abs_r, n, p_value, ic_inf, ic_sup
+    """
+    if metodo not in METODOS_CORRELACAO:
+        raise ValueError(f"Método de correlação desconhecido: {metodo}. Use um de {list(METODOS_CORRELACAO)}.")
+    if precisao not in _PRECISOES:
+        raise ValueError(f"precisao deve ser um de {list(_PRECISOES)}.")
+
+    X, nomes = _preparar_matriz(df, colunas, postos=metodo == "spearman")
+    dtype = _PRECISOES[precisao]
+    k = max(int(k), 0)
+    heap: list[tuple] = []   # (|r|, i, j, r, n) — menor |r| no topo
+
+    for fa, fb, r, n in _correlacao_blocos(X, metodo, dtype, bloco, n_workers):
+        abs_r = np.abs(r.astype(np.float64))
+        if fa == fb:
+            abs_r = np.where(np.triu(np.ones(abs_r.shape, dtype=bool), k=1), abs_r, np.nan)
+
+        candidatos = ~np.isnan(abs_r)
+        if limiar is not None:
+            candidatos &= abs_r >= limiar
+        if len(heap) == k:
+            candidatos &= abs_r > heap[0][0]
+
+        ii, jj = np.nonzero(candidatos)
+        if ii.size == 0 or k == 0:
+            continue
+        if ii.size > k:
+            melhores = np.argpartition(-abs_r[ii, jj], k - 1)[:k]
+            ii, jj = ii[melhores], jj[melhores]
+
+        for i, j in zip(ii.tolist(), jj.tolist()):
+            item = (float(abs_r[i, j]), fa.start + i, fb.start + j, float(r[i, j]), int(n[i, j]))
+            if len(heap) < k:
+                heapq.heappush(heap, item)
+            elif item[0] > heap[0][0]:
+                heapq.heapreplace(heap, item)
+
+    pares = sorted(heap, key=lambda item: (-item[0], item[1], item[2]))
+    ranking = pd.DataFrame(
+        {
+            "var1": [nomes[i] for _, i, _, _, _ in pares],
+            "var2": [nomes[j] for _, _, j, _, _ in pares],
+            "r": [r for _, _, _, r, _ in pares],
+            "abs_r": [a for a, _, _, _, _ in pares],
+            "n": [n for _, _, _, _, n in pares],
+        }
+    )
+    sig = significancia_correlacao(ranking["r"].to_numpy(), ranking["n"].to_numpy(), metodo)
+    for chave, valores in sig.items():
+        ranking[chave] = valores
+    return ranking
+
+
+# ============================================================
+# 3) p-valores e intervalos de confiança (matriz inteira)
+# ============================================================
+
+def _no_formato_de(modelo, valores: np.ndarray):
+    """Devolve `valores` no mesmo tipo de `modelo` (DataFrame, Series, escalar ou array)."""
+    if isinstance(modelo, pd.DataFrame):
+        return pd.DataFrame(valores, index=modelo.index, columns=modelo.columns)
+    if isinstance(modelo, pd.Series):
+        return pd.Series(valores, index=modelo.index)
+    if np.ndim(modelo) == 0:
+        return float(valores)
+    return valores
+
+
+def significancia_correlacao(
+    corr,
+    n,
+    metodo: str = "pearson",
+    nivel: float = 0.95,
+    n_controle: int = 0,
+) -> dict:
+    """
+    p-valores (bicaudais) e IC de Fisher-z para todos os coeficientes de
+    uma vez, a partir de r e do número de pares válidos (`retornar_n=True`
+    em `matriz_correlacao`). Aceita DataFrames, arrays ou escalares.
+
+    - Pearson/Spearman: t = r·√((n−2)/(1−r²)) com n−2 gl;
+      erro padrão de z: 1/√(n−3) (Spearman: √(1,06/(n−3)), Fieller);
+    - Kendall: aproximação normal z = 3τ·√(n(n−1)) / √(2(2n+5));
+      erro padrão de z: √(0,437/(n−4)).
+
+    n_controle:
+        número de variáveis controladas (correlação parcial): os graus de
+        liberdade e o erro padrão de z perdem um grau por variável.
+
+    Retorna dict com "p_value", "ic_inf" e "ic_sup" no mesmo formato de `corr`.
+    """
+    if metodo not in METODOS_CORRELACAO:
+        raise ValueError(f"Método de correlação desconhecido: {metodo}. Use um de {list(METODOS_CORRELACAO)}.")
+
+    r = np.asarray(corr, dtype=np.float64)
+    n = np.asarray(n, dtype=np.float64) - float(n_controle)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if metodo == "kendall":
+            estat = 3.0 * r * np.sqrt(n * (n - 1)) / np.sqrt(2.0 * (2.0 * n + 5.0))
+            p = 2.0 * special.ndtr(-np.abs(estat))
+            ep = np.sqrt(0.437 / (n - 4.0))
+            p = np.where(n >= 2, p, np.nan)
+        else:
+            gl = n - 2.0
+            estat = r * np.sqrt(gl / ((1.0 - r) * (1.0 + r)))
+            p = np.where(gl > 0, 2.0 * special.stdtr(gl, -np.abs(estat)), np.nan)
+            ep = np.sqrt((1.06 if metodo == "spearman" else 1.0) / (n - 3.0))
+
+        z = np.arctanh(r)
+        meia = stats.norm.isf((1.0 - nivel) / 2.0) * ep
+        ic_inf = np.tanh(z - meia)
+        ic_sup = np.tanh(z + meia)
+
+    # |r| = 1 → p = 0 e IC degenerado; n pequeno demais → IC indefinido
+    p = np.where(np.isnan(r), np.nan, p)
+    sem_ic = np.isnan(r) | ~np.isfinite(ep)
+    ic_inf = np.where(sem_ic, np.nan, ic_inf)
+    ic_sup = np.where(sem_ic, np.nan, ic_sup)
+
+    return {
+        "p_value": _no_formato_de(corr, p),
+        "ic_inf": _no_formato_de(corr, ic_inf),
+        "ic_sup": _no_formato_de(corr, ic_sup),
+    }
+
+
+# ============================================================
+# 4) Correlação incremental (dados em blocos / ao vivo)
+# ============================================================
+#
+# Acumulador de co-momentos (dict), por par de colunas (i, j), usando só
+# as linhas em que as duas são válidas:
+#   - n[i, j]      número de linhas válidas do par
+#   - media[i, j]  média da coluna i nessas linhas (a da coluna j é media[j, i])
+#   - m2[i, j]     Σ(xᵢ − média)² nessas linhas
+#   - c[i, j]      Σ(xᵢ − médiaᵢ)(xⱼ − médiaⱼ)
+# Combinação pela fórmula paralela de Chan et al., elemento a elemento:
+# associativa, então blocos podem ser processados em qualquer ordem.
+
+_CHAVES_COMOMENTOS = ("n", "media", "m2", "c")
+
+
+def comomentos_bloco(df: pd.DataFrame, colunas: list | None = None) -> dict:
+    """Co-momentos pairwise-complete de um bloco de dados (custo O(linhas × colunas²))."""
+    X, nomes = _preparar_matriz(df, colunas)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        deslocamento = np.nan_to_num(np.nanmean(df[nomes].to_numpy(dtype=np.float64, na_value=np.nan), axis=0))
+
+    s = _somas_pareadas(X, X)
+    n = s["n"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        media_a = np.where(n > 0, s["sa"] / n, 0.0)
+        m2 = np.where(n > 0, s["saa"] - s["sa"] * media_a, 0.0)
+        c = np.where(n > 0, s["sab"] - s["sa"] * s["sb"] / n, 0.0)
+
+    # variância nula no bloco: mesma regra de `_r_de_somas`, relativa à norma
+    # dos dados já centrados (não depende da média); zera m2 e c exatamente
+    nula = m2 <= _TOL_VARIANCIA * s["saa"]
+    m2 = np.where(nula, 0.0, m2)
+    c = np.where(nula | nula.T, 0.0, c)
+
+    return {
+        "colunas": nomes,
+        "n": n,
+        "media": media_a + deslocamento[:, None],
+        "m2": m2,
+        "c": c,
+    }
+
+
+def _alinhar_comomentos(acumulado: dict, colunas: list) -> dict:
+    """Reindexa o acumulador para `colunas` (colunas novas entram zeradas)."""
+    if acumulado["colunas"] == colunas:
+        return acumulado
+    pos = pd.Index(acumulado["colunas"]).get_indexer(colunas)
+    existe = pos >= 0
+    out = {"colunas": list(colunas)}
+    for chave in _CHAVES_COMOMENTOS:
+        M = np.zeros((len(colunas), len(colunas)))
+        M[np.ix_(existe, existe)] = acumulado[chave][np.ix_(pos[existe], pos[existe])]
+        out[chave] = M
+    return out
+
+
+def combinar_comomentos(a: dict | None, b: dict | None) -> dict | None:
+    """
+    Combina dois acumuladores de co-momentos.
+
+    Colunas presentes em apenas um dos lados são mantidas (pares sem
+    linhas em comum ficam com n = 0).
+    """
+    if a is None or b is None:
+        return b if a is None else a
+
+    colunas = list(pd.Index(a["colunas"]).union(pd.Index(b["colunas"]), sort=False))
+    a = _alinhar_comomentos(a, colunas)
+    b = _alinhar_comomentos(b, colunas)
+
+    n = a["n"] + b["n"]
+    delta = b["media"] - a["media"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        peso = np.where(n > 0, a["n"] * b["n"] / n, 0.0)
+        media = np.where(n > 0, a["media"] + delta * (b["n"] / n), 0.0)
+    return {
+        "colunas": colunas,
+        "n": n,
+        "media": media,
+        "m2": a["m2"] + b["m2"] + delta * delta * peso,
+        "c": a["c"] + b["c"] + delta * delta.T * peso,
+    }
+
+
+def acumular_comomentos(blocos, colunas: list | None = None, acumulado: dict | None = None) -> dict | None:
+    """
+    Acumula co-momentos sobre um iterável de DataFrames — por exemplo
+    `pd.read_csv(..., chunksize=...)`, consultas paginadas ou novas linhas
+    de um arquivo acompanhado ao vivo.
+
+    Uma única passada; a memória depende só do número de colunas (p × p).
+    Passe `acumulado` para continuar de onde uma chamada anterior parou.
+    """
+    for bloco in blocos:
+        acumulado = combinar_comomentos(acumulado, comomentos_bloco(bloco, colunas))
+    return acumulado
+
+
+def correlacao_de_comomentos(acumulado: dict, retornar_n: bool = False):
+    """
+    Matriz de Pearson (pairwise-complete) no estado atual do acumulador —
+    a mesma de `matriz_correlacao` sobre a concatenação dos blocos.
+    """
+    nomes = acumulado["colunas"]
+    n, m2, c = acumulado["n"], acumulado["m2"], acumulado["c"]
+
+    # m2 é centrado (Chan) e já zerado por bloco quando a variância é nula:
+    # a média da coluna não entra no critério
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r = c / np.sqrt(m2 * m2.T)
+    invalido = (n < 2) | (m2 <= 0) | (m2.T <= 0)
+    r = np.clip(np.where(invalido, np.nan, r), -1.0, 1.0)
+
+    diag = np.diagonal(r).copy()
+    np.fill_diagonal(r, np.where(np.isnan(diag), np.nan, 1.0))
+
+    corr = pd.DataFrame(r, index=nomes, columns=nomes)
+    if retornar_n:
+        return corr, pd.DataFrame(n.astype(np.int64), index=nomes, columns=nomes)
+    return corr
+
+
+# ============================================================
+# 5) Correlação parcial e ordem por agrupamento (heatmap)
+# ============================================================
+
+def correlacao_parcial(corr: pd.DataFrame) -> pd.DataFrame:
+    """
+    Correlação parcial de cada par controlando por todas as outras
+    variáveis, a partir da matriz de precisão P = R⁻¹:
+
+        r_ij·resto = −P_ij / √(P_ii P_jj)
+
+    Uma única (pseudo-)inversão para a matriz inteira. Variáveis com r
+    indefinido (colunas constantes) ficam de fora e recebem NaN; pares
+    sem linhas em comum entram como r = 0. Com NaN
+    nos dados, R é pairwise-complete e pode não ser positiva definida: a
+    pseudo-inversa mantém o resultado finito, mas ele é aproximado.
+    """
+    R = corr.to_numpy(dtype=np.float64)
+    validas = ~np.isnan(np.diagonal(R))
+    indice = np.flatnonzero(validas)
+
+    parcial = np.full(R.shape, np.nan)
+    if indice.size >= 2:
+        P = np.linalg.pinv(np.nan_to_num(R[np.ix_(indice, indice)], nan=0.0), hermitian=True)
+        d = np.sqrt(np.diagonal(P))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            bloco = np.clip(-P / np.outer(d, d), -1.0, 1.0)
+        np.fill_diagonal(bloco, 1.0)
+        parcial[np.ix_(indice, indice)] = bloco
+    elif indice.size == 1:
+        parcial[indice[0], indice[0]] = 1.0
+
+    return pd.DataFrame(parcial, index=corr.index, columns=corr.columns)
+
+
+def ordem_agrupada(corr: pd.DataFrame, ligacao: str = "average") -> list:
+    """
+    Ordem das variáveis por agrupamento hierárquico com distância 1 − |r|
+    (folhas na ordem ótima), para que blocos correlacionados fiquem
+    juntos no heatmap. Pares com r indefinido contam como distância 1.
+    """
+    nomes = corr.columns.tolist()
+    if len(nomes) < 3:
+        return nomes
+
+    D = 1.0 - np.abs(np.nan_to_num(corr.to_numpy(dtype=np.float64), nan=0.0))
+    D = np.clip((D + D.T) / 2.0, 0.0, 1.0)
+    np.fill_diagonal(D, 0.0)
+    arvore = hierarchy.linkage(squareform(D, checks=False), method=ligacao, optimal_ordering=True)
+    return [nomes[i] for i in hierarchy.leaves_list(arvore)]
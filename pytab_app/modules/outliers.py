@@ -1,23 +1,48 @@
 """
 Módulo de detecção de outliers para o PyTab.
 Suporta: Z-score, IQR e MAD.
+
+Todas as funções aceitam pesos de frequência opcionais (`weights`/`pesos`),
+alinhados ao índice da série, para dados pré-agregados. Os pesos precisam
+ser inteiros (contagens); linhas com peso 0 ou ausente são descartadas.
 """
 
 import numpy as np
 import pandas as pd
 
+from pytab.stats.descriptive import weighted_mean_std, weighted_quantile
+
 
-def zscore_outliers(series: pd.Series, threshold=3):
+def _valid_weights(series: pd.Series, weights):
+    """Série sem nulos e pesos alinhados ao seu índice (None sem pesos)."""
     s = series.dropna()
-    z = (s - s.mean()) / s.std(ddof=1)
+    if weights is None:
+        return s, None
+    if not isinstance(weights, pd.Series):
+        weights = pd.Series(np.asarray(weights, dtype=float), index=series.index)
+    w = pd.to_numeric(weights, errors="coerce").reindex(s.index).fillna(0.0)
+    keep = w > 0
+    return s[keep], w[keep]
+
+
+def zscore_outliers(series: pd.Series, threshold=3, weights=None):
+    s, w = _valid_weights(series, weights)
+    if w is None:
+        z = (s - s.mean()) / s.std(ddof=1)
+    else:
+        _, mean, std = weighted_mean_std(s, w, ddof=1)
+        z = (s - mean) / std
     mask = np.abs(z) > threshold
     return s[mask], z
 
 
-def iqr_outliers(series: pd.Series, multiplier=1.5):
-    s = series.dropna()
-    q1 = s.quantile(0.25)
-    q3 = s.quantile(0.75)
+def iqr_outliers(series: pd.Series, multiplier=1.5, weights=None):
+    s, w = _valid_weights(series, weights)
+    if w is None:
+        q1 = s.quantile(0.25)
+        q3 = s.quantile(0.75)
+    else:
+        q1, q3 = weighted_quantile(s, w, [0.25, 0.75])
     iqr = q3 - q1
     lower = q1 - multiplier * iqr
     upper = q3 + multiplier * iqr
@@ -25,35 +50,47 @@ def iqr_outliers(series: pd.Series, multiplier=1.5):
     return s[mask], (lower, upper)
 
 
-def mad_outliers(series: pd.Series, threshold=3.5):
-    s = series.dropna()
-    median = s.median()
-    mad = np.median(np.abs(s - median))
+def mad_outliers(series: pd.Series, threshold=3.5, weights=None):
+    s, w = _valid_weights(series, weights)
+    if w is None:
+        median = s.median()
+        mad = np.median(np.abs(s - median))
+    else:
+        median = weighted_quantile(s, w, 0.5)
+        mad = weighted_quantile(np.abs(s - median), w, 0.5)
     modified_z = 0.6745 * (s - median) / mad if mad != 0 else np.zeros(len(s))
     mask = np.abs(modified_z) > threshold
     return s[mask], modified_z
 
 
-def detectar_outliers(series: pd.Series, metodo="Auto"):
+def detectar_outliers(series: pd.Series, metodo="Auto", pesos=None):
     """
     Detecta outliers de forma automática ou conforme método selecionado.
+
+    pesos:
+        pesos de frequência opcionais (ex.: coluna de contagem de dados
+        pré-agregados), evitando expandir a série com `np.repeat`.
     """
     if metodo == "Z-score":
-        return zscore_outliers(series)
+        return zscore_outliers(series, weights=pesos)
 
     if metodo == "IQR":
-        return iqr_outliers(series)
+        return iqr_outliers(series, weights=pesos)
 
     if metodo == "MAD":
-        return mad_outliers(series)
+        return mad_outliers(series, weights=pesos)
 
     # ---- Automático ----
-    s = series.dropna()
-    cv = s.std(ddof=1) / s.mean()
+    s, w = _valid_weights(series, pesos)
+    if w is None:
+        cv = s.std(ddof=1) / s.mean()
+    else:
+        _, mean, std = weighted_mean_std(s, w, ddof=1)
+        cv = std / mean
 
     if cv < 0.10:
-        return iqr_outliers(s)
+        return iqr_outliers(s, weights=w)
     elif cv < 0.30:
-        return zscore_outliers(s, threshold=2.5)
+        return zscore_outliers(s, threshold=2.5, weights=w)
     else:
-        return mad_outliers(s)
+        return mad_outliers(s, weights=w)
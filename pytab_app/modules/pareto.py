@@ -0,0 +1,460 @@
+"""
+pytab_app.modules.pareto
+------------------------
+
+Motor da análise de Pareto (aba Pareto da fase Analisar).
+
+- A dimensão é convertida em códigos inteiros uma única vez (códigos do
+  categórico, o próprio inteiro ou `pd.factorize`), e os totais por
+  categoria saem de um `np.bincount`. Isso evita o groupby sobre strings
+  (object). Só entram categorias observadas (`observed=True`).
+- Medidas: soma de uma métrica, contagem de ocorrências (`valor=None`) ou
+  contagem ponderada por um peso de cada categoria (`pesos`).
+- As N maiores categorias são encontradas por seleção parcial
+  (`np.argpartition`, O(k)), e só elas são ordenadas. As demais viram uma
+  única barra "Outros". O gráfico tem no máximo N + 1 barras, e os
+  percentuais acumulados continuam exatos, pois usam o total geral.
+- `cubo_pareto` pré-agrega a hierarquia de drill-down (grouping sets), e
+  cada clique vira uma consulta a dicionário.
+- `tendencia_pareto` mostra como o ranking muda período a período (um
+  único groupby por (período, categoria), com as mesmas regras de
+  periodicidade da fase Medir).
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from pytab_app.modules.aggregation import _PERIODICITY_TO_RULE, _parse_datetime_series
+
+
+# Limite da regra 80/20 (% acumulado que define as categorias "vitais")
+LIMITE_VITAIS = 80.0
+
+COLUNAS_PARETO = ["categoria", "valor", "percentual", "percentual_acumulado", "n_categorias"]
+
+
+# ============================================================
+# 1) Códigos e totais por categoria
+# ============================================================
+
+def _codigos_pareto(serie: pd.Series) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Códigos inteiros (nulos = -1) e rótulos de cada código.
+
+    Categóricos usam os próprios códigos; inteiros não negativos de faixa
+    pequena (códigos de defeito, por exemplo) são usados diretamente, sem
+    hashing; o resto passa por `pd.factorize`.
+    """
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        return serie.cat.codes.to_numpy().astype(np.int64), np.asarray(serie.cat.categories, dtype=object)
+    if pd.api.types.is_integer_dtype(serie.dtype) and not isinstance(serie.dtype, pd.api.extensions.ExtensionDtype):
+        x = serie.to_numpy()
+        if x.size and x.min() >= 0 and x.max() < max(x.size, 1 << 16):
+            return x.astype(np.int64, copy=False), np.arange(int(x.max()) + 1, dtype=object)
+    codigos, rotulos = pd.factorize(serie)
+    return codigos.astype(np.int64), np.asarray(rotulos, dtype=object)
+
+
+def _valores_pareto(df: pd.DataFrame, valor: str | None) -> np.ndarray | None:
+    """Métrica numérica (NaN para inválidos) ou None no modo contagem."""
+    if valor is None:
+        return None
+    return pd.to_numeric(df[valor], errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def _totais_por_codigo(
+    codigos: np.ndarray,
+    k: int,
+    valores: np.ndarray | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    (totais, contagens) por código com um bincount. Sem `valores`, o total
+    é a própria contagem. Linhas com código ou valor nulo são ignoradas.
+    """
+    validos = codigos >= 0
+    if valores is not None:
+        validos &= ~np.isnan(valores)
+    if not validos.all():
+        codigos = codigos[validos]
+        valores = valores[validos] if valores is not None else None
+    contagens = np.bincount(codigos, minlength=k).astype(np.float64)
+    if valores is None:
+        return contagens, contagens
+    return np.bincount(codigos, weights=valores, minlength=k), contagens
+
+
+# ============================================================
+# 2) Top N + "Outros"
+# ============================================================
+
+def _ordem_top(totais: np.ndarray, top_n: int) -> np.ndarray:
+    """Índices dos `top_n` maiores totais, em ordem decrescente (empates pelo índice)."""
+    k = totais.size
+    if 0 < top_n < k:
+        idx = np.argpartition(-totais, top_n - 1)[:top_n]
+    else:
+        idx = np.arange(k)
+    return idx[np.lexsort((idx, -totais[idx]))]
+
+
+def _n_vitais(totais: np.ndarray, idx_top: np.ndarray, total: float, limite: float) -> int:
+    """
+    Número de categorias (em ordem decrescente) cujo % acumulado não passa
+    de `limite` (mínimo 1), como na regra 80/20. Só ordena as categorias
+    fora do top N se o top N ainda não tiver chegado ao limite.
+    """
+    acumulado = np.cumsum(totais[idx_top]) / total * 100.0
+    n = int((acumulado <= limite).sum())
+    if n == idx_top.size and idx_top.size < totais.size:
+        resto = np.delete(totais, idx_top)
+        resto = -np.sort(-resto)
+        acumulado_resto = acumulado[-1] + np.cumsum(resto) / total * 100.0
+        n += int((acumulado_resto <= limite).sum())
+    return max(n, 1)
+
+
+def pareto_de_totais(
+    totais: np.ndarray,
+    rotulos,
+    top_n: int = 20,
+    limite: float = LIMITE_VITAIS,
+) -> dict:
+    """
+    Pareto a partir dos totais já agregados por categoria.
+
+    Retorna dict com:
+        tabela        DataFrame (categoria, valor, percentual,
+                      percentual_acumulado, n_categorias), com as N maiores
+                      categorias e, se houver mais, uma linha "Outros"
+        total         soma de todas as categorias
+        n_categorias  número de categorias observadas
+        n_vitais      categorias necessárias para chegar a `limite` %
+        share_vitais  % acumulado dessas categorias
+        vitais        rótulos das vitais que aparecem na tabela
+    """
+    totais = np.asarray(totais, dtype=np.float64)
+    rotulos = np.asarray(rotulos, dtype=object)
+    k = totais.size
+    total = float(totais.sum())
+
+    if k == 0 or total == 0:
+        return {
+            "tabela": pd.DataFrame(columns=COLUNAS_PARETO),
+            "total": total,
+            "n_categorias": k,
+            "n_vitais": 0,
+            "share_vitais": float("nan"),
+            "vitais": [],
+        }
+
+    # uma única categoria restante não vira "Outros"
+    idx = _ordem_top(totais, int(top_n) if k > int(top_n) + 1 else k)
+    valores = totais[idx]
+    categorias = rotulos[idx].tolist()
+    n_cats = [1] * idx.size
+
+    n_outros = k - idx.size
+    if n_outros > 0:
+        valores = np.append(valores, total - valores.sum())
+        categorias.append(f"Outros ({n_outros:,} categorias)".replace(",", "."))
+        n_cats.append(n_outros)
+
+    percentual = valores / total * 100.0
+    acumulado = np.cumsum(percentual)
+    if n_outros > 0:
+        acumulado[-1] = 100.0      # evita 99,99…% por arredondamento
+
+    n_vitais = _n_vitais(totais, idx, total, limite)
+    if n_vitais <= idx.size:
+        share = float(acumulado[n_vitais - 1])
+    else:
+        share = float(np.sort(totais)[::-1][:n_vitais].sum() / total * 100.0)
+
+    tabela = pd.DataFrame(
+        {
+            "categoria": categorias,
+            "valor": valores,
+            "percentual": percentual,
+            "percentual_acumulado": acumulado,
+            "n_categorias": n_cats,
+        }
+    )
+    return {
+        "tabela": tabela,
+        "total": total,
+        "n_categorias": k,
+        "n_vitais": n_vitais,
+        "share_vitais": share,
+        "vitais": rotulos[idx[: min(n_vitais, idx.size)]].tolist(),
+    }
+
+
+def calcular_pareto(
+    df: pd.DataFrame,
+    categoria: str,
+    valor: str | None = None,
+    top_n: int = 20,
+    limite: float = LIMITE_VITAIS,
+    pesos=None,
+    peso_padrao: float = 1.0,
+) -> dict:
+    """
+    Pareto por `categoria`, com as `top_n` maiores categorias e o restante
+    agrupado em "Outros" (ver `pareto_de_totais`).
+
+    valor:
+        métrica somada por categoria; None conta as ocorrências (linhas).
+    pesos:
+        peso por categoria (dict ou Series rótulo → peso), por exemplo a
+        severidade de cada tipo de defeito: o total da categoria é
+        multiplicado pelo seu peso (contagem ponderada). Categorias sem
+        peso usam `peso_padrao`. Pesos negativos ou não finitos geram
+        ValueError.
+
+    Linhas com categoria ou valor ausente são ignoradas.
+    """
+    codigos, rotulos = _codigos_pareto(df[categoria])
+    totais, contagens = _totais_por_codigo(codigos, len(rotulos), _valores_pareto(df, valor))
+
+    observadas = contagens > 0
+    totais, rotulos = totais[observadas], rotulos[observadas]
+    if pesos is not None:
+        pesos = pd.Series(pesos, dtype=float)
+        invalidos = pesos.index[~np.isfinite(pesos.to_numpy()) | (pesos.to_numpy() < 0)].tolist()
+        if invalidos or not (np.isfinite(peso_padrao) and peso_padrao >= 0):
+            raise ValueError(
+                "Os pesos do Pareto precisam ser números finitos e não negativos "
+                f"(inválidos: {invalidos or ['peso_padrao']})."
+            )
+        fatores = pesos.reindex(rotulos).fillna(peso_padrao).to_numpy()
+        totais = totais * fatores
+    return pareto_de_totais(totais, rotulos, top_n=top_n, limite=limite)
+
+
+# ============================================================
+# 3) Cubo de Pareto (drill-down sem novos groupbys)
+# ============================================================
+#
+# O cubo agrega, numa única passada sobre os dados, as combinações de
+# dimensões pedidas (grouping sets; por padrão a hierarquia de drill-down
+# (d1), (d1, d2), (d1, d2, d3)...). Cada conjunto fica indexado pelo
+# "caminho" dos níveis anteriores, de modo que um clique de drill-down é
+# uma consulta a dicionário seguida de `pareto_de_totais` sobre os filhos.
+
+def _agrupar_codigos(colunas: list[np.ndarray]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Id de grupo (0..m-1) de cada linha para a combinação das colunas de
+    códigos, e a primeira linha de cada grupo. A chave é combinada coluna a
+    coluna e refatorada, de modo que nunca estoura o int64.
+    """
+    chave = colunas[0]
+    for codigos in colunas[1:]:
+        chave, _ = pd.factorize(chave * (int(codigos.max(initial=0)) + 1) + codigos)
+    ids, unicos = pd.factorize(chave)
+    primeira = np.empty(len(unicos), dtype=np.int64)
+    primeira[ids[::-1]] = np.arange(ids.size)[::-1]
+    return ids.astype(np.int64), primeira
+
+
+def cubo_pareto(
+    df: pd.DataFrame,
+    dimensoes: list,
+    valor: str | None = None,
+    conjuntos: list | None = None,
+) -> dict:
+    """
+    Pré-agrega a soma de `valor` (ou a contagem, com `valor=None`) para
+    cada conjunto de dimensões.
+
+    dimensoes:
+        colunas categóricas, na ordem do drill-down.
+    conjuntos:
+        combinações a agregar (tuplas de dimensões; a última de cada tupla é
+        a dimensão do Pareto e as anteriores, o caminho de filtros). Padrão:
+        os prefixos de `dimensoes`.
+
+    A passada sobre os dados agrega a combinação mais fina; os demais
+    conjuntos são agregados a partir dela (tamanho = combinações
+    observadas, não linhas). Linhas com valor nulo são ignoradas; uma
+    dimensão nula exclui a linha apenas dos conjuntos que usam essa dimensão.
+    """
+    dimensoes = list(dimensoes)
+    if conjuntos is None:
+        conjuntos = [tuple(dimensoes[: i + 1]) for i in range(len(dimensoes))]
+    conjuntos = [tuple(c) for c in conjuntos]
+    for conjunto in conjuntos:
+        if not conjunto or not set(conjunto) <= set(dimensoes):
+            raise ValueError(f"Conjunto de dimensões inválido: {conjunto}. Use dimensões de {dimensoes}.")
+
+    codigos, rotulos = zip(*(_codigos_pareto(df[d]) for d in dimensoes))
+    valores = _valores_pareto(df, valor)
+    if valores is None:
+        valores = np.ones(len(df))
+
+    validos = ~np.isnan(valores)
+    codigos = [c[validos] for c in codigos]
+
+    # passada única: combinação mais fina observada (nulo = código -1)
+    ids, primeira = _agrupar_codigos([c + 1 for c in codigos])
+    totais = np.bincount(ids, weights=valores[validos], minlength=primeira.size)
+    combos = np.column_stack([c[primeira] for c in codigos])
+
+    niveis = {}
+    for conjunto in conjuntos:
+        sub = combos[:, [dimensoes.index(d) for d in conjunto]]
+        completos = (sub >= 0).all(axis=1)     # nulos só saem dos conjuntos que usam a dimensão
+        sub = sub[completos]
+        ids_sub, primeira_sub = _agrupar_codigos(list(sub.T))
+        totais_sub = np.bincount(ids_sub, weights=totais[completos], minlength=primeira_sub.size)
+        codigos_sub = sub[primeira_sub]
+
+        # índice pelo caminho (códigos dos níveis anteriores)
+        caminhos = {}
+        if codigos_sub.shape[1] > 1 and codigos_sub.shape[0]:
+            ids_pai, primeira_pai = _agrupar_codigos(list(codigos_sub[:, :-1].T))
+            ordem = np.argsort(ids_pai, kind="stable")
+            cortes = np.flatnonzero(np.diff(ids_pai[ordem])) + 1
+            for grupo in np.split(ordem, cortes):
+                caminho = tuple(codigos_sub[grupo[0], :-1].tolist())
+                caminhos[caminho] = (codigos_sub[grupo, -1], totais_sub[grupo])
+        elif codigos_sub.shape[1] == 1:
+            caminhos[()] = (codigos_sub[:, 0], totais_sub)
+        niveis[conjunto] = caminhos
+
+    return {
+        "dimensoes": dimensoes,
+        "valor": valor,
+        "rotulos": dict(zip(dimensoes, rotulos)),
+        "indices": {d: pd.Index(r) for d, r in zip(dimensoes, rotulos)},
+        "niveis": niveis,
+    }
+
+
+def pareto_do_cubo(
+    cubo: dict,
+    dimensao: str,
+    filtros: dict | None = None,
+    top_n: int = 20,
+    limite: float = LIMITE_VITAIS,
+) -> dict:
+    """
+    Pareto de `dimensao` dentro do caminho `filtros` ({dimensão: rótulo},
+    na ordem do drill-down), consultando o cubo. Mesmo retorno de
+    `calcular_pareto`.
+    """
+    filtros = dict(filtros or {})
+    conjunto = tuple(filtros) + (dimensao,)
+    if conjunto not in cubo["niveis"]:
+        raise ValueError(f"O cubo não tem o conjunto {conjunto}. Disponíveis: {list(cubo['niveis'])}.")
+
+    caminho = []
+    for d, rotulo in filtros.items():
+        pos = cubo["indices"][d].get_indexer([rotulo])[0]
+        if pos < 0:
+            raise ValueError(f"Categoria {rotulo!r} não encontrada em {d}.")
+        caminho.append(int(pos))
+
+    filhos, totais = cubo["niveis"][conjunto].get(tuple(caminho), (np.empty(0, np.int64), np.empty(0)))
+    return pareto_de_totais(totais, cubo["rotulos"][dimensao][filhos], top_n=top_n, limite=limite)
+
+
+# ============================================================
+# 4) Tendência do Pareto por período
+# ============================================================
+
+# Regra de resample → (frequência de período do pandas, rótulo do período)
+_PERIODOS_POR_REGRA = {
+    "D": ("D", "start"),
+    "W": ("W-SUN", "end"),       # semanas terminando no domingo, rotuladas pelo domingo
+    "MS": ("M", "start"),
+    "QS": ("Q-DEC", "start"),
+    "YS": ("Y-DEC", "start"),
+}
+
+def tendencia_pareto(
+    df: pd.DataFrame,
+    data: str,
+    categoria: str,
+    valor: str | None = None,
+    periodicidade: str = "Mensal",
+    top_n: int = 5,
+) -> dict:
+    """
+    Evolução do ranking de Pareto ao longo do tempo.
+
+    Os totais por (período, categoria) saem de um único groupby, com os
+    períodos de `aggregation._PERIODICITY_TO_RULE` ("Diário", "Semanal",
+    "Mensal", "Trimestral", "Anual") e os mesmos rótulos de `resample`. Em cada período, calcula a
+    participação (% do total do período) e a posição no ranking.
+
+    As séries retornadas cobrem as `top_n` categorias de maior total no
+    horizonte inteiro e as que foram líderes em algum período. Categorias
+    sem ocorrência num período têm valor e participação 0 e posição NaN.
+    Com `valor=None`, conta as ocorrências.
+
+    Retorna dict com:
+        serie    DataFrame (periodo, categoria, valor, participacao, posicao)
+        lideres  Series período → categoria líder
+        totais   Series período → total do período
+    """
+    regra = _PERIODICITY_TO_RULE.get(periodicidade)
+    if regra is None:
+        raise ValueError(f"Periodicidade inválida: {periodicidade}")
+
+    datas = df[data]
+    if not pd.api.types.is_datetime64_any_dtype(datas):
+        datas = _parse_datetime_series(datas)
+    if getattr(datas.dt, "tz", None) is not None:
+        datas = datas.dt.tz_localize(None)
+    codigos, rotulos = _codigos_pareto(df[categoria])
+    valores = _valores_pareto(df, valor)
+    if valores is None:
+        valores = np.ones(len(df))
+
+    validos = datas.notna().to_numpy() & (codigos >= 0) & ~np.isnan(valores)
+    if not validos.any():
+        return {
+            "serie": pd.DataFrame(columns=["periodo", "categoria", "valor", "participacao", "posicao"]),
+            "lideres": pd.Series(dtype=object),
+            "totais": pd.Series(dtype=float),
+        }
+
+    # período de cada linha sem ordenar as datas (to_period é O(n)); os
+    # rótulos coincidem com os de `resample(regra)`
+    freq, rotulo = _PERIODOS_POR_REGRA[regra]
+    ordinais = datas[validos].dt.to_period(freq).array.asi8
+
+    # groupby único: (período, código da categoria)
+    totais = pd.Series(valores[validos]).groupby([ordinais, codigos[validos]]).sum()
+    inicio = pd.PeriodIndex.from_ordinals(totais.index.levels[0], freq=freq).to_timestamp(how=rotulo).normalize()
+    totais.index = totais.index.set_levels(inicio, level=0).set_names(["periodo", "codigo"])
+
+    por_periodo = totais.groupby(level="periodo").sum()
+    posicao = totais.groupby(level="periodo").rank(ascending=False, method="min")
+
+    lideres = totais[posicao == 1].reset_index().drop_duplicates("periodo").set_index("periodo")["codigo"]
+    geral = totais.groupby(level="codigo").sum()
+    escolhidas = pd.Index(geral.nlargest(int(top_n)).index).union(pd.Index(lideres.unique()), sort=False)
+
+    # grade completa período × categoria escolhida (ausentes = 0)
+    grade = pd.MultiIndex.from_product([por_periodo.index, escolhidas], names=["periodo", "codigo"])
+    valor_grade = totais.reindex(grade, fill_value=0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        participacao = valor_grade / por_periodo.reindex(grade.get_level_values("periodo")).to_numpy() * 100.0
+
+    serie = pd.DataFrame(
+        {
+            "periodo": grade.get_level_values("periodo"),
+            "categoria": rotulos[grade.get_level_values("codigo").to_numpy()],
+            "valor": valor_grade.to_numpy(),
+            "participacao": participacao.to_numpy(),
+            "posicao": posicao.reindex(grade).to_numpy(),
+        }
+    )
+    return {
+        "serie": serie,
+        "lideres": pd.Series(rotulos[lideres.to_numpy()], index=lideres.index),
+        "totais": por_periodo,
+    }
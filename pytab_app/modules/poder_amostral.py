@@ -0,0 +1,347 @@
+"""
+pytab_app.modules.poder_amostral
+--------------------------------
+
+Poder estatístico e tamanho amostral para planejar experimentos de melhoria
+antes de coletar dados:
+
+- poder_teste_t(efeito, n, ...): t de 1 amostra, 2 amostras ou pareado
+  (efeito = d de Cohen; t não central)
+- poder_anova(efeito, k, n, ...): ANOVA One-Way (efeito = f de Cohen;
+  F não central)
+- poder_proporcoes(p1, p2, n, ...): duas proporções (h de Cohen,
+  aproximação normal)
+- tamanho_amostral(teste, poder=0.8, ...): menor n que atinge o poder alvo
+- grade_poder(teste, n=..., efeito=..., alpha=...): curvas completas em
+  formato "tidy", prontas para `curva_poder_figure`
+
+Todas as funções aceitam escalares ou arrays e fazem broadcasting: uma
+curva inteira (poder × n × efeito × alpha) é avaliada com uma única
+chamada vetorizada às distribuições não centrais do SciPy.
+
+Convenção: `n` é sempre o tamanho **por grupo** (no pareado e no de
+1 amostra, o número de observações/pares).
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from scipy import stats
+
+from pytab_app.modules.testes_estatisticos import _fmt_num_user
+
+
+# n máximo pesquisado por `tamanho_amostral`
+N_MAXIMO = 10_000_000
+
+_NOMES_TESTE = {
+    "uma_amostra": "teste t de 1 amostra",
+    "duas_amostras": "teste t de 2 amostras",
+    "pareado": "teste t pareado",
+    "anova": "ANOVA One-Way",
+    "proporcoes": "teste de duas proporções",
+}
+
+_NOMES_EFEITO = {
+    "uma_amostra": "d de Cohen",
+    "duas_amostras": "d de Cohen",
+    "pareado": "d de Cohen",
+    "anova": "f de Cohen",
+    "proporcoes": "h de Cohen",
+}
+
+
+# ============================================================
+# 1) Poder (vetorizado)
+# ============================================================
+
+def _validar_alternativa(alternativa: str) -> str:
+    if alternativa not in ("bilateral", "maior", "menor"):
+        raise ValueError("alternativa deve ser 'bilateral', 'maior' ou 'menor'.")
+    return alternativa
+
+
+def poder_teste_t(
+    efeito,
+    n,
+    alpha=0.05,
+    tipo: str = "duas_amostras",
+    alternativa: str = "bilateral",
+) -> np.ndarray:
+    """
+    Poder do teste t (distribuição t não central).
+
+    efeito:
+        d de Cohen = diferença de médias / desvio padrão
+        (no pareado, desvio padrão das diferenças).
+    tipo:
+        "uma_amostra", "duas_amostras" (grupos de tamanho n) ou "pareado".
+    """
+    _validar_alternativa(alternativa)
+    d, n, alpha = np.broadcast_arrays(
+        np.asarray(efeito, dtype=float),
+        np.asarray(n, dtype=float),
+        np.asarray(alpha, dtype=float),
+    )
+
+    if tipo == "duas_amostras":
+        gl = 2.0 * n - 2.0
+        nc = d * np.sqrt(n / 2.0)
+    elif tipo in ("uma_amostra", "pareado"):
+        gl = n - 1.0
+        nc = d * np.sqrt(n)
+    else:
+        raise ValueError("tipo deve ser 'uma_amostra', 'duas_amostras' ou 'pareado'.")
+
+    # cauda inferior via simetria P(T < −c | nc) = P(T > c | −nc): `nct.cdf`
+    # retorna NaN em parte da faixa de gl/nc grandes, `nct.sf` não
+    with np.errstate(invalid="ignore", divide="ignore"):
+        gl = np.where(gl > 0, gl, np.nan)
+        if alternativa == "bilateral":
+            crit = stats.t.isf(alpha / 2.0, gl)
+            poder = stats.nct.sf(crit, gl, nc) + stats.nct.sf(crit, gl, -nc)
+        elif alternativa == "maior":
+            poder = stats.nct.sf(stats.t.isf(alpha, gl), gl, nc)
+        else:
+            poder = stats.nct.sf(stats.t.isf(alpha, gl), gl, -nc)
+
+    return poder
+
+
+def poder_anova(efeito, k, n, alpha=0.05) -> np.ndarray:
+    """
+    Poder da ANOVA One-Way com k grupos de tamanho n (F não central).
+
+    efeito:
+        f de Cohen = desvio padrão das médias dos grupos / desvio padrão
+        dentro dos grupos (f² = η² / (1 − η²)).
+    """
+    f, k, n, alpha = np.broadcast_arrays(
+        np.asarray(efeito, dtype=float),
+        np.asarray(k, dtype=float),
+        np.asarray(n, dtype=float),
+        np.asarray(alpha, dtype=float),
+    )
+    n_total = k * n
+    gl1 = k - 1.0
+    gl2 = n_total - k
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        gl1 = np.where(gl1 > 0, gl1, np.nan)
+        gl2 = np.where(gl2 > 0, gl2, np.nan)
+        crit = stats.f.isf(alpha, gl1, gl2)
+        poder = stats.ncf.sf(crit, gl1, gl2, f**2 * n_total)
+
+    return poder
+
+
+def efeito_proporcoes(p1, p2) -> np.ndarray:
+    """h de Cohen entre duas proporções: 2·asin(√p1) − 2·asin(√p2)."""
+    return 2.0 * np.arcsin(np.sqrt(np.asarray(p1, dtype=float))) - 2.0 * np.arcsin(
+        np.sqrt(np.asarray(p2, dtype=float))
+    )
+
+
+def poder_proporcoes(
+    p1,
+    p2=None,
+    n=None,
+    alpha=0.05,
+    alternativa: str = "bilateral",
+    efeito=None,
+) -> np.ndarray:
+    """
+    Poder do teste de duas proporções com grupos de tamanho n
+    (transformação arco-seno; aproximação normal).
+
+    Informe p1 e p2, ou diretamente `efeito` (h de Cohen).
+    """
+    _validar_alternativa(alternativa)
+    if n is None:
+        raise ValueError("Informe o tamanho de cada grupo (n).")
+    h = np.asarray(efeito, dtype=float) if efeito is not None else efeito_proporcoes(p1, p2)
+    h, n, alpha = np.broadcast_arrays(h, np.asarray(n, dtype=float), np.asarray(alpha, dtype=float))
+
+    deslocamento = h * np.sqrt(n / 2.0)
+    if alternativa == "bilateral":
+        z = stats.norm.isf(alpha / 2.0)
+        return stats.norm.sf(z - deslocamento) + stats.norm.cdf(-z - deslocamento)
+    z = stats.norm.isf(alpha)
+    if alternativa == "maior":
+        return stats.norm.sf(z - deslocamento)
+    return stats.norm.cdf(-z - deslocamento)
+
+
+def _funcao_poder(teste: str, **params):
+    """Retorna f(n) → poder para o teste e parâmetros informados."""
+    if teste in ("uma_amostra", "duas_amostras", "pareado"):
+        return lambda n: poder_teste_t(
+            params["efeito"], n, params.get("alpha", 0.05), teste, params.get("alternativa", "bilateral")
+        )
+    if teste == "anova":
+        return lambda n: poder_anova(params["efeito"], params["k"], n, params.get("alpha", 0.05))
+    if teste == "proporcoes":
+        return lambda n: poder_proporcoes(
+            params.get("p1"),
+            params.get("p2"),
+            n,
+            params.get("alpha", 0.05),
+            params.get("alternativa", "bilateral"),
+            efeito=params.get("efeito"),
+        )
+    raise ValueError(f"Teste desconhecido: {teste}. Use um de {list(_NOMES_TESTE)}.")
+
+
+# ============================================================
+# 2) Tamanho amostral
+# ============================================================
+
+def tamanho_amostral(
+    teste: str,
+    poder=0.8,
+    n_maximo: int = N_MAXIMO,
+    **params,
+) -> np.ndarray:
+    """
+    Menor n (por grupo) cujo poder atinge `poder`.
+
+    `params` são os argumentos do teste (efeito, alpha, k, p1, p2,
+    alternativa) e podem ser arrays: a busca é uma bissecção inteira
+    vetorizada (≈ log2(n_maximo) avaliações da função de poder para todos
+    os cenários de uma vez). Cenários inalcançáveis até `n_maximo`
+    (ex.: efeito nulo) retornam NaN.
+
+    Exemplo:
+        tamanho_amostral("duas_amostras", efeito=[0.2, 0.5, 0.8])
+        → array([394., 64., 26.])
+    """
+    fn = _funcao_poder(teste, **params)
+    alvo = np.asarray(poder, dtype=float)
+
+    forma = np.broadcast(alvo, fn(np.asarray(2.0))).shape
+    lo = np.full(forma, 2.0)                 # poder(lo) < alvo (ou lo é a resposta)
+    hi = np.full(forma, float(n_maximo))     # poder(hi) >= alvo
+
+    ok_lo = fn(lo) >= alvo
+    alcancavel = fn(hi) >= alvo
+
+    while True:
+        aberto = (hi - lo > 1) & alcancavel & ~ok_lo
+        if not aberto.any():
+            break
+        meio = np.floor((lo + hi) / 2.0)
+        atinge = fn(meio) >= alvo
+        hi = np.where(aberto & atinge, meio, hi)
+        lo = np.where(aberto & ~atinge, meio, lo)
+
+    n = np.where(ok_lo, lo, hi)
+    return np.where(alcancavel, n, np.nan)
+
+
+# ============================================================
+# 3) Grades e curvas
+# ============================================================
+
+def grade_poder(
+    teste: str,
+    n,
+    efeito,
+    alpha=0.05,
+    **params,
+) -> pd.DataFrame:
+    """
+    Poder em todas as combinações de n × efeito × alpha (formato tidy).
+
+    Uma única avaliação vetorizada sobre a grade completa; colunas:
+    n, efeito, alpha, poder.
+    """
+    n_g, e_g, a_g = np.meshgrid(
+        np.asarray(n, dtype=float).ravel(),
+        np.asarray(efeito, dtype=float).ravel(),
+        np.asarray(alpha, dtype=float).ravel(),
+        indexing="ij",
+    )
+    params = {k: v for k, v in params.items() if k not in ("p1", "p2")}
+    poder = _funcao_poder(teste, efeito=e_g, alpha=a_g, **params)(n_g)
+
+    return pd.DataFrame(
+        {
+            "n": n_g.ravel().astype(int),
+            "efeito": e_g.ravel(),
+            "alpha": a_g.ravel(),
+            "poder": np.asarray(poder, dtype=float).ravel(),
+        }
+    )
+
+
+def curva_poder_figure(
+    grade: pd.DataFrame,
+    poder_alvo: float | None = 0.8,
+    titulo: str = "Curva de poder",
+) -> go.Figure:
+    """Poder × n, uma linha por combinação de efeito e alpha."""
+    fig = go.Figure()
+    varios_alpha = grade["alpha"].nunique() > 1
+
+    for (efeito, alpha), sub in grade.groupby(["efeito", "alpha"], sort=True):
+        nome = f"efeito = {_fmt_num_user(efeito, 2)}"
+        if varios_alpha:
+            nome += f", α = {_fmt_num_user(alpha, 3)}"
+        fig.add_trace(go.Scatter(x=sub["n"], y=sub["poder"], mode="lines", name=nome))
+
+    if poder_alvo is not None:
+        fig.add_hline(
+            y=poder_alvo,
+            line_dash="dash",
+            line_color="gray",
+            annotation_text=f"poder alvo = {_fmt_num_user(poder_alvo * 100, 0)}%",
+        )
+
+    fig.update_layout(
+        title=titulo,
+        xaxis_title="n por grupo",
+        yaxis_title="Poder (1 − β)",
+        yaxis=dict(range=[0, 1.02]),
+        template="plotly_white",
+    )
+    return fig
+
+
+# ============================================================
+# 4) Narrativa
+# ============================================================
+
+def narrativa_poder(
+    teste: str,
+    efeito: float,
+    n_necessario: float,
+    poder: float = 0.8,
+    alpha: float = 0.05,
+    k: int | None = None,
+) -> str:
+    nome = _NOMES_TESTE.get(teste, teste)
+    nome_efeito = _NOMES_EFEITO.get(teste, "efeito")
+
+    if n_necessario is None or np.isnan(n_necessario):
+        return (
+            f"**Tamanho amostral ({nome}):** com {nome_efeito} = {_fmt_num_user(efeito, 2)}, "
+            f"o poder de {_fmt_num_user(poder * 100, 0)}% não é atingido em um tamanho viável. "
+            "Revise o efeito mínimo de interesse."
+        )
+
+    n_int = int(n_necessario)
+    if teste == "anova" and k:
+        total = f" ({n_int * int(k)} no total, {int(k)} grupos)"
+    elif teste in ("duas_amostras", "proporcoes"):
+        total = f" ({2 * n_int} no total)"
+    else:
+        total = ""
+    unidade = "pares" if teste == "pareado" else "observações por grupo" if total else "observações"
+
+    return f"""
+**Tamanho amostral ({nome}):** para detectar {nome_efeito} = **{_fmt_num_user(efeito, 2)}**
+com poder de **{_fmt_num_user(poder * 100, 0)}%** e α = {_fmt_num_user(alpha, 3)},
+são necessárias **{n_int}** {unidade}{total}.
+"""
@@ -0,0 +1,876 @@
+"""
+pytab_app.modules.regressao
+---------------------------
+
+Motor de regressão linear múltipla (aba Regressão da fase Analisar).
+
+Ajuste por mínimos quadrados com fatoração QR, numericamente estável: a
+matriz de desenho nunca é elevada ao quadrado (XᵀX), então o
+condicionamento do problema não é piorado.
+
+- As linhas são processadas em blocos (QR "tall-skinny"): cada bloco
+  [X | y] é fatorado junto com o R acumulado, de modo que a memória é
+  O(bloco × p) e não O(n × p). O último elemento da diagonal de R dá a
+  soma dos quadrados dos resíduos sem calcular os resíduos.
+- Preditoras categóricas viram dummies (k − 1 colunas, primeiro nível
+  como referência) em matrizes esparsas; cada bloco é densificado só na
+  hora da fatoração.
+- Colunas colineares (aliased) são detectadas no R final (p × p), na
+  ordem do desenho, e ficam com coeficiente NaN.
+
+Saída no contrato base dos testes (`_base_contract`): coeficientes, erros
+padrão, t, p-valores, IC, R², R² ajustado, teste F global e VIF.
+
+`regressao_logistica` modela alvos binários (aprovado/reprovado) por IRLS,
+com as equações normais ponderadas acumuladas bloco a bloco, e reporta
+odds ratios com intervalos de confiança.
+
+`acumular_mmq` / `regressao_de_mmq` fazem o mesmo ajuste linear sobre
+dados em blocos (fora da memória), com acumuladores combináveis entre
+processos; `diagnosticos_regressao` dá alavancagem, resíduos
+studentizados e distância de Cook sem formar a matriz chapéu.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import numpy as np
+import pandas as pd
+import scipy.linalg as sla
+import scipy.sparse as sp
+import scipy.stats as stats
+from scipy import special
+
+from pytab_app.modules.testes_estatisticos import _base_contract, _fmt_num_user, _fmt_p_user
+
+
+# Elementos (linhas × colunas) por bloco denso da fatoração (~32 MB)
+ELEMENTOS_BLOCO = 4_000_000
+
+# |R_jj| abaixo de TOL_POSTO × ‖coluna j‖ indica coluna colinear (mesma tolerância do lm do R)
+TOL_POSTO = 1e-7
+
+INTERCEPTO = "Intercepto"
+
+
+# ============================================================
+# 1) Matriz de desenho (numéricas densas + dummies esparsas)
+# ============================================================
+
+def _matriz_desenho(
+    df: pd.DataFrame,
+    alvo: str,
+    preditoras: list,
+    categoricas: list | None = None,
+    y: np.ndarray | None = None,
+    todos_niveis: bool = False,
+) -> dict:
+    """
+    Monta a matriz de desenho com casos completos. `y` substitui a coluna
+    `alvo` quando o alvo já vem codificado (ex.: 0/1 da logística).
+    `todos_niveis=True` gera uma dummy por nível, sem referência (blocos
+    de um acumulador, que ainda não conhece todos os níveis).
+
+    Retorna dict com:
+        y        alvo (n,)
+        densa    intercepto + preditoras numéricas (n × q)
+        dummies  dummies das categóricas, scipy.sparse CSR (n × d) ou None
+        nomes    nomes das colunas (densas primeiro)
+        niveis   {coluna categórica: lista de níveis (o primeiro é a referência)}
+        linhas   máscara booleana das linhas usadas
+    """
+    categoricas = set(categoricas or [])
+    for c in preditoras:
+        if not pd.api.types.is_numeric_dtype(df[c]) or pd.api.types.is_bool_dtype(df[c]):
+            categoricas.add(c)
+    numericas = [c for c in preditoras if c not in categoricas]
+    categoricas = [c for c in preditoras if c in categoricas]
+
+    if y is None:
+        y = pd.to_numeric(df[alvo], errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+    num = df[numericas].to_numpy(dtype=np.float64, na_value=np.nan)
+    linhas = ~np.isnan(y) & ~np.isnan(num).any(axis=1)
+
+    cats = {}
+    for c in categoricas:
+        serie = df[c]
+        if not isinstance(serie.dtype, pd.CategoricalDtype):
+            serie = pd.Categorical(serie)
+        else:
+            serie = serie.array
+        cats[c] = serie
+        linhas &= serie.codes >= 0
+
+    n = int(linhas.sum())
+    densa = np.empty((n, 1 + len(numericas)))
+    densa[:, 0] = 1.0
+    densa[:, 1:] = num[linhas]
+    nomes = [INTERCEPTO] + numericas
+
+    blocos, niveis = [], {}
+    primeiro = 0 if todos_niveis else 1
+    for c, serie in cats.items():
+        codigos = serie.codes[linhas].astype(np.int64)
+        presentes = np.flatnonzero(np.bincount(codigos, minlength=len(serie.categories)))
+        # só níveis observados; o primeiro observado é a referência
+        mapa = np.full(len(serie.categories), -1, dtype=np.int64)
+        mapa[presentes] = np.arange(presentes.size)
+        codigos = mapa[codigos]
+        niveis[c] = [serie.categories[i] for i in presentes]
+        if presentes.size - primeiro < 1:
+            continue
+        uns = codigos >= primeiro
+        blocos.append(
+            sp.csr_matrix(
+                (np.ones(int(uns.sum())), (np.flatnonzero(uns), codigos[uns] - primeiro)),
+                shape=(n, presentes.size - primeiro),
+            )
+        )
+        nomes += [f"{c}[{nivel}]" for nivel in niveis[c][primeiro:]]
+
+    return {
+        "y": y[linhas],
+        "densa": densa,
+        "dummies": sp.hstack(blocos, format="csr") if blocos else None,
+        "nomes": nomes,
+        "niveis": niveis,
+        "linhas": linhas,
+    }
+
+
+def _blocos_desenho(desenho: dict, tamanho: int | None = None):
+    """Gera blocos densos [X | y] de linhas consecutivas."""
+    densa, dummies, y = desenho["densa"], desenho["dummies"], desenho["y"]
+    p = densa.shape[1] + (0 if dummies is None else dummies.shape[1])
+    passo = tamanho or max(ELEMENTOS_BLOCO // (p + 1), p + 1)
+    for ini in range(0, y.size, passo):
+        fim = min(ini + passo, y.size)
+        partes = [densa[ini:fim]]
+        if dummies is not None:
+            partes.append(dummies[ini:fim].toarray())
+        partes.append(y[ini:fim, None])
+        yield np.hstack(partes)
+
+
+# ============================================================
+# 2) QR em blocos e ajuste
+# ============================================================
+
+def _r_incremental(R: np.ndarray | None, bloco: np.ndarray) -> np.ndarray:
+    """Fator R de [R; bloco] — QR "tall-skinny" (Rᵀ R = Σ blocoᵀ bloco)."""
+    if R is not None:
+        bloco = np.vstack([R, bloco])
+    R = np.linalg.qr(bloco, mode="r")
+    if R.shape[0] < R.shape[1]:   # menos linhas que colunas até aqui
+        R = np.vstack([R, np.zeros((R.shape[1] - R.shape[0], R.shape[1]))])
+    return R
+
+
+def _colunas_estimaveis(R: np.ndarray) -> np.ndarray:
+    """
+    Máscara das colunas linearmente independentes das anteriores, na
+    ordem do desenho (como o `lm` do R): |R_jj| é a norma do que sobra da
+    coluna j depois de projetada nas anteriores. A ordem preserva o
+    intercepto e as primeiras colunas de um grupo colinear.
+    """
+    if R.shape[1] == 0:
+        return np.zeros(0, dtype=bool)
+    norma = np.sqrt((R * R).sum(axis=0))
+    return np.abs(np.diagonal(R)) > TOL_POSTO * np.where(norma > 0, norma, 1.0)
+
+
+def _vif(R: np.ndarray, XtX_inv: np.ndarray, tem_intercepto: bool) -> np.ndarray:
+    """
+    VIF de cada coluna (exceto o intercepto): VIF_j = SQT_j · [(XᵀX)⁻¹]_jj,
+    com SQT_j = Σ(x_j − x̄_j)² = Σ_{i≥1} R_ij² (a linha 0 de R é a projeção
+    no intercepto). Sai direto do R, sem centralizar os dados de novo.
+    """
+    vif = np.full(R.shape[1], np.nan)
+    if tem_intercepto and R.shape[1] > 1:
+        vif[1:] = (R[1:, 1:] ** 2).sum(axis=0) * np.diagonal(XtX_inv)[1:]
+    return vif
+
+
+def _ajuste_de_r(R_aug: np.ndarray, nomes: list, n: int, media_y: float, m2_y: float, nivel: float) -> dict:
+    """
+    Estatísticas do ajuste a partir do R de [X | y] (p + 1 colunas), de n
+    e da média e Σ(y − ȳ)² do alvo. Base comum do ajuste direto e do
+    incremental.
+    """
+    p = R_aug.shape[1] - 1
+    estimaveis = _colunas_estimaveis(R_aug[:, :p])
+    usadas = np.flatnonzero(estimaveis)
+    if usadas.size < p:
+        # X[:, usadas] = Q R[:, usadas]: basta refatorar as colunas usadas (+ y)
+        R_aug = np.linalg.qr(R_aug[:, np.r_[usadas, p]], mode="r")
+    k = usadas.size
+
+    R = R_aug[:k, :k]
+    qty = R_aug[:k, k]
+    rss = float(R_aug[k, k] ** 2) if R_aug.shape[0] > k else 0.0
+
+    beta = sla.solve_triangular(R, qty) if k else np.zeros(0)
+    R_inv = sla.solve_triangular(R, np.eye(k)) if k else np.zeros((0, 0))
+    XtX_inv = R_inv @ R_inv.T
+
+    gl_res = n - k
+    sigma2 = rss / gl_res if gl_res > 0 else np.nan
+    cov = sigma2 * XtX_inv
+    ep = np.sqrt(np.diagonal(cov))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = beta / ep
+    p_vals = 2.0 * stats.t.sf(np.abs(t), gl_res) if gl_res > 0 else np.full(k, np.nan)
+    q = stats.t.isf((1.0 - nivel) / 2.0, gl_res) if gl_res > 0 else np.nan
+
+    tem_intercepto = bool(estimaveis[0]) and nomes[0] == INTERCEPTO
+    tss = m2_y if tem_intercepto else m2_y + n * media_y**2
+    gl_mod = k - 1 if tem_intercepto else k
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r2 = 1.0 - rss / tss if tss > 0 else np.nan
+        r2_aj = 1.0 - (1.0 - r2) * (n - (1 if tem_intercepto else 0)) / gl_res if gl_res > 0 else np.nan
+        f = ((tss - rss) / gl_mod) / sigma2 if gl_mod > 0 and gl_res > 0 else np.nan
+    p_f = float(stats.f.sf(f, gl_mod, gl_res)) if np.isfinite(f) else None
+
+    vif = _vif(R, XtX_inv, tem_intercepto)
+
+    def _cheio(valores):
+        out = np.full(p, np.nan)
+        out[usadas] = valores
+        return out
+
+    coeficientes = pd.DataFrame(
+        {
+            "coef": _cheio(beta),
+            "erro_padrao": _cheio(ep),
+            "t": _cheio(t),
+            "p_value": _cheio(p_vals),
+            "ic_inf": _cheio(beta - q * ep),
+            "ic_sup": _cheio(beta + q * ep),
+            "vif": _cheio(vif),
+        },
+        index=pd.Index(nomes, name="termo"),
+    )
+    nomes_usados = [nomes[i] for i in usadas]
+
+    return {
+        "coeficientes": coeficientes,
+        "cov": pd.DataFrame(cov, index=nomes_usados, columns=nomes_usados),
+        "r2": float(r2),
+        "r2_ajustado": float(r2_aj),
+        "f_stat": None if not np.isfinite(f) else float(f),
+        "p_value": p_f,
+        "gl_modelo": int(gl_mod),
+        "gl_residuo": int(gl_res),
+        "sigma": float(np.sqrt(sigma2)) if np.isfinite(sigma2) else np.nan,
+        "rss": rss,
+        "aliased": [nomes[i] for i in np.flatnonzero(~estimaveis)],
+        "media_y": media_y,
+        "std_y": float(np.sqrt(m2_y / (n - 1))) if n > 1 else np.nan,
+        "r_fator": R,
+    }
+
+
+def regressao_multipla(
+    df: pd.DataFrame,
+    alvo: str,
+    preditoras: list,
+    categoricas: list | None = None,
+    nivel: float = 0.95,
+    bloco: int | None = None,
+) -> dict:
+    """
+    Regressão linear múltipla de `alvo` em `preditoras` (com intercepto).
+
+    categoricas:
+        colunas a tratar como categóricas mesmo sendo numéricas (ex.:
+        códigos de máquina). Colunas não numéricas já são categóricas.
+    nivel:
+        nível de confiança dos intervalos dos coeficientes.
+    bloco:
+        linhas por bloco da fatoração (padrão: ~4 milhões de elementos).
+
+    Usa apenas linhas completas (alvo, numéricas e categóricas válidos).
+
+    Retorna o contrato base (teste="ols_multipla", f_stat/p_value do teste
+    F global) com os extras:
+        coeficientes  DataFrame (coef, erro_padrao, t, p_value, ic_inf,
+                      ic_sup, vif), um termo por linha
+        cov           matriz de covariância dos coeficientes estimáveis
+        r2, r2_ajustado, sigma, rss, gl_modelo, gl_residuo
+        aliased       termos colineares (coeficiente NaN)
+        alvo, preditoras, niveis  (para reconstruir o desenho)
+    """
+    preditoras = [c for c in preditoras if c != alvo]
+    if not preditoras:
+        raise ValueError("Informe ao menos uma variável preditora.")
+
+    desenho = _matriz_desenho(df, alvo, preditoras, categoricas)
+    n = desenho["y"].size
+    if n < 2:
+        raise ValueError("Poucas linhas completas para ajustar a regressão.")
+
+    R_aug = None
+    for blk in _blocos_desenho(desenho, bloco):
+        R_aug = _r_incremental(R_aug, blk)
+
+    y = desenho["y"]
+    media_y = float(y.mean())
+    ajuste = _ajuste_de_r(R_aug, desenho["nomes"], n, media_y, float(((y - media_y) ** 2).sum()), nivel)
+    return _contrato_ols(ajuste, n, alvo, preditoras, desenho["niveis"])
+
+
+def _contrato_ols(ajuste: dict, n: int, alvo: str, preditoras: list, niveis: dict) -> dict:
+    return _base_contract(
+        teste="ols_multipla",
+        n=n,
+        mean=ajuste.pop("media_y"),
+        std=ajuste.pop("std_y"),
+        f_stat=ajuste.pop("f_stat"),
+        p_value=ajuste.pop("p_value"),
+        alvo=alvo,
+        preditoras=preditoras,
+        niveis=niveis,
+        **ajuste,
+    )
+
+
+# ============================================================
+# 3) Regressão logística (IRLS)
+# ============================================================
+
+# Iterações máximas e tolerância relativa na deviance do IRLS
+MAX_ITER_IRLS = 25
+TOL_IRLS = 1e-10
+
+
+def _alvo_binario(serie: pd.Series, sucesso=None) -> tuple[np.ndarray, object, object]:
+    """
+    Codifica um alvo binário em 1 (`sucesso`) / 0 (outro nível) / NaN.
+
+    Sem `sucesso`: True, 1 ou o último nível em ordem (ex.: "sim" em
+    "não"/"sim") é o evento modelado.
+    """
+    niveis = pd.unique(serie.dropna())
+    if len(niveis) != 2:
+        raise ValueError(f"O alvo da regressão logística precisa ter exatamente 2 níveis (tem {len(niveis)}).")
+    try:
+        niveis = sorted(niveis)
+    except TypeError:
+        niveis = list(niveis)
+    if sucesso is None:
+        sucesso = niveis[-1]
+    elif sucesso not in niveis:
+        raise ValueError(f"Nível {sucesso!r} não encontrado no alvo. Níveis: {list(niveis)}.")
+    fracasso = niveis[0] if niveis[1] == sucesso else niveis[1]
+
+    y = np.where(serie.isna().to_numpy(), np.nan, (serie == sucesso).to_numpy(dtype=np.float64))
+    return y, sucesso, fracasso
+
+
+def _rotacao_r(G: np.ndarray) -> np.ndarray:
+    """Triangular R com RᵀR = G (G simétrica semidefinida), para checar colinearidade na ordem do desenho."""
+    autovalores, V = np.linalg.eigh(G)
+    S = np.sqrt(np.clip(autovalores, 0.0, None))[:, None] * V.T
+    return np.linalg.qr(S, mode="r")
+
+
+def _partes_desenho(desenho: dict, colunas: np.ndarray) -> tuple[np.ndarray, sp.csr_matrix | None]:
+    """Parte densa e dummies (esparsas) restritas às `colunas` do desenho."""
+    densa, dummies = desenho["densa"], desenho["dummies"]
+    k = densa.shape[1]
+    cd, cs = colunas[colunas < k], colunas[colunas >= k] - k
+    if cd.size < k:
+        densa = densa[:, cd]
+    if dummies is not None:
+        dummies = dummies[:, cs] if cs.size else None
+    return densa, dummies
+
+
+def _equacoes_ponderadas(densa: np.ndarray, dummies, y: np.ndarray, eta: np.ndarray, bloco: int | None):
+    """
+    Uma passada do IRLS: acumula XᵀWX e XᵀWz (p × p e p) bloco a bloco,
+    sem guardar W, z nem X densa. As dummies ficam esparsas: os blocos
+    DᵀWS e SᵀWS saem de produtos esparsos. Retorna (G, b, deviance).
+    """
+    kd = densa.shape[1]
+    ks = 0 if dummies is None else dummies.shape[1]
+    G = np.zeros((kd + ks, kd + ks))
+    b = np.zeros(kd + ks)
+    deviance = 0.0
+    passo = bloco or max(ELEMENTOS_BLOCO // (kd + 1), kd + 1)
+    for ini in range(0, y.size, passo):
+        fim = min(ini + passo, y.size)
+        D, yb, e = densa[ini:fim], y[ini:fim], eta[ini:fim]
+        mu = np.clip(special.expit(e), 1e-10, 1.0 - 1e-10)
+        w = mu * (1.0 - mu)
+        wz = w * e + (yb - mu)
+        Dw = D * w[:, None]
+        G[:kd, :kd] += Dw.T @ D
+        b[:kd] += D.T @ wz
+        if ks:
+            S = dummies[ini:fim]
+            G[kd:, :kd] += S.T @ Dw
+            G[kd:, kd:] += (S.T @ S.multiply(w[:, None])).toarray()
+            b[kd:] += S.T @ wz
+        deviance -= 2.0 * float(np.sum(np.where(yb > 0.5, np.log(mu), np.log1p(-mu))))
+    G[:kd, kd:] = G[kd:, :kd].T
+    return G, b, deviance
+
+
+def _preditor_linear(densa: np.ndarray, dummies, beta: np.ndarray) -> np.ndarray:
+    eta = densa @ beta[: densa.shape[1]]
+    if dummies is not None:
+        eta += dummies @ beta[densa.shape[1]:]
+    return eta
+
+
+def regressao_logistica(
+    df: pd.DataFrame,
+    alvo: str,
+    preditoras: list,
+    categoricas: list | None = None,
+    sucesso=None,
+    nivel: float = 0.95,
+    bloco: int | None = None,
+) -> dict:
+    """
+    Regressão logística de um alvo binário (aprovado/reprovado, 0/1...)
+    por IRLS (Newton-Raphson / mínimos quadrados reponderados).
+
+    Cada iteração percorre os dados em blocos e acumula só as equações
+    normais ponderadas XᵀWX β = XᵀWz (p × p): a memória extra é
+    O(bloco × p + n), e não O(n × p). Preditoras categóricas entram como
+    dummies esparsas, como em `regressao_multipla`, e nunca são
+    densificadas.
+
+    sucesso:
+        nível do alvo tratado como evento (1). Padrão: True, 1 ou o último
+        nível em ordem.
+
+    Retorna o contrato base (teste="logistica"; p_value do teste da razão
+    de verossimilhança contra o modelo só com intercepto) com os extras:
+        coeficientes  DataFrame (coef, erro_padrao, z, p_value, ic_inf,
+                      ic_sup, odds_ratio, or_ic_inf, or_ic_sup)
+        deviance, deviance_nula, qui2, gl_modelo, pseudo_r2 (McFadden), aic
+        iteracoes, convergiu, separacao (probabilidades ajustadas 0/1)
+        alvo, sucesso, fracasso, preditoras, niveis, aliased
+    """
+    preditoras = [c for c in preditoras if c != alvo]
+    if not preditoras:
+        raise ValueError("Informe ao menos uma variável preditora.")
+
+    y_codificado, sucesso, fracasso = _alvo_binario(df[alvo], sucesso)
+    desenho = _matriz_desenho(df, alvo, preditoras, categoricas, y=y_codificado)
+    y = desenho["y"]
+    n = y.size
+    if n < 2:
+        raise ValueError("Poucas linhas completas para ajustar a regressão logística.")
+
+    nomes = desenho["nomes"]
+    p = len(nomes)
+    media_y = float(y.mean())
+    if media_y in (0.0, 1.0):
+        raise ValueError("O alvo tem um único nível nas linhas completas: não há o que modelar.")
+
+    # início: só o intercepto, na proporção observada
+    eta = np.full(n, np.log(media_y / (1.0 - media_y)))
+    G, b, deviance_nula = _equacoes_ponderadas(desenho["densa"], desenho["dummies"], y, eta, bloco)
+
+    # colinearidade não depende de W (pesos constantes no início)
+    estimaveis = _colunas_estimaveis(_rotacao_r(G))
+    colunas = np.flatnonzero(estimaveis)
+    G, b = G[np.ix_(colunas, colunas)], b[colunas]
+    densa, dummies = _partes_desenho(desenho, colunas)
+
+    deviance = deviance_nula
+    convergiu = False
+    iteracoes = 0
+    for iteracoes in range(1, MAX_ITER_IRLS + 1):
+        fator = sla.cho_factor(G)
+        beta = sla.cho_solve(fator, b)
+        eta = _preditor_linear(densa, dummies, beta)
+        G, b, nova = _equacoes_ponderadas(densa, dummies, y, eta, bloco)
+        if abs(nova - deviance) <= TOL_IRLS * (abs(nova) + 0.1):
+            deviance = nova
+            convergiu = True
+            break
+        deviance = nova
+
+    cov = sla.cho_solve(sla.cho_factor(G), np.eye(colunas.size))
+    ep = np.sqrt(np.diagonal(cov))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z = beta / ep
+    p_vals = 2.0 * special.ndtr(-np.abs(z))
+    q = stats.norm.isf((1.0 - nivel) / 2.0)
+
+    def _cheio(valores):
+        out = np.full(p, np.nan)
+        out[colunas] = valores
+        return out
+
+    ic_inf, ic_sup = beta - q * ep, beta + q * ep
+    with np.errstate(over="ignore"):
+        coeficientes = pd.DataFrame(
+            {
+                "coef": _cheio(beta),
+                "erro_padrao": _cheio(ep),
+                "z": _cheio(z),
+                "p_value": _cheio(p_vals),
+                "ic_inf": _cheio(ic_inf),
+                "ic_sup": _cheio(ic_sup),
+                "odds_ratio": _cheio(np.exp(beta)),
+                "or_ic_inf": _cheio(np.exp(ic_inf)),
+                "or_ic_sup": _cheio(np.exp(ic_sup)),
+            },
+            index=pd.Index(nomes, name="termo"),
+        )
+
+    gl_modelo = colunas.size - 1
+    qui2 = max(deviance_nula - deviance, 0.0)
+    p_lr = float(stats.chi2.sf(qui2, gl_modelo)) if gl_modelo > 0 else None
+    mu = special.expit(eta)
+    nomes_usados = [nomes[i] for i in colunas]
+
+    return _base_contract(
+        teste="logistica",
+        n=n,
+        mean=media_y,
+        std=float(np.sqrt(media_y * (1.0 - media_y))),
+        p_value=p_lr,
+        alvo=alvo,
+        sucesso=sucesso,
+        fracasso=fracasso,
+        preditoras=preditoras,
+        niveis=desenho["niveis"],
+        coeficientes=coeficientes,
+        cov=pd.DataFrame(cov, index=nomes_usados, columns=nomes_usados),
+        deviance=float(deviance),
+        deviance_nula=float(deviance_nula),
+        qui2=float(qui2),
+        gl_modelo=int(gl_modelo),
+        pseudo_r2=float(1.0 - deviance / deviance_nula) if deviance_nula > 0 else np.nan,
+        aic=float(deviance + 2 * colunas.size),
+        iteracoes=iteracoes,
+        convergiu=convergiu,
+        separacao=bool(np.any((mu < 1e-8) | (mu > 1.0 - 1e-8))),
+        aliased=[nomes[i] for i in np.flatnonzero(~estimaveis)],
+    )
+
+
+# ============================================================
+# 4) Mínimos quadrados incrementais (dados em blocos / fora da memória)
+# ============================================================
+#
+# Acumulador (dict) do ajuste OLS sobre blocos de linhas — arquivos
+# múltiplos, `pd.read_csv(chunksize=...)`, consultas SQL paginadas:
+#   - r       fator R (triangular) de [X | y], com Rᵀ R = [X | y]ᵀ [X | y]
+#   - n, media_y, m2_y   contagem, média e Σ(y − ȳ)² do alvo
+#   - niveis  níveis observados por categórica; o desenho do acumulador
+#             tem uma dummy por nível, e a referência (primeiro nível) só
+#             é descartada no ajuste final
+#   - categorias  ordem declarada das colunas de dtype category (None nas
+#             demais, cujos níveis seguem a ordem natural), a mesma usada
+#             pelo ajuste em memória para escolher a referência
+# Guardar R em vez de XᵀX ocupa a mesma memória (p × p) sem elevar ao
+# quadrado o condicionamento. A combinação (QR de [R_a; R_b] e fórmula de
+# Chan no alvo) é associativa: blocos podem ser acumulados em qualquer
+# ordem e por processos diferentes.
+
+
+def _colunas_mmq(numericas: list, niveis: dict) -> list:
+    return [INTERCEPTO] + numericas + [f"{c}[{nivel}]" for c, ns in niveis.items() for nivel in ns]
+
+
+def mmq_bloco(df: pd.DataFrame, alvo: str, preditoras: list, categoricas: list | None = None) -> dict:
+    """Acumulador de mínimos quadrados de um bloco de dados (custo O(linhas × p²))."""
+    preditoras = [c for c in preditoras if c != alvo]
+    desenho = _matriz_desenho(df, alvo, preditoras, categoricas, todos_niveis=True)
+    y = desenho["y"]
+    p = len(desenho["nomes"])
+
+    R_aug = np.zeros((p + 1, p + 1))
+    for blk in _blocos_desenho(desenho):
+        R_aug = _r_incremental(R_aug, blk)
+
+    media_y = float(y.mean()) if y.size else 0.0
+    return {
+        "alvo": alvo,
+        "preditoras": preditoras,
+        "numericas": [c for c in preditoras if c not in desenho["niveis"]],
+        "niveis": desenho["niveis"],
+        "categorias": {
+            c: list(df[c].cat.categories) if isinstance(df[c].dtype, pd.CategoricalDtype) else None
+            for c in desenho["niveis"]
+        },
+        "n": int(y.size),
+        "media_y": media_y,
+        "m2_y": float(((y - media_y) ** 2).sum()),
+        "r": R_aug,
+    }
+
+
+def _alinhar_mmq(acumulado: dict, niveis: dict) -> np.ndarray:
+    """Colunas de R reordenadas para os `niveis` dados (níveis novos entram zerados)."""
+    atuais = _colunas_mmq(acumulado["numericas"], acumulado["niveis"])
+    colunas = _colunas_mmq(acumulado["numericas"], niveis)
+    R = acumulado["r"]
+    if atuais == colunas:
+        return R
+    pos = np.append(pd.Index(atuais).get_indexer(colunas), len(atuais))
+    existe = pos >= 0
+    out = np.zeros((R.shape[0], len(colunas) + 1))
+    out[:, existe] = R[:, pos[existe]]
+    return out
+
+
+def combinar_mmq(a: dict | None, b: dict | None) -> dict | None:
+    """
+    Combina dois acumuladores de mínimos quadrados do mesmo modelo.
+
+    Níveis de categóricas vistos em só um dos lados são mantidos (a dummy
+    vale 0 nas linhas do outro lado).
+    """
+    if a is None or b is None:
+        return b if a is None else a
+    if (a["alvo"], a["numericas"], list(a["niveis"])) != (b["alvo"], b["numericas"], list(b["niveis"])):
+        raise ValueError(
+            "Blocos com modelos diferentes (alvo ou tipo das preditoras). "
+            "Informe `categoricas` para fixar quais colunas são categóricas em todos os blocos."
+        )
+
+    niveis, categorias = {}, {}
+    for c in a["niveis"]:
+        uniao = pd.Index(a["niveis"][c]).union(pd.Index(b["niveis"][c]), sort=False)
+        declaradas = [x for x in (a["categorias"][c], b["categorias"][c]) if x is not None]
+        if declaradas:
+            # ordem das categorias do dtype, como no ajuste em memória
+            ordem = pd.Index(declaradas[0])
+            for outra in declaradas[1:]:
+                ordem = ordem.union(pd.Index(outra), sort=False)
+            categorias[c] = ordem.tolist()
+            niveis[c] = [nivel for nivel in categorias[c] if nivel in uniao]
+        else:
+            categorias[c] = None
+            try:
+                niveis[c] = sorted(uniao)
+            except TypeError:
+                niveis[c] = uniao.tolist()
+
+    n = a["n"] + b["n"]
+    delta = b["media_y"] - a["media_y"]
+    return {
+        "alvo": a["alvo"],
+        "preditoras": a["preditoras"],
+        "numericas": a["numericas"],
+        "niveis": niveis,
+        "categorias": categorias,
+        "n": n,
+        "media_y": a["media_y"] + delta * b["n"] / n if n else 0.0,
+        "m2_y": a["m2_y"] + b["m2_y"] + (delta * delta * a["n"] * b["n"] / n if n else 0.0),
+        "r": _r_incremental(_alinhar_mmq(a, niveis), _alinhar_mmq(b, niveis)),
+    }
+
+
+def acumular_mmq(
+    blocos,
+    alvo: str,
+    preditoras: list,
+    categoricas: list | None = None,
+    acumulado: dict | None = None,
+    n_workers: int = 1,
+) -> dict | None:
+    """
+    Acumula o ajuste OLS sobre um iterável de DataFrames — por exemplo
+    `pd.read_csv(..., chunksize=...)`, vários arquivos ou
+    `pd.read_sql(..., chunksize=...)`.
+
+    Uma única passada; a memória depende só do número de termos (p × p),
+    mais os blocos em processamento. Com `n_workers > 1`, os blocos são
+    fatorados em um pool de processos, `n_workers` por vez, e combinados
+    na ordem de chegada. Passe `acumulado` para continuar de onde uma
+    chamada anterior parou.
+    """
+    if n_workers <= 1:
+        for bloco in blocos:
+            acumulado = combinar_mmq(acumulado, mmq_bloco(bloco, alvo, preditoras, categoricas))
+        return acumulado
+
+    blocos = iter(blocos)
+    with ProcessPoolExecutor(max_workers=n_workers) as pool:
+        while True:
+            lote = list(islice(blocos, n_workers))
+            if not lote:
+                break
+            futuros = [pool.submit(mmq_bloco, b, alvo, preditoras, categoricas) for b in lote]
+            for f in futuros:
+                acumulado = combinar_mmq(acumulado, f.result())
+    return acumulado
+
+
+def regressao_de_mmq(acumulado: dict, nivel: float = 0.95) -> dict:
+    """
+    Regressão linear múltipla no estado atual do acumulador — o mesmo
+    resultado (contrato "ols_multipla") de `regressao_multipla` sobre a
+    concatenação dos blocos.
+    """
+    n = acumulado["n"]
+    if n < 2:
+        raise ValueError("Poucas linhas completas para ajustar a regressão.")
+
+    # descarta a dummy de referência (primeiro nível) de cada categórica
+    niveis = {c: ns for c, ns in acumulado["niveis"].items() if ns}
+    R = _alinhar_mmq(acumulado, niveis)
+    colunas = _colunas_mmq(acumulado["numericas"], niveis)
+    referencias = {f"{c}[{ns[0]}]" for c, ns in niveis.items()}
+    manter = [j for j, nome in enumerate(colunas) if nome not in referencias]
+    R_aug = _r_incremental(None, R[:, manter + [len(colunas)]])
+
+    ajuste = _ajuste_de_r(
+        R_aug, [colunas[j] for j in manter], n, acumulado["media_y"], acumulado["m2_y"], nivel
+    )
+    return _contrato_ols(ajuste, n, acumulado["alvo"], acumulado["preditoras"], niveis)
+
+
+# ============================================================
+# 5) Diagnósticos e influência
+# ============================================================
+
+# Pontos máximos enviados aos gráficos de diagnóstico
+MAX_PONTOS_DIAGNOSTICO = 5_000
+
+
+def diagnosticos_regressao(df: pd.DataFrame, res: dict, bloco: int | None = None) -> pd.DataFrame:
+    """
+    Diagnósticos por linha de um ajuste de `regressao_multipla` (ou
+    `regressao_de_mmq`) sobre `df`.
+
+    A alavancagem hᵢ é a norma ao quadrado da linha i de Q = X R⁻¹ (QR
+    fino), calculada bloco a bloco a partir do fator R do ajuste: custo
+    O(n × p²) e memória O(bloco × p), sem a matriz chapéu n × n.
+
+    Retorna DataFrame (índice = linhas de `df` usadas no ajuste) com:
+        ajustado, residuo, alavancagem,
+        residuo_studentizado  (externo: σ estimado sem a própria linha)
+        distancia_cook
+    """
+    desenho = _matriz_desenho(df, res["alvo"], res["preditoras"], list(res["niveis"]))
+    usados = res["cov"].index
+    pos = pd.Index(desenho["nomes"]).get_indexer(usados)
+    if (pos < 0).any() or desenho["y"].size != res["n"]:
+        raise ValueError("Os dados não correspondem ao ajuste: use o mesmo DataFrame da regressão.")
+
+    R = res["r_fator"]
+    beta = res["coeficientes"].loc[usados, "coef"].to_numpy()
+    ajustado, alavancagem = [], []
+    for blk in _blocos_desenho(desenho, bloco):
+        X = blk[:, pos]
+        Q = sla.solve_triangular(R, X.T, trans="T")
+        alavancagem.append(np.einsum("ij,ij->j", Q, Q))
+        ajustado.append(X @ beta)
+    ajustado = np.concatenate(ajustado) if ajustado else np.zeros(0)
+    h = np.concatenate(alavancagem) if alavancagem else np.zeros(0)
+
+    residuo = desenho["y"] - ajustado
+    k, gl = usados.size, res["gl_residuo"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        interno = residuo / (res["sigma"] * np.sqrt(1.0 - h))
+        externo = interno * np.sqrt((gl - 1) / (gl - interno**2))
+        cook = interno**2 * h / (k * (1.0 - h))
+
+    return pd.DataFrame(
+        {
+            "ajustado": ajustado,
+            "residuo": residuo,
+            "alavancagem": h,
+            "residuo_studentizado": externo,
+            "distancia_cook": cook,
+        },
+        index=df.index[desenho["linhas"]],
+    )
+
+
+def amostra_diagnosticos(diag: pd.DataFrame, max_pontos: int = MAX_PONTOS_DIAGNOSTICO, seed: int = 0) -> pd.DataFrame:
+    """
+    Reduz os diagnósticos a no máximo `max_pontos` linhas para os
+    gráficos: as de maior distância de Cook ficam sempre (10% do
+    orçamento) e o restante é uma amostra aleatória das demais, na ordem
+    original.
+    """
+    n = len(diag)
+    if n <= max_pontos:
+        return diag
+    n_top = max_pontos // 10
+    cook = np.nan_to_num(diag["distancia_cook"].to_numpy(), nan=np.inf)
+    top = np.argpartition(-cook, n_top)[:n_top]
+    resto = np.setdiff1d(np.arange(n), top, assume_unique=True)
+    sorteio = np.random.default_rng(seed).choice(resto, max_pontos - n_top, replace=False)
+    return diag.iloc[np.sort(np.concatenate([top, sorteio]))]
+
+
+# ============================================================
+# 6) Narrativa
+# ============================================================
+
+def narrativa_regressao_multipla(res: dict, alpha: float = 0.05) -> str:
+    coefs = res["coeficientes"].drop(index=INTERCEPTO, errors="ignore").dropna(subset=["coef"])
+    sig = coefs[coefs["p_value"] < alpha].sort_values("p_value")
+
+    if res["p_value"] is None:
+        motivo = (
+            "não há graus de liberdade residuais (termos estimáveis ≥ linhas)"
+            if res["gl_residuo"] <= 0
+            else "não há preditoras estimáveis além do intercepto"
+        )
+        global_txt = (
+            f"O teste F global não pode ser calculado: {motivo}. "
+            f"Não é possível avaliar se as preditoras explicam **{res['alvo']}**."
+        )
+    elif res["p_value"] < alpha:
+        global_txt = (
+            f"O modelo é estatisticamente significativo (F = {_fmt_num_user(res['f_stat'])}, "
+            f"p = {_fmt_p_user(res['p_value'])}) e explica **{_fmt_num_user(100 * res['r2'], 1)}%** "
+            f"da variação de **{res['alvo']}** (R² ajustado = {_fmt_num_user(res['r2_ajustado'], 3)})."
+        )
+    else:
+        global_txt = (
+            f"O modelo **não** é estatisticamente significativo (p = {_fmt_p_user(res['p_value'])}): "
+            f"as preditoras, em conjunto, não explicam a variação de **{res['alvo']}** melhor que a média."
+        )
+
+    if sig.empty:
+        efeitos = "Nenhum termo isolado é significativo mantendo os demais constantes."
+    else:
+        # dummies: efeito em relação ao nível de referência
+        unidade = {
+            f"{c}[{nivel}]": f"em relação a {c} = {niveis[0]}"
+            for c, niveis in res["niveis"].items()
+            for nivel in niveis[1:]
+        }
+        itens = [
+            f"**{termo}** ({'+' if linha['coef'] > 0 else '−'}{_fmt_num_user(abs(linha['coef']), 3)} "
+            f"{unidade.get(termo, 'por unidade')}, p = {_fmt_p_user(linha['p_value'])})"
+            for termo, linha in sig.head(5).iterrows()
+        ]
+        efeitos = "Termos significativos, mantendo os demais constantes: " + "; ".join(itens) + "."
+
+    avisos = []
+    vif_alto = coefs.index[coefs["vif"] > 10].tolist()
+    if vif_alto:
+        avisos.append(
+            f"Multicolinearidade alta (VIF > 10) em {', '.join(vif_alto)}: os erros padrão desses "
+            "termos ficam inflados e os coeficientes, instáveis."
+        )
+    if res["aliased"]:
+        avisos.append(f"Termos redundantes (colineares) removidos do ajuste: {', '.join(res['aliased'])}.")
+
+    return f"""
+### Regressão linear múltipla — {res['alvo']}
+
+{global_txt}
+
+{efeitos}
+
+{" ".join(avisos)}
+"""
@@ -3,8 +3,7 @@ from __future__ import annotations
 import numpy as np
 import pandas as pd
 import scipy.stats as stats
-import statsmodels.api as sm
-import statsmodels.formula.api as smf
+from scipy.special import gammaln
 import plotly.graph_objects as go
 
 from patsy.builtins import Q  # lida com nomes de colunas com espaço/caracteres especiais
@@ -273,14 +272,92 @@ p-valor = **{p_txt}**
 # 2) ANOVA One-Way
 # ============================================================
 
-def anova_oneway(df: pd.DataFrame, numerica: str, categoria: str) -> dict:
+def _estatisticas_por_codigo(
+    y: np.ndarray,
+    codigos: np.ndarray,
+    k: int,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
     """
-    ANOVA One-Way (statsmodels), robusta a:
-    - espaços/BOM/caracteres estranhos no nome de coluna
-    - nomes com espaço, hífen, etc.
-    - evita Patsy Q() e problemas de resolução de nomes
+    (n, média, variância) por grupo a partir de códigos inteiros 0..k-1,
+    com np.bincount — sem matriz de desenho e sem groupby.
+    """
+    n = np.bincount(codigos, minlength=k).astype(float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        media = np.bincount(codigos, weights=y, minlength=k) / n
+        # soma de quadrados em torno da média do grupo (estável numericamente)
+        m2 = np.bincount(codigos, weights=(y - media[codigos]) ** 2, minlength=k)
+        var = np.where(n > 1, m2 / (n - 1), np.nan)
+    return n, media, var
+
+
+def _anova_vetorizada(
+    n: np.ndarray,
+    media: np.ndarray,
+    var: np.ndarray,
+) -> tuple[np.ndarray, ...]:
+    """
+    ANOVA one-way por somas de quadrados a partir de (n, média, variância).
+
+    Aceita vetores (G,) ou matrizes G × C (uma ANOVA por coluna).
+    Retorna (F, gl_entre, gl_dentro, p, ss_entre, ss_dentro).
+    """
+    presente = n > 0
+    k = presente.sum(axis=0).astype(float)
+    n_total = n.sum(axis=0)
+
+    soma = np.where(presente, n * np.nan_to_num(media), 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        media_geral = soma.sum(axis=0) / n_total
+        ss_entre = np.where(presente, n * (np.nan_to_num(media) - media_geral) ** 2, 0.0).sum(axis=0)
+        ss_dentro = np.where(n > 1, (n - 1) * np.nan_to_num(var), 0.0).sum(axis=0)
+
+        gl_entre = k - 1
+        gl_dentro = n_total - k
+        f = (ss_entre / gl_entre) / (ss_dentro / gl_dentro)
+
+    validos = (gl_entre >= 1) & (gl_dentro >= 1) & np.isfinite(f)
+    f = np.where(validos, f, np.nan)
+    p = stats.f.sf(f, gl_entre, gl_dentro)
+    return f, gl_entre, gl_dentro, p, ss_entre, ss_dentro
+
+
+def _anova_welch_vetorizada(
+    n: np.ndarray,
+    media: np.ndarray,
+    var: np.ndarray,
+) -> tuple[np.ndarray, ...]:
+    """
+    ANOVA de Welch (variâncias desiguais) a partir de (n, média, variância).
+
+    Grupos com n < 2 ou variância nula são ignorados.
+    Retorna (F, gl_entre, gl_dentro, p).
+    """
+    usar = (n > 1) & np.isfinite(var) & (var > 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        w = np.where(usar, n / var, 0.0)
+        soma_w = w.sum(axis=0)
+        k = usar.sum(axis=0).astype(float)
+
+        media_w = (w * np.nan_to_num(media)).sum(axis=0) / soma_w
+        a = (w * (np.nan_to_num(media) - media_w) ** 2).sum(axis=0) / (k - 1)
+        lam = np.where(usar, (1 - w / soma_w) ** 2 / (n - 1), 0.0).sum(axis=0)
+        b = 1 + 2 * (k - 2) / (k**2 - 1) * lam
+
+        f = a / b
+        gl_entre = k - 1
+        gl_dentro = (k**2 - 1) / (3 * lam)
+
+    validos = (k >= 2) & np.isfinite(f) & np.isfinite(gl_dentro)
+    f = np.where(validos, f, np.nan)
+    p = stats.f.sf(f, gl_entre, gl_dentro)
+    return f, gl_entre, gl_dentro, p
+
+
+def _preparar_anova(df: pd.DataFrame, numerica: str, categoria: str):
+    """
+    Seleção robusta das colunas (espaços/BOM no header), dropna e
+    codificação dos grupos. Retorna (y, códigos, rótulos, numerica, categoria).
     """
-    # 1) seleciona apenas as colunas necessárias
     if numerica not in df.columns or categoria not in df.columns:
         # fallback: tenta comparar via strip (caso clássico de "Value " vs "Value")
         colmap = {c.strip(): c for c in df.columns}
@@ -291,28 +368,53 @@ def anova_oneway(df: pd.DataFrame, numerica: str, categoria: str) -> dict:
 
     data = df[[numerica, categoria]].copy()
 
-    # 2) limpeza mínima de headers (protege contra "Value ", BOM, \r)
+    # limpeza mínima de headers (protege contra "Value ", BOM, \r)
     data.columns = [str(c).strip().replace("\ufeff", "") for c in data.columns]
     numerica_clean, categoria_clean = data.columns[0], data.columns[1]
 
-    # 3) dropna e rename temporário (contrato robusto para Patsy)
+    data[numerica_clean] = pd.to_numeric(data[numerica_clean], errors="coerce")
     data = data.dropna()
-    n = int(len(data))
-
-    mean = float(data[numerica_clean].mean()) if n else None
-    std = float(data[numerica_clean].std(ddof=1)) if n > 1 else None
 
-    tmp = data.rename(columns={numerica_clean: "__y__", categoria_clean: "__g__"})
+    codigos, rotulos = pd.factorize(data[categoria_clean], sort=True)
 
     # regra: precisa ter ao menos 2 grupos
-    if tmp["__g__"].nunique(dropna=True) < 2:
+    if len(rotulos) < 2:
         raise ValueError("ANOVA One-Way exige pelo menos 2 grupos na variável categórica.")
 
-    modelo = smf.ols("__y__ ~ C(__g__)", data=tmp).fit()
-    tabela = sm.stats.anova_lm(modelo, typ=2)
+    y = data[numerica_clean].to_numpy(dtype=float)
+    return y, codigos, rotulos, numerica, categoria
 
-    f_stat = float(tabela["F"].iloc[0])
-    p_value = float(tabela["PR(>F)"].iloc[0])
+
+def anova_oneway(df: pd.DataFrame, numerica: str, categoria: str) -> dict:
+    """
+    ANOVA One-Way por somas de quadrados (forma fechada), robusta a:
+    - espaços/BOM/caracteres estranhos no nome de coluna
+    - nomes com espaço, hífen, etc.
+
+    Usa apenas contagens, somas e somas de quadrados por grupo
+    (np.bincount): memória O(n + grupos), sem matriz de desenho.
+    """
+    y, codigos, rotulos, numerica, categoria = _preparar_anova(df, numerica, categoria)
+    n = int(len(y))
+
+    mean = float(y.mean()) if n else None
+    std = float(y.std(ddof=1)) if n > 1 else None
+
+    n_g, media_g, var_g = _estatisticas_por_codigo(y, codigos, len(rotulos))
+    f, gl_entre, gl_dentro, p, ss_entre, ss_dentro = _anova_vetorizada(n_g, media_g, var_g)
+
+    f_stat = float(f)
+    p_value = float(p)
+
+    tabela = pd.DataFrame(
+        {
+            "sum_sq": [float(ss_entre), float(ss_dentro)],
+            "df": [float(gl_entre), float(gl_dentro)],
+            "F": [f_stat, np.nan],
+            "PR(>F)": [p_value, np.nan],
+        },
+        index=[str(categoria), "Residual"],
+    )
 
     return _base_contract(
         teste="anova_oneway",
@@ -320,21 +422,55 @@ def anova_oneway(df: pd.DataFrame, numerica: str, categoria: str) -> dict:
         mean=mean,
         std=std,
         t_stat=None,
-        f_stat=f_stat,
-        p_value=p_value,
+        f_stat=None if np.isnan(f_stat) else f_stat,
+        p_value=None if np.isnan(p_value) else p_value,
         value_column=str(numerica),   # mantém o nome original selecionado
         group_column=str(categoria),
         anova_table=tabela,
     )
 
 
+def anova_welch(df: pd.DataFrame, numerica: str, categoria: str) -> dict:
+    """
+    ANOVA de Welch (não assume variâncias iguais entre os grupos).
+
+    Mesma preparação de dados de `anova_oneway`; os graus de liberdade do
+    denominador são fracionários.
+    """
+    y, codigos, rotulos, numerica, categoria = _preparar_anova(df, numerica, categoria)
+    n = int(len(y))
+
+    mean = float(y.mean()) if n else None
+    std = float(y.std(ddof=1)) if n > 1 else None
+
+    n_g, media_g, var_g = _estatisticas_por_codigo(y, codigos, len(rotulos))
+    f, gl_entre, gl_dentro, p = _anova_welch_vetorizada(n_g, media_g, var_g)
+
+    f_stat = float(f)
+    p_value = float(p)
+
+    return _base_contract(
+        teste="anova_welch",
+        n=n,
+        mean=mean,
+        std=std,
+        t_stat=None,
+        f_stat=None if np.isnan(f_stat) else f_stat,
+        p_value=None if np.isnan(p_value) else p_value,
+        value_column=str(numerica),
+        group_column=str(categoria),
+        df_num=float(gl_entre),
+        df_den=float(gl_dentro),
+    )
+
 
 def narrativa_anova(resultado: dict) -> str:
     p = resultado.get("p_value", None)
     f = resultado.get("f_stat", None)
+    titulo = "ANOVA de Welch" if resultado.get("teste") == "anova_welch" else "ANOVA One-Way"
 
     if p is None or (isinstance(p, float) and np.isnan(p)):
-        return "### ANOVA One-Way\nResultado indisponível."
+        return f"### {titulo}\nResultado indisponível."
 
     conclusao = (
         "Há diferença significativa entre pelo menos dois grupos (p < 0,05)."
@@ -343,7 +479,7 @@ def narrativa_anova(resultado: dict) -> str:
     )
 
     return f"""
-### ANOVA One-Way
+### {titulo}
 F = **{_fmt_num_user(f, 3)}**  
 p-valor = **{_fmt_p_user(p)}**
 
@@ -400,49 +536,359 @@ p-valor = **{_fmt_p_user(p)}**
 """
 
 
+def _codificar_categorias(serie: pd.Series) -> tuple[np.ndarray, int]:
+    """Códigos inteiros 0..k-1 (nulos = -1) e número de categorias."""
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        codigos = serie.cat.codes.to_numpy()
+        return codigos.astype(np.int64), len(serie.cat.categories)
+    codigos, categorias = pd.factorize(serie)
+    return codigos.astype(np.int64), len(categorias)
+
+
+def _quiquadrado_por_codigos(
+    a: np.ndarray,
+    ka: int,
+    b: np.ndarray,
+    kb: int,
+    correcao: bool = True,
+) -> tuple[float, float, int, int, float]:
+    """
+    χ² de independência a partir de dois vetores de códigos inteiros.
+
+    A tabela de contingência é contada com np.bincount (ou np.unique, se
+    ka × kb for grande demais para uma tabela densa) e o χ² depende apenas
+    das células não vazias:  χ² = N · (Σ O²/(Lᵢ·Cⱼ) − 1).
+
+    Retorna (χ², p, gl, N, V de Cramér). Com `correcao` e gl = 1 aplica a
+    correção de Yates, como `stats.chi2_contingency`; o V de Cramér usa
+    sempre o χ² sem correção.
+    """
+    if a.min(initial=0) < 0 or b.min(initial=0) < 0:
+        validos = (a >= 0) & (b >= 0)
+        a = a[validos]
+        b = b[validos]
+    n = int(a.size)
+    if n == 0:
+        return np.nan, np.nan, 0, 0, np.nan
+
+    lin = np.bincount(a, minlength=ka).astype(float)
+    col = np.bincount(b, minlength=kb).astype(float)
+    r = int((lin > 0).sum())
+    c = int((col > 0).sum())
+    if r < 2 or c < 2:
+        return np.nan, np.nan, 0, n, np.nan
+
+    tipo = np.int32 if ka * kb < np.iinfo(np.int32).max else np.int64
+    chave = a.astype(tipo) * tipo(kb) + b.astype(tipo)
+    if ka * kb <= 4 * n:
+        # tabela densa; Σ O²/(Lᵢ·Cⱼ) = Σ_linhas O[célula]/(Lᵢ·Cⱼ)
+        contagem = np.bincount(chave, minlength=ka * kb).astype(float)
+        soma = float((contagem[chave] / (lin[a] * col[b])).sum())
+    else:
+        # alta cardinalidade: só as células não vazias
+        ordenada = np.sort(chave)
+        inicio = np.flatnonzero(np.r_[True, ordenada[1:] != ordenada[:-1]])
+        celulas = ordenada[inicio]
+        obs = np.diff(np.r_[inicio, n]).astype(float)
+        soma = float((obs * obs / (lin[celulas // kb] * col[celulas % kb])).sum())
+
+    chi2 = max(n * soma - n, 0.0)
+    gl = (r - 1) * (c - 1)
+    cramer = float(np.sqrt(chi2 / (n * (min(r, c) - 1))))
+
+    if correcao and gl == 1:
+        # 2 × 2: tabela completa (inclui células vazias) para a correção de Yates
+        _, la = np.unique(a, return_inverse=True)
+        _, lb = np.unique(b, return_inverse=True)
+        tab = np.bincount(la * 2 + lb, minlength=4).reshape(2, 2).astype(float)
+        esp = np.outer(tab.sum(axis=1), tab.sum(axis=0)) / n
+        dif = np.abs(tab - esp)
+        dif = dif - np.minimum(0.5, dif)
+        chi2 = float((dif**2 / esp).sum())
+
+    p = float(stats.chi2.sf(chi2, gl))
+    return chi2, p, gl, n, cramer
+
+
+def matriz_quiquadrado(
+    df: pd.DataFrame,
+    colunas: list[str] | None = None,
+    correcao: bool = True,
+    correcao_multipla: str | None = None,
+) -> dict:
+    """
+    Triagem de associação entre todos os pares de variáveis categóricas.
+
+    Cada coluna é codificada em inteiros uma única vez; as tabelas de
+    contingência saem de contagens sobre os códigos (sem `pd.crosstab`).
+
+    Retorna um dicionário de matrizes quadradas (pd.DataFrame):
+      - cramers_v: V de Cramér (0 a 1; diagonal = 1)
+      - chi2: estatística χ²
+      - p_value: p-valor do teste de independência
+      - dof: graus de liberdade
+      - n: pares completos usados em cada teste
+      - p_ajustado: apenas com `correcao_multipla` ("holm", "bh",
+        "bonferroni"), corrigindo os k·(k−1)/2 pares distintos
+    """
+    if colunas is None:
+        colunas = df.select_dtypes(include=["object", "category"]).columns.tolist()
+    colunas = list(colunas)
+    k = len(colunas)
+
+    codigos = [_codificar_categorias(df[c]) for c in colunas]
+
+    v = np.eye(k)
+    chi2 = np.full((k, k), np.nan)
+    p = np.full((k, k), np.nan)
+    gl = np.zeros((k, k), dtype=int)
+    n = np.zeros((k, k), dtype=int)
+
+    for i in range(k):
+        a, ka = codigos[i]
+        n[i, i] = int((a >= 0).sum())
+        for j in range(i + 1, k):
+            b, kb = codigos[j]
+            c2, pv, g, nn, cv = _quiquadrado_por_codigos(a, ka, b, kb, correcao=correcao)
+            chi2[i, j] = chi2[j, i] = c2
+            p[i, j] = p[j, i] = pv
+            gl[i, j] = gl[j, i] = g
+            n[i, j] = n[j, i] = nn
+            v[i, j] = v[j, i] = cv
+
+    def _df(m):
+        return pd.DataFrame(m, index=colunas, columns=colunas)
+
+    out = {
+        "cramers_v": _df(v),
+        "chi2": _df(chi2),
+        "p_value": _df(p),
+        "dof": _df(gl),
+        "n": _df(n),
+    }
+
+    if correcao_multipla is not None:
+        iu = np.triu_indices(k, k=1)
+        p_adj = np.full((k, k), np.nan)
+        p_adj[iu] = ajustar_p_valores(p[iu], correcao_multipla)
+        p_adj.T[iu] = p_adj[iu]
+        out["p_ajustado"] = _df(p_adj)
+
+    return out
+
+
+def heatmap_associacao_figure(matriz: pd.DataFrame, titulo: str = "V de Cramér") -> go.Figure:
+    """Heatmap (Plotly) de uma matriz de associação, anotado com 2 casas."""
+    fig = go.Figure(
+        go.Heatmap(
+            z=matriz.to_numpy(dtype=float),
+            x=[str(c) for c in matriz.columns],
+            y=[str(c) for c in matriz.index],
+            zmin=0,
+            zmax=1,
+            colorscale="Blues",
+            text=np.round(matriz.to_numpy(dtype=float), 2),
+            texttemplate="%{text}",
+        )
+    )
+    fig.update_layout(
+        title=f"Matriz de Associação — {titulo}",
+        template="plotly_white",
+        yaxis=dict(autorange="reversed"),
+    )
+    return fig
+
+
 # ============================================================
 # 4) Normalidade + QQPlot
 # ============================================================
 
-def teste_normalidade(serie: pd.Series, metodo: str = "shapiro") -> dict:
+# Acima deste n o Shapiro–Wilk perde precisão (limite documentado no SciPy)
+LIMITE_SHAPIRO = 5000
+
+# Número fixo de pontos do QQ-Plot (payload constante para qualquer n)
+PONTOS_QQPLOT = 500
+
+_NOMES_NORMALIDADE = {
+    "shapiro": "Shapiro–Wilk",
+    "shapiro_subamostra": "Shapiro–Wilk (subamostra)",
+    "anderson": "Anderson–Darling",
+    "dagostino": "D'Agostino K²",
+    "jarque_bera": "Jarque–Bera",
+}
+
+
+def _anderson_darling(x: np.ndarray) -> tuple[float, float]:
+    """
+    Anderson–Darling para normalidade com média/desvio estimados.
+
+    p-valor pela aproximação de D'Agostino & Stephens (1986), a mesma
+    usada pelo Minitab. Retorna (A², p).
+    """
+    x = np.sort(x)
+    n = x.size
+    z = (x - x.mean()) / x.std(ddof=1)
+    i = np.arange(1, n + 1)
+    a2 = -n - np.mean((2 * i - 1) * (stats.norm.logcdf(z) + stats.norm.logsf(z[::-1])))
+
+    a2s = a2 * (1 + 0.75 / n + 2.25 / n**2)
+    if a2s >= 0.6:
+        # o polinômio tem mínimo em A² ≈ 153,5; acima disso p é ~0
+        a2s = min(a2s, 153.467)
+        p = np.exp(1.2937 - 5.709 * a2s + 0.0186 * a2s**2)
+    elif a2s >= 0.34:
+        p = np.exp(0.9177 - 4.279 * a2s - 1.38 * a2s**2)
+    elif a2s >= 0.2:
+        p = 1 - np.exp(-8.318 + 42.796 * a2s - 59.938 * a2s**2)
+    else:
+        p = 1 - np.exp(-13.436 + 101.14 * a2s - 223.73 * a2s**2)
+    return float(a2), float(min(max(p, 0.0), 1.0))
+
+
+def _testes_por_tamanho(n: int, amostra_shapiro: int | None) -> list[str]:
+    """Bateria de testes (o primeiro é o principal) conforme o tamanho da amostra."""
+    if n <= LIMITE_SHAPIRO:
+        testes = ["shapiro", "anderson"]
+        if n >= 20:
+            testes.append("dagostino")
+        return testes
+
+    testes = ["dagostino", "anderson", "jarque_bera"]
+    if amostra_shapiro:
+        testes.append("shapiro_subamostra")
+    return testes
+
+
+def _rodar_teste_normalidade(
+    nome: str,
+    x: np.ndarray,
+    amostra_shapiro: int | None,
+    seed: int,
+) -> tuple[float, float]:
+    if nome == "shapiro":
+        stat, p = stats.shapiro(x)
+    elif nome == "shapiro_subamostra":
+        rng = np.random.default_rng(seed)
+        tamanho = min(int(amostra_shapiro or LIMITE_SHAPIRO), LIMITE_SHAPIRO, x.size)
+        stat, p = stats.shapiro(rng.choice(x, size=tamanho, replace=False))
+    elif nome == "anderson":
+        stat, p = _anderson_darling(x)
+    elif nome == "dagostino":
+        stat, p = stats.normaltest(x)
+    elif nome == "jarque_bera":
+        stat, p = stats.jarque_bera(x)
+    else:
+        raise ValueError(f"Teste de normalidade não suportado: {nome}")
+    return float(stat), float(p)
+
+
+def teste_normalidade(
+    serie: pd.Series,
+    metodo: str = "auto",
+    amostra_shapiro: int | None = LIMITE_SHAPIRO,
+    seed: int = 42,
+) -> dict:
+    """
+    Teste de normalidade.
+
+    metodo:
+        - "auto": escolhe pelos dados — Shapiro–Wilk até n = 5000;
+          acima disso D'Agostino K² (principal), Anderson–Darling,
+          Jarque–Bera e, se `amostra_shapiro`, Shapiro–Wilk em uma
+          subamostra aleatória de tamanho fixo (reprodutível via `seed`).
+        - "shapiro", "anderson", "dagostino", "jarque_bera": teste único.
+
+    O teste principal preenche t_stat/p_value; todos os testes executados
+    ficam em `testes` ({nome: {"stat", "p_value"}}).
+    """
     serie = serie.dropna()
     n = int(len(serie))
 
     mean = float(serie.mean()) if n else None
     std = float(serie.std(ddof=1)) if n > 1 else None
 
-    if n < 3:
+    if metodo == "auto":
+        nomes = _testes_por_tamanho(n, amostra_shapiro)
+    elif metodo in _NOMES_NORMALIDADE:
+        nomes = [metodo]
+    else:
+        raise ValueError(f"Método de normalidade não suportado: {metodo}")
+
+    # D'Agostino exige n >= 8 (teste de assimetria)
+    minimo = 8 if nomes[0] == "dagostino" else 3
+    if n < minimo:
         return _base_contract(
-            teste=f"normality_{metodo}",
+            teste=f"normality_{nomes[0]}",
             n=n,
             mean=mean,
             std=std,
             t_stat=None,
             f_stat=None,
             p_value=None,
-            metodo=str(metodo),
+            metodo=str(nomes[0]),
             w_stat=None,
+            testes={},
         )
 
-    stat, p = stats.shapiro(serie)
+    x = serie.to_numpy(dtype=float)
+    testes = {}
+    for nome in nomes:
+        stat, p = _rodar_teste_normalidade(nome, x, amostra_shapiro, seed)
+        testes[nome] = {"stat": stat, "p_value": p}
+
+    principal = nomes[0]
+    stat = testes[principal]["stat"]
+    p = testes[principal]["p_value"]
 
     return _base_contract(
-        teste=f"normality_{metodo}",
+        teste=f"normality_{principal}",
         n=n,
         mean=mean,
         std=std,
-        t_stat=float(stat),
+        t_stat=stat,
         f_stat=None,
-        p_value=float(p),
-        metodo=str(metodo),
-        w_stat=float(stat),
+        p_value=p,
+        metodo=str(principal),
+        w_stat=stat if principal == "shapiro" else None,
+        testes=testes,
     )
 
 
-def qqplot_figure(serie: pd.Series) -> go.Figure:
-    """QQ-Plot em Plotly para visualização em Streamlit."""
-    serie = serie.dropna()
-    (osm, osr), (slope, intercept, r) = stats.probplot(serie, dist="norm")
+def _quantis_qqplot(x: np.ndarray, pontos: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Pontos do QQ-Plot normal (mesmas posições de `stats.probplot`).
+
+    Para n > pontos, usa apenas `pontos` postos igualmente espaçados
+    (incluindo mínimo e máximo), obtidos com np.partition em O(n).
+    """
+    n = x.size
+    if n == 0:
+        return np.empty(0), np.empty(0)
+    if n <= pontos:
+        postos = np.arange(n)
+        osr = np.sort(x)
+    else:
+        postos = np.unique(np.round(np.linspace(0, n - 1, pontos)).astype(int))
+        osr = np.partition(x, postos)[postos]
+
+    # medianas das estatísticas de ordem uniformes (Filliben), como no probplot
+    u = (postos + 1 - 0.3175) / (n + 0.365)
+    u[postos == n - 1] = 0.5 ** (1.0 / n)
+    u[postos == 0] = 1 - 0.5 ** (1.0 / n)
+    osm = stats.norm.ppf(u)
+    return osm, osr
+
+
+def qqplot_figure(serie: pd.Series, pontos: int = PONTOS_QQPLOT) -> go.Figure:
+    """
+    QQ-Plot em Plotly para visualização em Streamlit.
+
+    Plota no máximo `pontos` quantis, de modo que o tempo de resposta e o
+    tamanho do gráfico não crescem com o número de linhas.
+    """
+    x = serie.dropna().to_numpy(dtype=float)
+    osm, osr = _quantis_qqplot(x, pontos)
+    slope, intercept = np.polyfit(osm, osr, 1) if osm.size >= 2 else (np.nan, np.nan)
 
     fig = go.Figure()
     fig.add_trace(
@@ -450,7 +896,7 @@ def qqplot_figure(serie: pd.Series) -> go.Figure:
             x=osm,
             y=osr,
             mode="markers",
-            name="Amostra",
+            name="Amostra" if x.size <= pontos else f"Amostra ({osm.size} quantis de {x.size})",
             marker=dict(color=PRIMARY),
         )
     )
@@ -475,9 +921,10 @@ def qqplot_figure(serie: pd.Series) -> go.Figure:
 def narrativa_normalidade(resultado: dict) -> str:
     p = resultado.get("p_value", None)
     metodo = resultado.get("metodo", resultado.get("teste", "shapiro"))
+    nome = _NOMES_NORMALIDADE.get(metodo, metodo)
 
     if p is None or (isinstance(p, float) and np.isnan(p)):
-        return f"O teste de normalidade ({metodo}) não pôde ser calculado por falta de dados."
+        return f"O teste de normalidade ({nome}) não pôde ser calculado por falta de dados."
 
     conclusao = (
         "Os dados **não seguem** distribuição normal (p < 0,05)."
@@ -485,9 +932,912 @@ def narrativa_normalidade(resultado: dict) -> str:
         else "Os dados **seguem** distribuição aproximadamente normal (p ≥ 0,05)."
     )
 
+    outros = [
+        f"- {_NOMES_NORMALIDADE.get(k, k)}: estatística = {_fmt_num_user(v['stat'], 3)}, "
+        f"p-valor = {_fmt_p_user(v['p_value'])}"
+        for k, v in (resultado.get("testes") or {}).items()
+        if k != metodo
+    ]
+    complemento = ""
+    if outros:
+        complemento = "\n\n**Testes complementares:**\n" + "\n".join(outros)
+
+    nota = ""
+    if resultado.get("n", 0) > LIMITE_SHAPIRO and metodo != "shapiro":
+        nota = (
+            "\n\n> Observação: com amostras grandes, desvios pequenos e sem importância prática "
+            "já tornam o p-valor significativo; confira também o QQ-Plot."
+        )
+
     return f"""
-### Teste de Normalidade — {metodo}
+### Teste de Normalidade — {nome}
+n = {resultado.get("n")}  
+p-valor = **{_fmt_p_user(p)}**
+
+**Conclusão:** {conclusao}{complemento}{nota}
+"""
+
+# ============================================================
+# 5) Testes em lote (triagem de muitas colunas × grupos)
+# ============================================================
+
+def _estatisticas_suficientes(
+    df: pd.DataFrame,
+    colunas: list[str],
+    categoria: str,
+) -> tuple[list, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Um único groupby sobre todas as colunas numéricas.
+
+    Retorna (rótulos dos grupos, n, média, variância) — matrizes G × C.
+    NaN de cada coluna é descartado apenas naquela coluna, como nos testes
+    individuais (que fazem dropna por par numérica/categoria).
+    """
+    dados = df[colunas].apply(pd.to_numeric, errors="coerce")
+    grupos = dados.groupby(df[categoria], observed=True, sort=True)
+
+    n = grupos.count()
+    media = grupos.mean()
+    var = grupos.var(ddof=1)
+
+    return (
+        n.index.tolist(),
+        n.to_numpy(dtype=float),
+        media.to_numpy(dtype=float),
+        var.to_numpy(dtype=float),
+    )
+
+
+def _welch_t_vetorizado(
+    n1: np.ndarray,
+    m1: np.ndarray,
+    v1: np.ndarray,
+    n2: np.ndarray,
+    m2: np.ndarray,
+    v2: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Welch t (equal_var=False) elemento a elemento: (t, gl, p bicaudal)."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        a = v1 / n1
+        b = v2 / n2
+        se2 = a + b
+        t = (m1 - m2) / np.sqrt(se2)
+        gl = se2**2 / (a**2 / (n1 - 1) + b**2 / (n2 - 1))
+
+    validos = (n1 >= 2) & (n2 >= 2) & np.isfinite(t) & np.isfinite(gl)
+    t = np.where(validos, t, np.nan)
+    gl = np.where(validos, gl, np.nan)
+    p = 2.0 * stats.t.sf(np.abs(t), gl)
+    return t, gl, p
+
+
+def testes_em_lote(
+    df: pd.DataFrame,
+    categoria: str,
+    colunas: list[str] | None = None,
+    pares: list[tuple] | None = None,
+    correcao: str | None = None,
+) -> pd.DataFrame:
+    """
+    Triagem de muitas variáveis numéricas contra uma variável de grupos.
+
+    Calcula as estatísticas suficientes (n, média, variância) de todos os
+    grupos e colunas em um único groupby e deriva, de forma vetorizada:
+      - Teste t de Welch para cada par de grupos (ou para `pares`)
+      - ANOVA One-Way para cada coluna
+
+    Os resultados coincidem com `teste_t_duas_amostras` e `anova_oneway`
+    aplicados individualmente. Retorna uma tabela "tidy", uma linha por
+    (teste, coluna, par de grupos). Com `correcao` ("holm", "bh",
+    "bonferroni"), acrescenta `p_ajustado` corrigido dentro de cada teste.
+    """
+    if categoria not in df.columns:
+        raise ValueError(f"Coluna de grupos '{categoria}' não existe no DataFrame.")
+
+    if colunas is None:
+        colunas = [
+            c for c in df.select_dtypes(include=["number"]).columns if c != categoria
+        ]
+    colunas = list(colunas)
+
+    cols_saida = [
+        "teste", "coluna", "grupo1", "grupo2", "n", "n1", "n2",
+        "mean1", "mean2", "std1", "std2", "t_stat", "f_stat",
+        "gl1", "gl2", "p_value",
+    ]
+    if not colunas:
+        return pd.DataFrame(columns=cols_saida)
+
+    rotulos, n, media, var = _estatisticas_suficientes(df, colunas, categoria)
+    n_grupos, n_cols = n.shape
+
+    if n_grupos < 2:
+        raise ValueError("A triagem em lote exige pelo menos 2 grupos na variável categórica.")
+
+    # ---- pares de grupos ----
+    if pares is None:
+        idx_i, idx_j = np.triu_indices(n_grupos, k=1)
+    else:
+        posicao = {g: i for i, g in enumerate(rotulos)}
+        faltando = [g for par in pares for g in par if g not in posicao]
+        if faltando:
+            raise ValueError(f"Grupos inexistentes em '{categoria}': {faltando}")
+        idx_i = np.array([posicao[a] for a, _ in pares], dtype=int)
+        idx_j = np.array([posicao[b] for _, b in pares], dtype=int)
+
+    t, gl_t, p_t = _welch_t_vetorizado(
+        n[idx_i], media[idx_i], var[idx_i],
+        n[idx_j], media[idx_j], var[idx_j],
+    )
+
+    n_pares = len(idx_i)
+    rot = np.asarray(rotulos, dtype=object)
+    std = np.sqrt(var)
+
+    tabela_t = pd.DataFrame(
+        {
+            "teste": "t_test_two_samples",
+            "coluna": np.tile(np.asarray(colunas, dtype=object), n_pares),
+            "grupo1": np.repeat(rot[idx_i], n_cols),
+            "grupo2": np.repeat(rot[idx_j], n_cols),
+            "n": (n[idx_i] + n[idx_j]).ravel(),
+            "n1": n[idx_i].ravel(),
+            "n2": n[idx_j].ravel(),
+            "mean1": media[idx_i].ravel(),
+            "mean2": media[idx_j].ravel(),
+            "std1": std[idx_i].ravel(),
+            "std2": std[idx_j].ravel(),
+            "t_stat": t.ravel(),
+            "f_stat": np.nan,
+            "gl1": gl_t.ravel(),
+            "gl2": np.nan,
+            "p_value": p_t.ravel(),
+        }
+    )
+
+    # ---- ANOVA por coluna ----
+    f, gl_entre, gl_dentro, p_f, _, _ = _anova_vetorizada(n, media, var)
+
+    tabela_f = pd.DataFrame(
+        {
+            "teste": "anova_oneway",
+            "coluna": colunas,
+            "grupo1": None,
+            "grupo2": None,
+            "n": n.sum(axis=0),
+            "n1": np.nan,
+            "n2": np.nan,
+            "mean1": np.nan,
+            "mean2": np.nan,
+            "std1": np.nan,
+            "std2": np.nan,
+            "t_stat": np.nan,
+            "f_stat": f,
+            "gl1": gl_entre,
+            "gl2": gl_dentro,
+            "p_value": p_f,
+        }
+    )
+
+    out = pd.concat([tabela_f, tabela_t], ignore_index=True)
+    out["n"] = out["n"].astype(int)
+    return _ajustar_tabela(out[cols_saida], correcao, ["teste"])
+
+
+# ============================================================
+# 6) Testes não paramétricos (postos)
+# ============================================================
+
+def _postos_ordenados(ordenados: np.ndarray) -> tuple[np.ndarray, float]:
+    """
+    Postos médios (empates) de um vetor JÁ ORDENADO, em O(n), e o termo
+    de empates Σ(t³ − t). Permite recalcular postos de subconjuntos de uma
+    coluna sem uma nova ordenação.
+    """
+    n = ordenados.size
+    if n == 0:
+        return np.empty(0), 0.0
+    inicio = np.flatnonzero(np.r_[True, ordenados[1:] != ordenados[:-1]])
+    t = np.diff(np.r_[inicio, n])
+    # posto médio do bloco de empates: (primeiro + último) / 2, base 1
+    posto_bloco = inicio + (t + 1) / 2.0
+    empates = float((t.astype(float) ** 3 - t).sum())
+    return np.repeat(posto_bloco, t), empates
+
+
+def _mann_whitney_postos(
+    postos: np.ndarray,
+    no_grupo1: np.ndarray,
+    empates: float,
+) -> tuple[float, float]:
+    """U (do grupo 1) e p bicaudal pela aproximação normal com correções
+    de empates e de continuidade (`method="asymptotic"` do SciPy)."""
+    n1 = int(no_grupo1.sum())
+    n2 = int(no_grupo1.size - n1)
+    n = n1 + n2
+    if n1 == 0 or n2 == 0:
+        return np.nan, np.nan
+
+    u1 = float(postos[no_grupo1].sum() - n1 * (n1 + 1) / 2.0)
+    mu = n1 * n2 / 2.0
+    s = np.sqrt(n1 * n2 / 12.0 * ((n + 1) - empates / (n * (n - 1))))
+    if s == 0:
+        return u1, np.nan
+    u = max(u1, n1 * n2 - u1)
+    z = (u - mu - 0.5) / s
+    return u1, float(min(2.0 * stats.norm.sf(z), 1.0))
+
+
+def _kruskal_postos(
+    postos: np.ndarray,
+    codigos: np.ndarray,
+    k: int,
+    empates: float,
+) -> tuple[float, float, int]:
+    """H de Kruskal–Wallis (corrigido para empates), p e graus de liberdade."""
+    n = postos.size
+    n_g = np.bincount(codigos, minlength=k).astype(float)
+    r_g = np.bincount(codigos, weights=postos, minlength=k)
+    presentes = n_g > 0
+    gl = int(presentes.sum()) - 1
+    if gl < 1 or n < 2:
+        return np.nan, np.nan, max(gl, 0)
+
+    h = 12.0 / (n * (n + 1)) * (r_g[presentes] ** 2 / n_g[presentes]).sum() - 3 * (n + 1)
+    correcao = 1 - empates / (n**3 - n)
+    if correcao <= 0:
+        return np.nan, np.nan, gl
+    h /= correcao
+    return float(h), float(stats.chi2.sf(h, gl)), gl
+
+
+def teste_mann_whitney(g1: pd.Series, g2: pd.Series) -> dict:
+    """Mann–Whitney U (duas amostras independentes, bicaudal)."""
+    g1 = pd.to_numeric(g1, errors="coerce").dropna()
+    g2 = pd.to_numeric(g2, errors="coerce").dropna()
+    n1, n2 = int(len(g1)), int(len(g2))
+    n = n1 + n2
+
+    pooled = pd.concat([g1, g2], axis=0)
+
+    u_stat, p_value = (np.nan, np.nan)
+    if n1 >= 1 and n2 >= 1:
+        u_stat, p_value = stats.mannwhitneyu(g1, g2, alternative="two-sided")
+
+    return _base_contract(
+        teste="mann_whitney",
+        n=n,
+        mean=float(pooled.mean()) if n else None,
+        std=float(pooled.std(ddof=1)) if n > 1 else None,
+        t_stat=None if np.isnan(u_stat) else float(u_stat),
+        f_stat=None,
+        p_value=None if np.isnan(p_value) else float(p_value),
+        u_stat=None if np.isnan(u_stat) else float(u_stat),
+        n1=n1,
+        n2=n2,
+        median1=float(g1.median()) if n1 else None,
+        median2=float(g2.median()) if n2 else None,
+    )
+
+
+def teste_wilcoxon(grupo1: pd.Series, grupo2: pd.Series) -> dict:
+    """Wilcoxon signed-rank (pareado; diferenças nulas descartadas)."""
+    pares = pd.concat([grupo1, grupo2], axis=1).apply(pd.to_numeric, errors="coerce").dropna()
+    g1 = pares.iloc[:, 0]
+    g2 = pares.iloc[:, 1]
+    dif = g1 - g2
+    n = int(len(pares))
+
+    w_stat, p_value = (np.nan, np.nan)
+    if (dif != 0).sum() >= 1:
+        w_stat, p_value = stats.wilcoxon(g1, g2)
+
+    return _base_contract(
+        teste="wilcoxon_signed_rank",
+        n=n,
+        mean=float(dif.mean()) if n else None,
+        std=float(dif.std(ddof=1)) if n > 1 else None,
+        t_stat=None if np.isnan(w_stat) else float(w_stat),
+        f_stat=None,
+        p_value=None if np.isnan(p_value) else float(p_value),
+        w_stat=None if np.isnan(w_stat) else float(w_stat),
+        median_diff=float(dif.median()) if n else None,
+    )
+
+
+def kruskal_wallis(df: pd.DataFrame, numerica: str, categoria: str) -> dict:
+    """Kruskal–Wallis (alternativa não paramétrica à ANOVA One-Way)."""
+    y, codigos, rotulos, numerica, categoria = _preparar_anova(df, numerica, categoria)
+    n = int(len(y))
+
+    ordem = np.argsort(y, kind="mergesort")
+    postos_ord, empates = _postos_ordenados(y[ordem])
+    h, p, gl = _kruskal_postos(postos_ord, codigos[ordem], len(rotulos), empates)
+
+    return _base_contract(
+        teste="kruskal_wallis",
+        n=n,
+        mean=float(y.mean()) if n else None,
+        std=float(y.std(ddof=1)) if n > 1 else None,
+        t_stat=None,
+        f_stat=None if np.isnan(h) else h,  # H ~ χ², como no Qui-Quadrado
+        p_value=None if np.isnan(p) else p,
+        h_stat=None if np.isnan(h) else h,
+        dof=gl,
+        value_column=str(numerica),
+        group_column=str(categoria),
+    )
+
+
+def _intercalar_ordenados(a: np.ndarray, b: np.ndarray) -> tuple[np.ndarray, float, np.ndarray]:
+    """
+    Intercala dois vetores já ordenados sem reordenar: posição de cada
+    elemento no vetor conjunto por busca binária no outro grupo. Retorna
+    (postos, empates, máscara do grupo `a`) na ordem conjunta.
+    """
+    pos_a = np.arange(a.size) + np.searchsorted(b, a, side="left")
+    pos_b = np.arange(b.size) + np.searchsorted(a, b, side="right")
+    conjunto = np.empty(a.size + b.size)
+    conjunto[pos_a] = a
+    conjunto[pos_b] = b
+    no_a = np.zeros(conjunto.size, dtype=bool)
+    no_a[pos_a] = True
+    postos, empates = _postos_ordenados(conjunto)
+    return postos, empates, no_a
+
+
+def nao_parametricos_em_lote(
+    df: pd.DataFrame,
+    fatores: list[str],
+    colunas: list[str] | None = None,
+    pares: bool = True,
+    correcao: str | None = None,
+) -> pd.DataFrame:
+    """
+    Triagem não paramétrica: Kruskal–Wallis por (coluna, fator) e, com
+    `pares`, Mann–Whitney para cada par de grupos de cada fator.
+
+    Cada coluna numérica é ordenada uma única vez; os postos de cada fator
+    são recalculados sobre o vetor já ordenado, em O(n), e cada par de
+    grupos intercala os dois grupos já ordenados, sem varrer a coluna
+    inteira. Os p-valores de Mann–Whitney usam a aproximação normal com
+    correções de empates e de continuidade. Com `correcao`, acrescenta
+    `p_ajustado` corrigido dentro de cada teste.
+    """
+    if colunas is None:
+        colunas = [
+            c for c in df.select_dtypes(include=["number"]).columns if c not in fatores
+        ]
+
+    cols_saida = [
+        "teste", "coluna", "fator", "grupo1", "grupo2",
+        "n", "n1", "n2", "stat", "p_value",
+    ]
+
+    # fatores codificados uma única vez (reaproveitados em todas as colunas)
+    cod_fatores = {}
+    for f in fatores:
+        cod, rot = pd.factorize(df[f], sort=True)
+        cod_fatores[f] = (cod, np.asarray(rot, dtype=object))
+
+    linhas = []
+    for col in colunas:
+        y = pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=float)
+        ordem = np.argsort(y, kind="mergesort")
+        ordem = ordem[~np.isnan(y[ordem])]
+        y_ord = y[ordem]
+
+        for f, (cod, rot) in cod_fatores.items():
+            c_ord = cod[ordem]
+            valido = c_ord >= 0
+            y_f = y_ord[valido]
+            c_f = c_ord[valido]
+
+            postos, empates = _postos_ordenados(y_f)
+            h, p, _ = _kruskal_postos(postos, c_f, len(rot), empates)
+            linhas.append(("kruskal_wallis", col, f, None, None, y_f.size, np.nan, np.nan, h, p))
+
+            if not pares:
+                continue
+
+            # separa o vetor ordenado por grupo uma única vez (argsort estável
+            # mantém os valores ordenados dentro de cada grupo)
+            por_grupo = y_f[np.argsort(c_f, kind="stable")]
+            limites = np.concatenate([[0], np.cumsum(np.bincount(c_f, minlength=len(rot)))])
+            grupos = [por_grupo[limites[g]:limites[g + 1]] for g in range(len(rot))]
+
+            for i, j in zip(*np.triu_indices(len(rot), k=1)):
+                a, b = grupos[i], grupos[j]
+                postos_par, empates_par, no_g1 = _intercalar_ordenados(a, b)
+                u, p_u = _mann_whitney_postos(postos_par, no_g1, empates_par)
+                linhas.append(
+                    ("mann_whitney", col, f, rot[i], rot[j], a.size + b.size, a.size, b.size, u, p_u)
+                )
+
+    return _ajustar_tabela(pd.DataFrame(linhas, columns=cols_saida), correcao, ["teste"])
+
+
+def narrativa_nao_parametrico(resultado: dict) -> str:
+    teste = resultado.get("teste")
+    p = resultado.get("p_value", None)
+    titulos = {
+        "mann_whitney": ("Mann–Whitney U", "U", resultado.get("u_stat")),
+        "wilcoxon_signed_rank": ("Wilcoxon (postos sinalizados)", "W", resultado.get("w_stat")),
+        "kruskal_wallis": ("Kruskal–Wallis", "H", resultado.get("h_stat")),
+    }
+    titulo, simbolo, stat = titulos.get(teste, ("Teste não paramétrico", "estatística", None))
+
+    if p is None or (isinstance(p, float) and np.isnan(p)):
+        return f"### {titulo}\nResultado indisponível."
+
+    conclusao = (
+        "Há evidência estatística de diferença entre as distribuições (p < 0,05)."
+        if p < 0.05
+        else "Não há evidência estatística de diferença entre as distribuições (p ≥ 0,05)."
+    )
+
+    detalhe = ""
+    if teste == "mann_whitney":
+        detalhe = (
+            f"Grupo 1 — mediana: **{_fmt_num_user(resultado.get('median1'), 2)}** (n = {resultado.get('n1')})  \n"
+            f"Grupo 2 — mediana: **{_fmt_num_user(resultado.get('median2'), 2)}** (n = {resultado.get('n2')})  \n"
+        )
+    elif teste == "wilcoxon_signed_rank":
+        detalhe = f"Mediana das diferenças (A − B): **{_fmt_num_user(resultado.get('median_diff'), 2)}**  \n"
+
+    return f"""
+### {titulo}
+{detalhe}n = {resultado.get("n")}  
+{simbolo} = **{_fmt_num_user(stat, 3)}**  
 p-valor = **{_fmt_p_user(p)}**
 
 **Conclusão:** {conclusao}
 """
+
+
+# ============================================================
+# 7) Comparações múltiplas (post-hoc) e correção de p-valores
+# ============================================================
+
+_METODOS_CORRECAO = {
+    "bonferroni": "bonferroni",
+    "holm": "holm",
+    "bh": "bh",
+    "fdr_bh": "bh",
+    "benjamini-hochberg": "bh",
+}
+
+# Quadratura de Gauss–Legendre fixa para a distribuição da amplitude studentizada
+_GL_NOS, _GL_PESOS = np.polynomial.legendre.leggauss(96)
+_Z_LIMITE = 8.5
+
+
+def ajustar_p_valores(p, metodo: str = "holm") -> np.ndarray:
+    """
+    Correção de p-valores para comparações múltiplas (vetorizada).
+
+    metodo:
+        - "bonferroni"
+        - "holm": Holm–Bonferroni (controla FWER)
+        - "bh": Benjamini–Hochberg (controla FDR); aceita "fdr_bh"
+
+    NaN são preservados e não contam no número de testes.
+    """
+    chave = _METODOS_CORRECAO.get(str(metodo).lower())
+    if chave is None:
+        raise ValueError(f"Correção de p-valores não suportada: {metodo}")
+
+    p = np.asarray(p, dtype=float)
+    out = np.full(p.shape, np.nan)
+    validos = ~np.isnan(p)
+    pv = p[validos]
+    m = pv.size
+    if m == 0:
+        return out
+
+    if chave == "bonferroni":
+        adj = pv * m
+    else:
+        ordem = np.argsort(pv, kind="mergesort")
+        ps = pv[ordem]
+        if chave == "holm":
+            adj_ord = np.maximum.accumulate((m - np.arange(m)) * ps)
+        else:
+            adj_ord = np.minimum.accumulate((ps * m / np.arange(1, m + 1))[::-1])[::-1]
+        adj = np.empty(m)
+        adj[ordem] = adj_ord
+
+    out[validos] = np.minimum(adj, 1.0)
+    return out
+
+
+def _ajustar_tabela(tabela: pd.DataFrame, correcao: str | None, familia: list[str]) -> pd.DataFrame:
+    """Acrescenta `p_ajustado`, corrigindo os p-valores dentro de cada família."""
+    if correcao is None or tabela.empty:
+        return tabela
+    tabela = tabela.copy()
+    tabela["p_ajustado"] = np.nan
+    for _, idx in tabela.groupby(familia, sort=False, dropna=False).groups.items():
+        tabela.loc[idx, "p_ajustado"] = ajustar_p_valores(tabela.loc[idx, "p_value"], correcao)
+    return tabela
+
+
+def _amplitude_studentizada_cdf(q, k: int, gl) -> np.ndarray:
+    """
+    CDF da amplitude studentizada (k médias, gl graus de liberdade),
+    vetorizada em q e gl por quadratura dupla de Gauss–Legendre.
+
+    Equivale a `stats.studentized_range.cdf` (erro absoluto ~1e-8), mas
+    avalia centenas de pares em uma fração do tempo.
+    """
+    q = np.atleast_1d(np.asarray(q, dtype=float))
+    gl = np.broadcast_to(np.asarray(gl, dtype=float), q.shape)
+    out = np.empty(q.shape)
+
+    z = _Z_LIMITE * _GL_NOS
+    wz = _Z_LIMITE * _GL_PESOS * stats.norm.pdf(z)
+    phi_z = stats.norm.cdf(z)
+
+    for i in range(0, q.size, 32):
+        qq = q[i:i + 32]
+        nu = np.where(np.isfinite(gl[i:i + 32]), np.minimum(gl[i:i + 32], 1e5), 1e5)
+
+        # s = sqrt(χ²_ν / ν): integra entre quantis extremos e renormaliza
+        lo = np.sqrt(stats.chi2.ppf(1e-13, nu) / nu)
+        hi = np.sqrt(stats.chi2.ppf(1 - 1e-13, nu) / nu)
+        meio = ((lo + hi) / 2)[:, None]
+        raio = ((hi - lo) / 2)[:, None]
+        s = meio + raio * _GL_NOS[None, :]
+        nu_c = nu[:, None]
+        log_f = (
+            np.log(2) + nu_c / 2 * np.log(nu_c / 2) - gammaln(nu_c / 2)
+            + (nu_c - 1) * np.log(s) - nu_c * s**2 / 2
+        )
+        ws = raio * _GL_PESOS[None, :] * np.exp(log_f)
+        ws /= ws.sum(axis=1, keepdims=True)
+
+        w = qq[:, None] * s
+        dentro = np.clip(phi_z[None, None, :] - stats.norm.cdf(z[None, None, :] - w[:, :, None]), 0, None)
+        amplitude = k * (dentro ** (k - 1) * wz).sum(axis=2)
+        out[i:i + 32] = (ws * amplitude).sum(axis=1)
+
+    return np.clip(out, 0.0, 1.0)
+
+
+def _amplitude_studentizada_ppf(prob: float, k: int, gl) -> np.ndarray:
+    """
+    Quantil da amplitude studentizada por bisseção vetorizada.
+
+    Com muitos gl distintos (Games–Howell), resolve em uma grade de 1/gl e
+    interpola — o quantil é suave em 1/gl.
+    """
+    gl = np.atleast_1d(np.asarray(gl, dtype=float))
+    unicos = np.unique(gl)
+    if unicos.size > 16:
+        inv = np.linspace(1 / unicos.max(), 1 / unicos.min(), 16)
+        nos = 1 / inv
+    else:
+        nos = unicos
+
+    lo = np.zeros(nos.size)
+    hi = np.full(nos.size, 50.0)
+    for _ in range(45):
+        meio = (lo + hi) / 2
+        abaixo = _amplitude_studentizada_cdf(meio, k, nos) < prob
+        lo = np.where(abaixo, meio, lo)
+        hi = np.where(abaixo, hi, meio)
+    q_nos = (lo + hi) / 2
+
+    if unicos.size > 16:
+        return np.interp(1 / gl, 1 / nos[::-1], q_nos[::-1])
+    return q_nos[np.searchsorted(nos, gl)]
+
+
+def posthoc_comparacoes(
+    df: pd.DataFrame,
+    numerica: str,
+    categoria: str,
+    metodo: str = "tukey",
+    alpha: float = 0.05,
+    correcao: str | None = None,
+) -> pd.DataFrame:
+    """
+    Comparações post-hoc de todos os pares de grupos.
+
+    metodo:
+        - "tukey": Tukey HSD (Tukey–Kramer para n desiguais; variância
+          combinada da ANOVA)
+        - "games_howell": Games–Howell (variâncias desiguais; gl de Welch)
+
+    Parte de uma única tabela de médias, variâncias e contagens por grupo;
+    diferenças, erros-padrão, estatísticas q, p-valores e intervalos de
+    confiança de todos os pares saem de operações vetorizadas.
+    Os p-valores já são ajustados pela família (amplitude studentizada);
+    `correcao` acrescenta `p_ajustado` (Holm, BH, Bonferroni), se desejado.
+
+    `diferenca` = média(grupo1) − média(grupo2).
+    """
+    y, codigos, rotulos, numerica, categoria = _preparar_anova(df, numerica, categoria)
+    k = len(rotulos)
+    n_g, media_g, var_g = _estatisticas_por_codigo(y, codigos, k)
+
+    i, j = np.triu_indices(k, k=1)
+    dif = media_g[i] - media_g[j]
+
+    if metodo == "tukey":
+        gl_dentro = float(n_g.sum() - k)
+        mse = float(np.where(n_g > 1, (n_g - 1) * var_g, 0.0).sum() / gl_dentro)
+        ep = np.sqrt(mse / 2 * (1 / n_g[i] + 1 / n_g[j]))
+        gl = np.full(i.size, gl_dentro)
+    elif metodo == "games_howell":
+        a = var_g[i] / n_g[i]
+        b = var_g[j] / n_g[j]
+        ep = np.sqrt((a + b) / 2)
+        gl = (a + b) ** 2 / (a**2 / (n_g[i] - 1) + b**2 / (n_g[j] - 1))
+    else:
+        raise ValueError(f"Método post-hoc não suportado: {metodo}")
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        q = np.abs(dif) / ep
+    p = 1.0 - _amplitude_studentizada_cdf(q, k, gl)
+    q_crit = _amplitude_studentizada_ppf(1 - alpha, k, gl)
+
+    rot = np.asarray(rotulos, dtype=object)
+    tabela = pd.DataFrame(
+        {
+            "teste": metodo,
+            "grupo1": rot[i],
+            "grupo2": rot[j],
+            "n1": n_g[i].astype(int),
+            "n2": n_g[j].astype(int),
+            "mean1": media_g[i],
+            "mean2": media_g[j],
+            "diferenca": dif,
+            "q_stat": q,
+            "gl": gl,
+            "p_value": np.clip(p, 0.0, 1.0),
+            "ic_inf": dif - q_crit * ep,
+            "ic_sup": dif + q_crit * ep,
+            "significativo": p < alpha,
+        }
+    )
+    return _ajustar_tabela(tabela, correcao, ["teste"])
+
+
+def narrativa_posthoc(tabela: pd.DataFrame, alpha: float = 0.05) -> str:
+    if tabela is None or tabela.empty:
+        return "### Comparações post-hoc\nResultado indisponível."
+
+    metodo = "Tukey HSD" if tabela["teste"].iloc[0] == "tukey" else "Games–Howell"
+    col_p = "p_ajustado" if "p_ajustado" in tabela.columns else "p_value"
+    sig = tabela[tabela[col_p] < alpha].sort_values(col_p)
+
+    if sig.empty:
+        conclusao = "Nenhum par de grupos apresenta diferença significativa."
+    else:
+        pares = ", ".join(f"**{a}** vs **{b}**" for a, b in zip(sig["grupo1"].head(5), sig["grupo2"].head(5)))
+        extra = f" (e mais {len(sig) - 5})" if len(sig) > 5 else ""
+        conclusao = f"{len(sig)} de {len(tabela)} pares diferem significativamente: {pares}{extra}."
+
+    return f"""
+### Comparações post-hoc — {metodo}
+{conclusao}
+"""
+
+
+# ============================================================
+# 8) Testes a partir de estatísticas suficientes (dados agregados/streaming)
+# ============================================================
+#
+# Formato das tabelas (uma linha por grupo, índice = rótulo do grupo):
+#   - n, soma, soma_quadrados   → como vem de um GROUP BY em SQL
+#   - n, media, m2              → gerado pelos acumuladores abaixo
+#                                 (m2 = Σ(x − média)², numericamente estável)
+
+def _normalizar_suficientes(tabela: pd.DataFrame) -> tuple[list, np.ndarray, np.ndarray, np.ndarray]:
+    """Converte qualquer um dos formatos em (rótulos, n, média, variância)."""
+    cols = set(tabela.columns)
+    n = tabela["n"].to_numpy(dtype=float)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if {"media", "m2"} <= cols:
+            media = tabela["media"].to_numpy(dtype=float)
+            m2 = tabela["m2"].to_numpy(dtype=float)
+        elif {"soma", "soma_quadrados"} <= cols:
+            soma = tabela["soma"].to_numpy(dtype=float)
+            media = soma / n
+            m2 = np.maximum(tabela["soma_quadrados"].to_numpy(dtype=float) - soma * media, 0.0)
+        else:
+            raise ValueError(
+                "Tabela de estatísticas suficientes precisa das colunas "
+                "(n, soma, soma_quadrados) ou (n, media, m2)."
+            )
+        var = np.where(n > 1, m2 / (n - 1), np.nan)
+
+    return tabela.index.tolist(), n, media, var
+
+
+def estatisticas_por_grupo(
+    df: pd.DataFrame,
+    numerica: str,
+    categoria: str | None = None,
+) -> pd.DataFrame:
+    """
+    Estatísticas suficientes (n, media, m2) de um bloco de dados.
+
+    Sem `categoria`, retorna uma única linha "total" (para o teste t de
+    uma amostra; para o pareado, use a coluna de diferenças).
+    """
+    y = pd.to_numeric(df[numerica], errors="coerce")
+    if categoria is None:
+        grupos = y.groupby(np.zeros(len(y), dtype=int))
+    else:
+        grupos = y.groupby(df[categoria], observed=True, sort=True)
+
+    agg = grupos.agg(["count", "mean", "var"])
+    out = pd.DataFrame(
+        {
+            "n": agg["count"].astype(float),
+            "media": agg["mean"].fillna(0.0),
+            "m2": (agg["var"] * (agg["count"] - 1)).fillna(0.0),
+        }
+    )
+    if categoria is None:
+        out.index = ["total"]
+    return out[out["n"] > 0]
+
+
+def combinar_estatisticas(a: pd.DataFrame, b: pd.DataFrame) -> pd.DataFrame:
+    """
+    Combina duas tabelas (n, media, m2) — fórmula paralela de Chan et al.
+
+    Associativa: blocos processados em paralelo podem ser combinados em
+    qualquer ordem. Grupos presentes em apenas uma das tabelas são mantidos.
+    """
+    idx = a.index.union(b.index, sort=False)
+    a = a.reindex(idx).fillna(0.0)
+    b = b.reindex(idx).fillna(0.0)
+
+    n = a["n"] + b["n"]
+    delta = b["media"] - a["media"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        media = (a["media"] + delta * (b["n"] / n)).where(n > 0, 0.0)
+        m2 = (a["m2"] + b["m2"] + delta**2 * a["n"] * b["n"] / n).where(n > 0, 0.0)
+
+    return pd.DataFrame({"n": n, "media": media, "m2": m2})
+
+
+def acumular_estatisticas(
+    blocos,
+    numerica: str,
+    categoria: str | None = None,
+) -> pd.DataFrame:
+    """
+    Acumula (n, media, m2) por grupo sobre um iterável de DataFrames —
+    por exemplo `pd.read_csv(..., chunksize=...)` ou consultas paginadas.
+
+    Uma única passada; a memória depende só do número de grupos.
+    """
+    acumulado = pd.DataFrame(columns=["n", "media", "m2"], dtype=float)
+    for bloco in blocos:
+        acumulado = combinar_estatisticas(acumulado, estatisticas_por_grupo(bloco, numerica, categoria))
+    return acumulado
+
+
+def teste_t_uma_amostra_suficiente(tabela: pd.DataFrame, mu0: float) -> dict:
+    """Teste t de 1 amostra a partir de uma linha (n, soma, soma_quadrados) ou (n, media, m2)."""
+    _, n, media, var = _normalizar_suficientes(tabela)
+    if n.size != 1:
+        raise ValueError("O teste t de 1 amostra espera exatamente uma linha de estatísticas.")
+
+    n, media, var = float(n[0]), float(media[0]), float(var[0])
+    t_stat, p_value = (np.nan, np.nan)
+    if n >= 2 and var > 0:
+        t_stat = (media - float(mu0)) / np.sqrt(var / n)
+        p_value = float(2.0 * stats.t.sf(abs(t_stat), n - 1))
+
+    return _base_contract(
+        teste="t_test_one_sample",
+        n=int(n),
+        mean=media if n else None,
+        std=float(np.sqrt(var)) if n > 1 else None,
+        t_stat=None if np.isnan(t_stat) else float(t_stat),
+        f_stat=None,
+        p_value=None if np.isnan(p_value) else float(p_value),
+        mu0=float(mu0),
+    )
+
+
+def teste_t_duas_amostras_suficiente(
+    tabela: pd.DataFrame,
+    grupo1=None,
+    grupo2=None,
+) -> dict:
+    """
+    Teste t de Welch a partir das estatísticas suficientes de dois grupos.
+
+    Sem `grupo1`/`grupo2`, usa as duas primeiras linhas da tabela.
+    Mesmo contrato de `teste_t_duas_amostras`.
+    """
+    rotulos, n, media, var = _normalizar_suficientes(tabela)
+    i = 0 if grupo1 is None else rotulos.index(grupo1)
+    j = 1 if grupo2 is None else rotulos.index(grupo2)
+
+    t, _, p = _welch_t_vetorizado(n[i], media[i], var[i], n[j], media[j], var[j])
+    t, p = float(t), float(p)
+
+    n_tot = n[i] + n[j]
+    media_tot = (n[i] * media[i] + n[j] * media[j]) / n_tot if n_tot else np.nan
+    m2_tot = (
+        np.nan_to_num(var[i]) * (n[i] - 1) + np.nan_to_num(var[j]) * (n[j] - 1)
+        + n[i] * n[j] / n_tot * (media[i] - media[j]) ** 2
+    ) if n_tot else np.nan
+
+    return _base_contract(
+        teste="t_test_two_samples",
+        n=int(n_tot),
+        mean=None if not n_tot else float(media_tot),
+        std=float(np.sqrt(m2_tot / (n_tot - 1))) if n_tot > 1 else None,
+        t_stat=None if np.isnan(t) else t,
+        f_stat=None,
+        p_value=None if np.isnan(p) else p,
+        n1=int(n[i]),
+        n2=int(n[j]),
+        mean1=float(media[i]) if n[i] else None,
+        mean2=float(media[j]) if n[j] else None,
+        std1=float(np.sqrt(var[i])) if n[i] > 1 else None,
+        std2=float(np.sqrt(var[j])) if n[j] > 1 else None,
+    )
+
+
+def anova_oneway_suficiente(tabela: pd.DataFrame, welch: bool = False) -> dict:
+    """
+    ANOVA One-Way (ou de Welch) a partir das estatísticas suficientes
+    de todos os grupos. Mesmo contrato de `anova_oneway` / `anova_welch`.
+    """
+    rotulos, n, media, var = _normalizar_suficientes(tabela)
+    if (n > 0).sum() < 2:
+        raise ValueError("ANOVA One-Way exige pelo menos 2 grupos na variável categórica.")
+
+    n_tot = float(n.sum())
+    media_tot = float((n * media).sum() / n_tot)
+    m2_tot = float(
+        (np.where(n > 1, (n - 1) * np.nan_to_num(var), 0.0) + n * (media - media_tot) ** 2).sum()
+    )
+    base = dict(
+        n=int(n_tot),
+        mean=media_tot,
+        std=float(np.sqrt(m2_tot / (n_tot - 1))) if n_tot > 1 else None,
+        t_stat=None,
+    )
+
+    if welch:
+        f, gl_entre, gl_dentro, p = _anova_welch_vetorizada(n, media, var)
+        f, p = float(f), float(p)
+        return _base_contract(
+            teste="anova_welch",
+            **base,
+            f_stat=None if np.isnan(f) else f,
+            p_value=None if np.isnan(p) else p,
+            df_num=float(gl_entre),
+            df_den=float(gl_dentro),
+        )
+
+    f, gl_entre, gl_dentro, p, ss_entre, ss_dentro = _anova_vetorizada(n, media, var)
+    f, p = float(f), float(p)
+    tabela_anova = pd.DataFrame(
+        {
+            "sum_sq": [float(ss_entre), float(ss_dentro)],
+            "df": [float(gl_entre), float(gl_dentro)],
+            "F": [f, np.nan],
+            "PR(>F)": [p, np.nan],
+        },
+        index=["grupo", "Residual"],
+    )
+    return _base_contract(
+        teste="anova_oneway",
+        **base,
+        f_stat=None if np.isnan(f) else f,
+        p_value=None if np.isnan(p) else p,
+        anova_table=tabela_anova,
+    )
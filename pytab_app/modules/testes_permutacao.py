@@ -0,0 +1,344 @@
+"""
+pytab_app.modules.testes_permutacao
+-----------------------------------
+
+Testes de permutação (p-valores exatos por reamostragem) para amostras
+pequenas e/ou não normais, complementando os testes paramétricos de
+`testes_estatisticos`:
+
+- permutacao_duas_amostras(g1, g2): t de Welch com rótulos permutados
+- permutacao_pareado(grupo1, grupo2): t pareado com trocas de sinal
+- permutacao_anova(df, numerica, categoria): F da ANOVA One-Way
+
+Motor:
+- as permutações são geradas em lotes, como matrizes de índices
+  (lote × n), e as estatísticas são calculadas com operações matriciais;
+- os lotes podem ser distribuídos em um pool de processos (`n_workers`);
+- cada lote tem semente própria derivada de `seed`, de modo que o
+  resultado não depende do número de workers;
+- parada antecipada: o processo para quando o p-valor está resolvido em
+  relação a `alpha` (o intervalo de confiança do p-valor estimado não
+  contém `alpha`).
+"""
+
+from __future__ import annotations
+
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from pytab_app.modules.testes_estatisticos import (
+    _base_contract,
+    _fmt_num_user,
+    _fmt_p_user,
+)
+
+
+# Limite de elementos por matriz de lote (controla a memória: ~16 MB em float64)
+_MAX_ELEMENTOS_LOTE = 2_000_000
+
+# z para o intervalo do p-valor na parada antecipada (~99,9%)
+_Z_PARADA = 3.29
+
+
+# ============================================================
+# Estatísticas vetorizadas (uma linha por permutação)
+# ============================================================
+
+def _t_welch_lote(y_perm: np.ndarray, n1: int) -> np.ndarray:
+    """t de Welch para cada linha; as n1 primeiras colunas são o grupo 1."""
+    n2 = y_perm.shape[1] - n1
+    s1 = y_perm[:, :n1].sum(axis=1)
+    q1 = (y_perm[:, :n1] ** 2).sum(axis=1)
+    s2 = y_perm[:, n1:].sum(axis=1)
+    q2 = (y_perm[:, n1:] ** 2).sum(axis=1)
+
+    m1 = s1 / n1
+    m2 = s2 / n2
+    v1 = (q1 - n1 * m1**2) / (n1 - 1)
+    v2 = (q2 - n2 * m2**2) / (n2 - 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (m1 - m2) / np.sqrt(v1 / n1 + v2 / n2)
+
+
+def _t_pareado_lote(sinais: np.ndarray, d: np.ndarray) -> np.ndarray:
+    """t pareado para cada linha de sinais (±1) aplicados às diferenças."""
+    n = d.size
+    media = sinais @ d / n
+    # Σ(±d)² não muda com os sinais
+    var = (np.dot(d, d) - n * media**2) / (n - 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return media / np.sqrt(var / n)
+
+
+def _f_anova_lote(y_perm: np.ndarray, indicadora: np.ndarray, n_g: np.ndarray) -> np.ndarray:
+    """F da ANOVA para cada linha: somas por grupo via produto matricial."""
+    n = y_perm.shape[1]
+    k = n_g.size
+    total = y_perm[0].sum()
+    sst = float(((y_perm[0] - total / n) ** 2).sum())
+
+    somas = y_perm @ indicadora
+    ssb = (somas**2 / n_g).sum(axis=1) - total**2 / n
+    ssw = sst - ssb
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (ssb / (k - 1)) / (ssw / (n - k))
+
+
+# ============================================================
+# Execução em lotes
+# ============================================================
+
+def _executar_lote(tipo: str, dados: dict, tamanho: int, seed_seq) -> int:
+    """
+    Gera `tamanho` permutações e conta quantas estatísticas são pelo menos
+    tão extremas quanto a observada. Função de topo (picklable).
+    """
+    rng = np.random.default_rng(seed_seq)
+    obs = dados["obs"]
+    tol = 1e-12 * max(1.0, abs(obs))
+
+    if tipo == "pareado":
+        d = dados["d"]
+        sinais = rng.choice(np.array([-1.0, 1.0]), size=(tamanho, d.size))
+        stat = _t_pareado_lote(sinais, d)
+    else:
+        y = dados["y"]
+        indices = rng.permuted(np.tile(np.arange(y.size), (tamanho, 1)), axis=1)
+        y_perm = y[indices]
+        if tipo == "duas_amostras":
+            stat = _t_welch_lote(y_perm, dados["n1"])
+        else:
+            stat = _f_anova_lote(y_perm, dados["indicadora"], dados["n_g"])
+
+    if tipo == "anova":
+        return int((stat >= obs - tol).sum())
+    return int((np.abs(stat) >= abs(obs) - tol).sum())
+
+
+def _resolvido(extremos: int, total: int, alpha: float) -> bool:
+    """True se o intervalo do p-valor estimado não contém alpha."""
+    p = (extremos + 1) / (total + 1)
+    ep = np.sqrt(p * (1 - p) / total)
+    return abs(p - alpha) > _Z_PARADA * ep
+
+
+def _motor_permutacao(
+    tipo: str,
+    dados: dict,
+    n: int,
+    n_permutacoes: int,
+    seed: int | None,
+    n_workers: int,
+    lote: int,
+    alpha: float,
+    parar_cedo: bool,
+) -> dict:
+    lote = max(1, min(int(lote), _MAX_ELEMENTOS_LOTE // max(n, 1)))
+    tamanhos = [lote] * (n_permutacoes // lote)
+    if n_permutacoes % lote:
+        tamanhos.append(n_permutacoes % lote)
+    sementes = np.random.SeedSequence(seed).spawn(len(tamanhos))
+
+    extremos = 0
+    total = 0
+    parou = False
+    inicio = time.perf_counter()
+
+    def _acumular(resultados):
+        # processa os lotes em ordem: mesmo resultado para qualquer n_workers
+        nonlocal extremos, total, parou
+        for tamanho, cont in resultados:
+            extremos += cont
+            total += tamanho
+            if parar_cedo and total < n_permutacoes and _resolvido(extremos, total, alpha):
+                parou = True
+                return
+
+    if n_workers <= 1:
+        for tamanho, ss in zip(tamanhos, sementes):
+            _acumular([(tamanho, _executar_lote(tipo, dados, tamanho, ss))])
+            if parou:
+                break
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            for i in range(0, len(tamanhos), n_workers):
+                bloco = list(zip(tamanhos[i:i + n_workers], sementes[i:i + n_workers]))
+                futuros = [pool.submit(_executar_lote, tipo, dados, t, ss) for t, ss in bloco]
+                _acumular([(t, f.result()) for (t, _), f in zip(bloco, futuros)])
+                if parou:
+                    break
+
+    tempo = time.perf_counter() - inicio
+    return {
+        "p_value": (extremos + 1) / (total + 1),
+        "permutacoes": int(total),
+        "extremos": int(extremos),
+        "parou_cedo": bool(parou),
+        "tempo_s": float(tempo),
+        "permutacoes_por_segundo": float(total / tempo) if tempo > 0 else float("inf"),
+        "seed": seed,
+    }
+
+
+# ============================================================
+# API pública
+# ============================================================
+
+def permutacao_duas_amostras(
+    g1: pd.Series,
+    g2: pd.Series,
+    n_permutacoes: int = 10_000,
+    seed: int | None = None,
+    n_workers: int = 1,
+    lote: int = 1_000,
+    alpha: float = 0.05,
+    parar_cedo: bool = True,
+) -> dict:
+    """
+    Teste de permutação para duas amostras independentes.
+
+    Estatística: t de Welch (studentizada, robusta a variâncias desiguais);
+    o t observado coincide com `teste_t_duas_amostras`.
+    """
+    a = pd.to_numeric(g1, errors="coerce").dropna().to_numpy(dtype=float)
+    b = pd.to_numeric(g2, errors="coerce").dropna().to_numpy(dtype=float)
+    n1, n2 = a.size, b.size
+    y = np.concatenate([a, b])
+    n = y.size
+
+    base = dict(
+        teste="permutation_t_two_samples",
+        n=n,
+        mean=float(y.mean()) if n else None,
+        std=float(y.std(ddof=1)) if n > 1 else None,
+        n1=n1,
+        n2=n2,
+        mean1=float(a.mean()) if n1 else None,
+        mean2=float(b.mean()) if n2 else None,
+    )
+
+    if n1 < 2 or n2 < 2:
+        return _base_contract(**base, t_stat=None, p_value=None, permutacoes=0)
+
+    # centralizar não altera o t e evita cancelamento em Σy² − n·ȳ²
+    y_c = y - y.mean()
+    obs = float(_t_welch_lote(y_c[None, :], n1)[0])
+    dados = {"y": y_c, "n1": n1, "obs": obs}
+    res = _motor_permutacao(
+        "duas_amostras", dados, n, n_permutacoes, seed, n_workers, lote, alpha, parar_cedo
+    )
+    return _base_contract(**base, t_stat=obs, **res)
+
+
+def permutacao_pareado(
+    grupo1: pd.Series,
+    grupo2: pd.Series,
+    n_permutacoes: int = 10_000,
+    seed: int | None = None,
+    n_workers: int = 1,
+    lote: int = 1_000,
+    alpha: float = 0.05,
+    parar_cedo: bool = True,
+) -> dict:
+    """
+    Teste de permutação pareado (trocas de sinal das diferenças).
+
+    Considera apenas pares completos; o t observado coincide com
+    `teste_t_pareado`.
+    """
+    pares = pd.concat([grupo1, grupo2], axis=1).apply(pd.to_numeric, errors="coerce").dropna()
+    d = (pares.iloc[:, 0] - pares.iloc[:, 1]).to_numpy(dtype=float)
+    n = d.size
+
+    base = dict(
+        teste="permutation_t_paired",
+        n=n,
+        mean=float(d.mean()) if n else None,
+        std=float(d.std(ddof=1)) if n > 1 else None,
+        diff_mean=float(d.mean()) if n else None,
+    )
+
+    if n < 2:
+        return _base_contract(**base, t_stat=None, p_value=None, permutacoes=0)
+
+    obs = float(_t_pareado_lote(np.ones((1, n)), d)[0])
+    dados = {"d": d, "obs": obs}
+    res = _motor_permutacao(
+        "pareado", dados, n, n_permutacoes, seed, n_workers, lote, alpha, parar_cedo
+    )
+    return _base_contract(**base, t_stat=obs, **res)
+
+
+def permutacao_anova(
+    df: pd.DataFrame,
+    numerica: str,
+    categoria: str,
+    n_permutacoes: int = 10_000,
+    seed: int | None = None,
+    n_workers: int = 1,
+    lote: int = 1_000,
+    alpha: float = 0.05,
+    parar_cedo: bool = True,
+) -> dict:
+    """
+    Teste de permutação para a ANOVA One-Way (rótulos de grupo permutados).
+
+    O F observado coincide com `anova_oneway`.
+    """
+    data = df[[numerica, categoria]].copy()
+    data[numerica] = pd.to_numeric(data[numerica], errors="coerce")
+    data = data.dropna()
+
+    codigos, rotulos = pd.factorize(data[categoria], sort=True)
+    if len(rotulos) < 2:
+        raise ValueError("ANOVA One-Way exige pelo menos 2 grupos na variável categórica.")
+
+    y = data[numerica].to_numpy(dtype=float)
+    n = y.size
+    k = len(rotulos)
+    indicadora = np.zeros((n, k))
+    indicadora[np.arange(n), codigos] = 1.0
+    n_g = indicadora.sum(axis=0)
+
+    base = dict(
+        teste="permutation_anova_oneway",
+        n=n,
+        mean=float(y.mean()) if n else None,
+        std=float(y.std(ddof=1)) if n > 1 else None,
+        value_column=str(numerica),
+        group_column=str(categoria),
+    )
+
+    if n - k < 1:
+        return _base_contract(**base, f_stat=None, p_value=None, permutacoes=0)
+
+    y_c = y - y.mean()
+    obs = float(_f_anova_lote(y_c[None, :], indicadora, n_g)[0])
+    dados = {"y": y_c, "indicadora": indicadora, "n_g": n_g, "obs": obs}
+    res = _motor_permutacao(
+        "anova", dados, n, n_permutacoes, seed, n_workers, lote, alpha, parar_cedo
+    )
+    return _base_contract(**base, f_stat=obs, **res)
+
+
+def narrativa_permutacao(resultado: dict) -> str:
+    p = resultado.get("p_value", None)
+    if p is None or resultado.get("permutacoes", 0) == 0:
+        return "**Teste de permutação:** indisponível (amostra insuficiente)."
+
+    conclusao = (
+        "confirma diferença estatística (p < 0,05)"
+        if p < 0.05
+        else "não indica diferença estatística (p ≥ 0,05)"
+    )
+    parada = " (parada antecipada: p-valor já resolvido)" if resultado.get("parou_cedo") else ""
+    n_perm = f"{resultado['permutacoes']:,}".replace(",", ".")
+
+    return f"""
+**Teste de permutação** — p-valor = **{_fmt_p_user(p)}**, {conclusao}.
+{n_perm} permutações{parada} em {_fmt_num_user(resultado["tempo_s"], 2)} s
+({_fmt_num_user(resultado["permutacoes_por_segundo"], 0)} permutações/s).
+"""
@@ -0,0 +1,294 @@
+"""
+pytab_app.modules.triagem_alvo
+------------------------------
+
+Triagem de variáveis contra um KPI (alvo numérico) para a fase Analisar:
+cada coluna candidata recebe uma medida de associação com o alvo e a
+tabela final é ordenada da associação mais forte para a mais fraca.
+
+Medidas por tipo de coluna:
+- numérica: Pearson (ou Spearman) com o alvo;
+- binária (0/1, booleana ou categórica com 2 níveis): correlação
+  ponto-bisserial (Pearson com a coluna codificada em 0/1);
+- categórica (3+ níveis): η² da ANOVA One-Way do alvo pelos níveis.
+
+A coluna `forca` deixa as medidas na mesma escala 0–1 (|r| ou η = √η²).
+
+Tudo é calculado em lotes de colunas: as correlações saem de produtos
+matriciais mascarados (mesmo núcleo de `correlacoes`) e as ANOVAs de
+`np.bincount` sobre códigos deslocados por coluna — sem laço em Python
+por par coluna × alvo nas partes pesadas.
+"""
+
+from __future__ import annotations
+
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from pytab_app.modules.correlacoes import (
+    _postos_colunas,
+    _r_de_somas,
+    _somas_pareadas,
+    significancia_correlacao,
+)
+from pytab_app.modules.testes_estatisticos import (
+    _anova_vetorizada,
+    _codificar_categorias,
+    _fmt_num_user,
+    _fmt_p_user,
+    ajustar_p_valores,
+)
+
+
+# Elementos (linhas × colunas) por lote: limita a memória intermediária (~32 MB por matriz)
+ELEMENTOS_LOTE = 4_000_000
+
+# Categóricas com mais níveis que isso (ex.: IDs) não são avaliadas
+MAX_NIVEIS = 100
+
+_COLUNAS_SAIDA = [
+    "coluna", "tipo", "medida", "valor", "forca", "n", "p_value", "detalhe",
+]
+
+
+# ============================================================
+# 1) Lotes vetorizados
+# ============================================================
+
+def _lotes(colunas: list, n_linhas: int) -> list[list]:
+    tamanho = int(np.clip(ELEMENTOS_LOTE // max(n_linhas, 1), 1, 1_000))
+    return [colunas[i : i + tamanho] for i in range(0, len(colunas), tamanho)]
+
+
+def _centralizar(X: np.ndarray) -> np.ndarray:
+    with np.errstate(invalid="ignore"):
+        media = np.nanmean(X, axis=0) if X.shape[0] else np.zeros(X.shape[1])
+    return X - np.nan_to_num(media)
+
+
+def _r_contra_alvo(X: np.ndarray, y: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """r de Pearson (pairwise-complete) de cada coluna de X com y; retorna (r, n)."""
+    s = _somas_pareadas(_centralizar(X), _centralizar(y[:, None]))
+    return _r_de_somas(s)[:, 0], np.rint(s["n"][:, 0]).astype(np.int64)
+
+
+def _eta2_contra_alvo(
+    codigos: np.ndarray,
+    niveis: np.ndarray,
+    y: np.ndarray,
+) -> tuple[np.ndarray, ...]:
+    """
+    η², F e p da ANOVA do alvo por cada coluna de códigos (n × C, nulos = -1).
+
+    Os códigos de cada coluna são deslocados para faixas disjuntas
+    (coluna · k_max + código) e as estatísticas por grupo de todas as
+    colunas saem de três `np.bincount`.
+    """
+    n_linhas, c = codigos.shape
+    k_max = int(niveis.max()) if c else 0
+
+    validos = (codigos >= 0) & ~np.isnan(y)[:, None]
+    grupo = (codigos + np.arange(c) * k_max)[validos]
+    yv = np.broadcast_to(y[:, None], codigos.shape)[validos]
+
+    tamanho = c * k_max
+    n = np.bincount(grupo, minlength=tamanho).astype(float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        media = np.bincount(grupo, weights=yv, minlength=tamanho) / n
+        m2 = np.bincount(grupo, weights=(yv - media[grupo]) ** 2, minlength=tamanho)
+        var = np.where(n > 1, m2 / (n - 1), np.nan)
+
+    # _anova_vetorizada espera G × C (uma ANOVA por coluna)
+    forma = (c, k_max)
+    f, _, _, p, ss_entre, ss_dentro = _anova_vetorizada(
+        n.reshape(forma).T, media.reshape(forma).T, var.reshape(forma).T
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        eta2 = np.where(np.isfinite(f), ss_entre / (ss_entre + ss_dentro), np.nan)
+    return eta2, p, n.reshape(forma).sum(axis=1).astype(np.int64)
+
+
+def _linhas_tabela(colunas, tipo, medida, valor, forca, n, p, detalhe) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "coluna": list(colunas),
+            "tipo": tipo,
+            "medida": medida,
+            "valor": np.asarray(valor, dtype=float),
+            "forca": np.asarray(forca, dtype=float),
+            "n": np.asarray(n, dtype=np.int64),
+            "p_value": np.asarray(p, dtype=float),
+            "detalhe": list(detalhe),
+        }
+    )
+
+
+def _classificar_colunas(df: pd.DataFrame, colunas: list) -> tuple[list, list, list]:
+    """Separa as candidatas em (numéricas, binárias numéricas/booleanas, categóricas)."""
+    numericas, binarias, categoricas = [], [], []
+    for col in colunas:
+        serie = df[col]
+        if pd.api.types.is_bool_dtype(serie):
+            binarias.append(col)
+        elif pd.api.types.is_numeric_dtype(serie):
+            numericas.append(col)
+        else:
+            categoricas.append(col)
+
+    # numéricas com exatamente dois valores distintos são flags (teste vetorizado por lote)
+    reais = []
+    for lote in _lotes(numericas, len(df)):
+        X = df[lote].to_numpy(dtype=float, na_value=np.nan)
+        with np.errstate(invalid="ignore"), warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            minimo = np.nanmin(X, axis=0)
+            maximo = np.nanmax(X, axis=0)
+        dois_valores = (minimo < maximo) & ((X == minimo) | (X == maximo) | np.isnan(X)).all(axis=0)
+        for col, flag in zip(lote, dois_valores):
+            (binarias if flag else reais).append(col)
+    return reais, binarias, categoricas
+
+
+# ============================================================
+# 2) Triagem
+# ============================================================
+
+def triagem_alvo(
+    df: pd.DataFrame,
+    alvo: str,
+    colunas: list | None = None,
+    metodo: str = "pearson",
+    correcao: str | None = "bh",
+    max_niveis: int = MAX_NIVEIS,
+) -> pd.DataFrame:
+    """
+    Ordena as colunas candidatas pela força de associação com `alvo`.
+
+    metodo:
+        "pearson" ou "spearman" (colunas numéricas).
+    correcao:
+        correção de p-valores para múltiplos testes ("bh", "holm",
+        "bonferroni" ou None). Com milhares de candidatas, o p-valor bruto
+        sozinho gera muitos falsos positivos.
+    max_niveis:
+        categóricas com mais níveis são ignoradas (ex.: identificadores).
+
+    Retorna DataFrame com:
+        coluna, tipo, medida, valor, forca, n, p_value, [p_ajustado], detalhe
+    """
+    if metodo not in ("pearson", "spearman"):
+        raise ValueError("metodo deve ser 'pearson' ou 'spearman'.")
+    if alvo not in df.columns:
+        raise ValueError(f"Coluna alvo '{alvo}' não existe no DataFrame.")
+    if not pd.api.types.is_numeric_dtype(df[alvo]) or pd.api.types.is_bool_dtype(df[alvo]):
+        raise ValueError("O alvo (KPI) precisa ser uma variável numérica.")
+
+    if colunas is None:
+        colunas = [c for c in df.columns if c != alvo]
+    else:
+        colunas = [c for c in colunas if c != alvo]
+
+    y = df[alvo].to_numpy(dtype=float, na_value=np.nan)
+    numericas, binarias, categoricas = _classificar_colunas(df, colunas)
+    partes = []
+
+    # ---- numéricas: Pearson / Spearman ----
+    y_num = _postos_colunas(y[:, None])[:, 0] if metodo == "spearman" else y
+    for lote in _lotes(numericas, len(df)):
+        X = df[lote].to_numpy(dtype=float, na_value=np.nan)
+        if metodo == "spearman":
+            X = _postos_colunas(X)
+        r, n = _r_contra_alvo(X, y_num)
+        p = significancia_correlacao(r, n, metodo)["p_value"]
+        partes.append(_linhas_tabela(lote, "numérica", metodo, r, np.abs(r), n, p, [""] * len(lote)))
+
+    # ---- categóricas: 2 níveis viram flags; 3+ níveis, η² ----
+    codigos_multi, niveis_multi, nomes_multi = [], [], []
+    flags = {}
+    for col in binarias:
+        serie = df[col]
+        if pd.api.types.is_bool_dtype(serie):
+            flags[col] = (serie.astype("float").to_numpy(na_value=np.nan), f"{col} = True vs False")
+        else:
+            x = serie.to_numpy(dtype=float, na_value=np.nan)
+            alto, baixo = np.nanmax(x), np.nanmin(x)
+            flags[col] = (np.where(np.isnan(x), np.nan, (x == alto).astype(float)),
+                          f"{_fmt_num_user(alto)} vs {_fmt_num_user(baixo)}")
+    for col in categoricas:
+        codigos, k = _codificar_categorias(df[col])
+        if k == 2:
+            serie = df[col]
+            niveis = serie.cat.categories if isinstance(serie.dtype, pd.CategoricalDtype) else pd.factorize(serie)[1]
+            rotulo = f"{niveis[1]} vs {niveis[0]}"
+            flags[col] = (np.where(codigos < 0, np.nan, codigos.astype(float)), rotulo)
+        elif 3 <= k <= max_niveis:
+            codigos_multi.append(codigos)
+            niveis_multi.append(k)
+            nomes_multi.append(col)
+
+    # ---- binárias: ponto-bisserial ----
+    for lote in _lotes(list(flags), len(df)):
+        X = np.column_stack([flags[c][0] for c in lote])
+        r, n = _r_contra_alvo(X, y)
+        p = significancia_correlacao(r, n, "pearson")["p_value"]
+        partes.append(
+            _linhas_tabela(lote, "binária", "ponto-bisserial", r, np.abs(r), n, p, [flags[c][1] for c in lote])
+        )
+
+    # ---- categóricas 3+ níveis: η² (lotes com número de níveis parecido) ----
+    ordem = np.argsort(niveis_multi, kind="stable").tolist()
+    for idx in _lotes(ordem, len(df)):
+        codigos = np.column_stack([codigos_multi[j] for j in idx])
+        niveis = np.asarray([niveis_multi[j] for j in idx])
+        eta2, p, n = _eta2_contra_alvo(codigos, niveis, y)
+        partes.append(
+            _linhas_tabela(
+                [nomes_multi[j] for j in idx], "categórica", "eta²", eta2, np.sqrt(eta2), n, p,
+                [f"{k} níveis" for k in niveis],
+            )
+        )
+
+    if not partes:
+        return pd.DataFrame(columns=_COLUNAS_SAIDA)
+
+    tabela = pd.concat(partes, ignore_index=True)
+    if correcao is not None:
+        tabela.insert(tabela.columns.get_loc("p_value") + 1, "p_ajustado", ajustar_p_valores(tabela["p_value"], correcao))
+
+    return tabela.sort_values(["forca", "coluna"], ascending=[False, True], na_position="last").reset_index(drop=True)
+
+
+# ============================================================
+# 3) Narrativa
+# ============================================================
+
+def narrativa_triagem(tabela: pd.DataFrame, alvo: str, top: int = 3, alpha: float = 0.05) -> str:
+    if tabela.empty:
+        return f"Não há colunas candidatas para avaliar contra **{alvo}**."
+
+    coluna_p = "p_ajustado" if "p_ajustado" in tabela.columns else "p_value"
+    sig = tabela[tabela[coluna_p] < alpha]
+    if sig.empty:
+        return (
+            f"Nenhuma das {len(tabela)} variáveis avaliadas apresentou associação "
+            f"estatisticamente significativa com **{alvo}** (α = {_fmt_num_user(alpha, 2)})."
+        )
+
+    itens = []
+    for _, linha in sig.head(top).iterrows():
+        if linha["medida"] == "eta²":
+            desc = f"η² = {_fmt_num_user(linha['valor'])}"
+        else:
+            desc = f"r = {_fmt_num_user(linha['valor'])}"
+        itens.append(f"**{linha['coluna']}** ({desc}, p = {_fmt_p_user(linha[coluna_p])})")
+
+    return f"""
+**Triagem contra {alvo}:** {len(sig)} de {len(tabela)} variáveis têm associação significativa
+{"(p-valores ajustados para múltiplos testes)" if coluna_p == "p_ajustado" else ""}.
+As mais fortes são: {"; ".join(itens)}.
+
+Associação não implica causa: use este ranking para priorizar hipóteses a confirmar
+com testes, regressão ou experimentos.
+"""
@@ -0,0 +1,675 @@
+"""
+Benchmarks dos motores estatísticos do PyTab.
+
+Cada benchmark compara o motor atual com a implementação de referência
+(a abordagem anterior ou a biblioteca usual), confere que os resultados
+coincidem e imprime os tempos. Uso:
+
+    python validation/benchmarks.py            # todos
+    python validation/benchmarks.py anova      # apenas os que contêm "anova"
+"""
+
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+
+# ================================
+# CONFIG
+# ================================
+
+SEED = 42
+REPEAT = 3
+
+
+# ================================
+# HELPERS
+# ================================
+
+def _timeit(fn: Callable, repeat: int = REPEAT) -> float:
+    """Melhor tempo (s) entre `repeat` execuções."""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def _report(nome: str, t_ref: float, t_novo: float, detalhe: str = "") -> None:
+    speedup = t_ref / t_novo if t_novo > 0 else float("inf")
+    print(
+        f"{nome:<40} referência={t_ref * 1000:10.1f} ms   "
+        f"pytab={t_novo * 1000:10.1f} ms   speedup={speedup:7.1f}x   {detalhe}"
+    )
+
+
+# ================================
+# BENCHMARKS
+# ================================
+
+def bench_anova_oneway() -> None:
+    """ANOVA por somas de quadrados vs OLS com fórmula (statsmodels)."""
+    import statsmodels.api as sm
+    import statsmodels.formula.api as smf
+
+    from pytab_app.modules.testes_estatisticos import anova_oneway
+
+    rng = np.random.default_rng(SEED)
+
+    for n, k in [(10_000, 5), (200_000, 20), (100_000, 200)]:
+        df = pd.DataFrame({
+            "y": rng.normal(size=n),
+            "g": rng.integers(0, k, size=n).astype(str),
+        })
+
+        def ref():
+            modelo = smf.ols("y ~ C(g)", data=df).fit()
+            return sm.stats.anova_lm(modelo, typ=2)
+
+        tabela = ref()
+        res = anova_oneway(df, "y", "g")
+        assert np.isclose(res["f_stat"], tabela["F"].iloc[0], rtol=1e-6)
+        assert np.isclose(res["p_value"], tabela["PR(>F)"].iloc[0], rtol=1e-3, atol=1e-6)
+
+        _report(
+            f"anova_oneway n={n:,} grupos={k}",
+            _timeit(ref, repeat=1),
+            _timeit(lambda: anova_oneway(df, "y", "g")),
+        )
+
+
+def bench_poder_amostral() -> None:
+    """Curva de poder vetorizada vs uma chamada do statsmodels por ponto."""
+    from statsmodels.stats.power import TTestIndPower
+
+    from pytab_app.modules.poder_amostral import grade_poder, tamanho_amostral
+
+    n = np.arange(2, 502)
+    efeitos = [0.2, 0.5, 0.8]
+    ref_power = TTestIndPower()
+
+    def ref():
+        return [ref_power.power(e, ni, 0.05) for e in efeitos for ni in n]
+
+    grade = grade_poder("duas_amostras", n=n, efeito=efeitos)
+    esperado = np.asarray(ref()).reshape(len(efeitos), len(n)).T.ravel()
+    # o statsmodels retorna NaN quando o poder é ~1 (nct.cdf); o PyTab não
+    ok = np.isfinite(esperado)
+    assert np.isfinite(grade["poder"]).all()
+    assert np.allclose(grade["poder"].to_numpy()[ok], esperado[ok], rtol=1e-8)
+
+    _report(
+        f"curva de poder t ({len(n) * len(efeitos)} pontos)",
+        _timeit(ref, repeat=1),
+        _timeit(lambda: grade_poder("duas_amostras", n=n, efeito=efeitos)),
+    )
+
+    efeitos = np.linspace(0.1, 1.0, 50)
+
+    def ref_n():
+        return [np.ceil(ref_power.solve_power(e, power=0.8, alpha=0.05)) for e in efeitos]
+
+    assert np.array_equal(tamanho_amostral("duas_amostras", efeito=efeitos), ref_n())
+    _report(
+        f"tamanho amostral t ({len(efeitos)} efeitos)",
+        _timeit(ref_n, repeat=1),
+        _timeit(lambda: tamanho_amostral("duas_amostras", efeito=efeitos)),
+    )
+
+
+def bench_correlacao_pearson() -> None:
+    """Pearson pairwise-complete por produtos mascarados vs DataFrame.corr()."""
+    from pytab_app.modules.correlacoes import matriz_correlacao
+
+    rng = np.random.default_rng(SEED)
+
+    for n, p, frac_nan, precisao, bloco in [
+        (100_000, 50, 0.0, "float64", None),
+        (100_000, 50, 0.05, "float64", None),
+        (20_000, 500, 0.05, "float64", None),
+        (20_000, 500, 0.05, "float32", None),
+        (5_000, 2_000, 0.01, "float32", 500),
+    ]:
+        X = rng.normal(size=(n, p))
+        X[rng.random((n, p)) < frac_nan] = np.nan
+        df = pd.DataFrame(X, columns=[f"c{i}" for i in range(p)])
+
+        t0 = time.perf_counter()
+        ref = df.corr().to_numpy()
+        t_ref = time.perf_counter() - t0
+        res = matriz_correlacao(df, precisao=precisao, bloco=bloco).to_numpy()
+        tol = 1e-10 if precisao == "float64" else 1e-4
+        assert np.allclose(res, ref, atol=tol, equal_nan=True)
+
+        _report(
+            f"pearson n={n:,} p={p} nan={frac_nan:.0%} {precisao}" + (f" bloco={bloco}" if bloco else ""),
+            t_ref,
+            _timeit(lambda: matriz_correlacao(df, precisao=precisao, bloco=bloco), repeat=1),
+        )
+
+
+def bench_correlacao_postos() -> None:
+    """Spearman (postos uma vez + núcleo de Pearson) e Kendall vs DataFrame.corr()."""
+    from pytab_app.modules.correlacoes import matriz_correlacao
+
+    rng = np.random.default_rng(SEED)
+
+    for metodo, n, p in [("spearman", 100_000, 50), ("spearman", 20_000, 300), ("kendall", 100_000, 10)]:
+        X = rng.normal(size=(n, p))
+        X[:, 1::2] = np.exp(X[:, ::2][:, : X[:, 1::2].shape[1]]) + rng.normal(size=(n, p // 2))
+        df = pd.DataFrame(np.round(X, 2), columns=[f"c{i}" for i in range(p)])
+
+        t0 = time.perf_counter()
+        ref = df.corr(method=metodo).to_numpy()
+        t_ref = time.perf_counter() - t0
+        assert np.allclose(matriz_correlacao(df, metodo=metodo).to_numpy(), ref, atol=1e-10, equal_nan=True)
+
+        _report(
+            f"{metodo} n={n:,} p={p}",
+            t_ref,
+            _timeit(lambda: matriz_correlacao(df, metodo=metodo), repeat=1),
+        )
+
+
+def bench_correlacao_topk() -> None:
+    """Top-k pares por blocos + heap vs matriz densa do pandas + unstack."""
+    from pytab_app.modules.correlacoes import maiores_correlacoes
+
+    rng = np.random.default_rng(SEED)
+    n, p, k = 5_000, 1_500, 20
+    X = rng.normal(size=(n, p))
+    X[:, 1::10] += X[:, ::10]
+    df = pd.DataFrame(X, columns=[f"c{i}" for i in range(p)])
+
+    def ref():
+        corr = df.corr()
+        corr_abs = corr.abs().where(np.triu(np.ones(corr.shape, dtype=bool), k=1))
+        return corr_abs.unstack().dropna().nlargest(k)
+
+    t0 = time.perf_counter()
+    esperado = ref()
+    t_ref = time.perf_counter() - t0
+    top = maiores_correlacoes(df, k=k)
+    assert np.allclose(top["abs_r"].to_numpy(), esperado.to_numpy(), atol=1e-10)
+
+    _report(
+        f"top-{k} pares n={n:,} p={p:,}",
+        t_ref,
+        _timeit(lambda: maiores_correlacoes(df, k=k), repeat=1),
+    )
+
+
+def bench_correlacao_blocos() -> None:
+    """Acumulador de co-momentos por blocos vs concatenar os blocos + DataFrame.corr()."""
+    from pytab_app.modules.correlacoes import acumular_comomentos, correlacao_de_comomentos
+
+    rng = np.random.default_rng(SEED)
+    n, p, tamanho = 200_000, 60, 10_000
+    X = rng.normal(size=(n, p))
+    X[rng.random((n, p)) < 0.05] = np.nan
+    df = pd.DataFrame(X, columns=[f"c{i}" for i in range(p)])
+    blocos = [df.iloc[i : i + tamanho] for i in range(0, n, tamanho)]
+
+    def ref():
+        return pd.concat(blocos).corr()
+
+    def novo():
+        return correlacao_de_comomentos(acumular_comomentos(blocos))
+
+    t0 = time.perf_counter()
+    esperado = ref()
+    t_ref = time.perf_counter() - t0
+    assert np.allclose(novo().to_numpy(), esperado.to_numpy(), atol=1e-10, equal_nan=True)
+
+    _report(f"pearson em {len(blocos)} blocos n={n:,} p={p}", t_ref, _timeit(novo, repeat=1))
+
+    # atualização ao vivo: um bloco novo sobre o acumulado vs recalcular tudo
+    acumulado = acumular_comomentos(blocos[:-1])
+    t0 = time.perf_counter()
+    ref()
+    t_ref = time.perf_counter() - t0
+    _report(
+        f"atualização com 1 bloco de {tamanho:,} linhas",
+        t_ref,
+        _timeit(lambda: correlacao_de_comomentos(acumular_comomentos(blocos[-1:], acumulado=acumulado))),
+    )
+
+
+def bench_correlacao_parcial() -> None:
+    """Parcial por uma inversão da matriz vs resíduos de regressão por par."""
+    from pytab_app.modules.correlacoes import correlacao_parcial, matriz_correlacao
+
+    rng = np.random.default_rng(SEED)
+    n, p = 5_000, 30
+    X = rng.normal(size=(n, p))
+    X[:, 1:] += X[:, :1]
+    df = pd.DataFrame(X, columns=[f"c{i}" for i in range(p)])
+
+    def ref():
+        out = np.eye(p)
+        for i in range(p):
+            for j in range(i + 1, p):
+                Z = np.column_stack([np.ones(n), np.delete(X, [i, j], axis=1)])
+                beta = np.linalg.lstsq(Z, X[:, [i, j]], rcond=None)[0]
+                res = X[:, [i, j]] - Z @ beta
+                out[i, j] = out[j, i] = np.corrcoef(res.T)[0, 1]
+        return out
+
+    t0 = time.perf_counter()
+    esperado = ref()
+    t_ref = time.perf_counter() - t0
+    assert np.allclose(correlacao_parcial(matriz_correlacao(df)).to_numpy(), esperado, atol=1e-10)
+
+    _report(
+        f"correlação parcial n={n:,} p={p}",
+        t_ref,
+        _timeit(lambda: correlacao_parcial(matriz_correlacao(df))),
+    )
+
+
+def bench_pareto_alta_cardinalidade() -> None:
+    """Pareto por códigos + seleção parcial vs groupby em object + ordenação completa."""
+    from pytab_app.modules.pareto import calcular_pareto
+
+    rng = np.random.default_rng(SEED)
+    n, k, top_n = 2_000_000, 50_000, 20
+    pecas = np.array([f"PN-{i:06d}" for i in range(k)], dtype=object)
+    df = pd.DataFrame({
+        "peca": pecas[rng.zipf(1.3, n) % k],
+        "custo": rng.gamma(2.0, 50.0, n),
+    })
+
+    def ref():
+        serie = df[["peca", "custo"]].dropna().groupby("peca")["custo"].sum().sort_values(ascending=False)
+        cum = serie / serie.sum() * 100.0
+        return serie, cum.cumsum()
+
+    t0 = time.perf_counter()
+    serie, cum = ref()
+    t_ref = time.perf_counter() - t0
+    res = calcular_pareto(df, "peca", "custo", top_n=top_n)
+    tabela = res["tabela"]
+    assert np.allclose(tabela["valor"].to_numpy()[:top_n], serie.to_numpy()[:top_n])
+    assert np.allclose(tabela["percentual_acumulado"].to_numpy()[:top_n], cum.to_numpy()[:top_n])
+    assert res["n_vitais"] == max(int((cum <= 80).sum()), 1)
+    assert res["n_categorias"] == len(serie) and len(tabela) == top_n + 1
+
+    _report(
+        f"pareto n={n:,} categorias={len(serie):,}",
+        t_ref,
+        _timeit(lambda: calcular_pareto(df, "peca", "custo", top_n=top_n)),
+        "(barras: todas -> top-N + Outros)",
+    )
+
+    df["peca"] = df["peca"].astype("category")
+    _report(
+        "pareto com dimensão category",
+        _timeit(ref, repeat=1),
+        _timeit(lambda: calcular_pareto(df, "peca", "custo", top_n=top_n)),
+    )
+
+
+def bench_pareto_cubo() -> None:
+    """Drill-down por consultas ao cubo vs um groupby filtrado por clique."""
+    from pytab_app.modules.pareto import cubo_pareto, pareto_do_cubo
+
+    rng = np.random.default_rng(SEED)
+    n = 1_000_000
+    df = pd.DataFrame({
+        "defeito": rng.choice([f"D{i:02d}" for i in range(40)], n),
+        "maquina": rng.choice([f"M{i:02d}" for i in range(60)], n),
+        "turno": rng.choice(["A", "B", "C"], n),
+        "custo": rng.gamma(2.0, 10.0, n),
+    })
+    dims = ["defeito", "maquina", "turno"]
+    cliques = [
+        {"defeito": f"D{i % 40:02d}", "maquina": f"M{(7 * i) % 60:02d}"} for i in range(50)
+    ]
+
+    def ref():
+        out = []
+        for filtros in cliques:
+            dados = df
+            for d, v in filtros.items():
+                dados = dados[dados[d] == v]
+            out.append(dados.groupby("turno")["custo"].sum().sort_values(ascending=False))
+        return out
+
+    cubo = cubo_pareto(df, dims, "custo")
+
+    def novo():
+        return [pareto_do_cubo(cubo, "turno", filtros) for filtros in cliques]
+
+    t0 = time.perf_counter()
+    esperado = ref()
+    t_ref = time.perf_counter() - t0
+    for a, b in zip(esperado, novo()):
+        assert np.allclose(a.to_numpy(), b["tabela"]["valor"].to_numpy())
+
+    _report(f"drill-down {len(cliques)} cliques n={n:,}", t_ref, _timeit(novo))
+    _report(
+        "construção do cubo (3 níveis)",
+        _timeit(lambda: [df.groupby(dims[: i + 1])["custo"].sum() for i in range(3)], repeat=1),
+        _timeit(lambda: cubo_pareto(df, dims, "custo"), repeat=1),
+        "(referência: um groupby por nível)",
+    )
+
+
+def bench_pareto_tendencia() -> None:
+    """Totais por (período, categoria) num groupby vs um Pareto por período."""
+    from pytab_app.modules.pareto import tendencia_pareto
+
+    rng = np.random.default_rng(SEED)
+    n = 1_000_000
+    df = pd.DataFrame({
+        "data": rng.choice(pd.date_range("2021-01-01", "2025-12-31", freq="h"), n),
+        "defeito": rng.choice([f"D{i:03d}" for i in range(300)], n),
+        "custo": rng.gamma(2.0, 10.0, n),
+    })
+
+    def ref():
+        out = {}
+        dados = df.set_index("data").sort_index()
+        for inicio in pd.date_range("2021-01-01", "2025-12-01", freq="MS"):
+            mes = dados.loc[inicio : inicio + pd.offsets.MonthEnd(0) + pd.Timedelta(hours=23)]
+            serie = mes.groupby("defeito")["custo"].sum().sort_values(ascending=False)
+            out[inicio] = (serie / serie.sum() * 100.0, serie.rank(ascending=False, method="min"))
+        return out
+
+    t0 = time.perf_counter()
+    esperado = ref()
+    t_ref = time.perf_counter() - t0
+    res = tendencia_pareto(df, "data", "defeito", "custo", "Mensal", top_n=5)
+    for _, linha in res["serie"].sample(50, random_state=SEED).iterrows():
+        participacao, posicao = esperado[linha["periodo"]]
+        assert np.isclose(participacao[linha["categoria"]], linha["participacao"])
+        assert posicao[linha["categoria"]] == linha["posicao"]
+
+    _report(
+        f"tendência do pareto n={n:,} 60 meses",
+        t_ref,
+        _timeit(lambda: tendencia_pareto(df, "data", "defeito", "custo", "Mensal", top_n=5)),
+    )
+
+
+def bench_pareto_contagem() -> None:
+    """Pareto de contagem por bincount vs groupby().size() + ordenação."""
+    from pytab_app.modules.pareto import calcular_pareto
+
+    rng = np.random.default_rng(SEED)
+    n, k = 20_000_000, 500
+    rotulos = np.array([f"DEF-{i:03d}" for i in range(k)], dtype=object)
+    codigos = rng.zipf(1.4, n) % k
+    df = pd.DataFrame({"defeito": pd.Categorical.from_codes(codigos, rotulos), "codigo": codigos})
+    severidade = {rotulo: float(1 + i % 5) for i, rotulo in enumerate(rotulos)}
+
+    for coluna in ["defeito", "codigo"]:
+        def ref():
+            contagem = df.groupby(coluna, observed=True).size().sort_values(ascending=False)
+            return contagem, (contagem / contagem.sum() * 100.0).cumsum()
+
+        t0 = time.perf_counter()
+        contagem, cum = ref()
+        t_ref = time.perf_counter() - t0
+        res = calcular_pareto(df, coluna, top_n=20)
+        assert np.array_equal(res["tabela"]["valor"].to_numpy()[:20], contagem.to_numpy()[:20])
+        assert res["n_vitais"] == max(int((cum <= 80).sum()), 1)
+
+        _report(
+            f"pareto contagem n={n:,} ({df[coluna].dtype})",
+            t_ref,
+            _timeit(lambda: calcular_pareto(df, coluna, top_n=20)),
+        )
+
+    def ref_ponderada():
+        contagem = df.groupby("defeito", observed=True).size()
+        return (contagem * contagem.index.map(severidade).astype(float)).sort_values(ascending=False)
+
+    t0 = time.perf_counter()
+    esperado = ref_ponderada()
+    t_ref = time.perf_counter() - t0
+    res = calcular_pareto(df, "defeito", top_n=20, pesos=severidade)
+    assert np.allclose(res["tabela"]["valor"].to_numpy()[:20], esperado.to_numpy()[:20])
+
+    _report(
+        f"pareto contagem ponderada n={n:,}",
+        t_ref,
+        _timeit(lambda: calcular_pareto(df, "defeito", top_n=20, pesos=severidade)),
+    )
+
+
+def bench_regressao_multipla() -> None:
+    """OLS por QR em blocos (dummies esparsas) vs statsmodels OLS com fórmula/pinv."""
+    import statsmodels.api as sm
+    import statsmodels.formula.api as smf
+
+    from pytab_app.modules.regressao import regressao_multipla
+
+    rng = np.random.default_rng(SEED)
+
+    n, p = 1_000_000, 50
+    X = rng.normal(size=(n, p))
+    nomes = [f"x{i}" for i in range(p)]
+    df = pd.DataFrame(X, columns=nomes)
+    df["y"] = X @ rng.normal(size=p) + rng.normal(size=n)
+
+    t0 = time.perf_counter()
+    ref = sm.OLS(df["y"], sm.add_constant(df[nomes])).fit()
+    ref_bse = ref.bse
+    t_ref = time.perf_counter() - t0
+    res = regressao_multipla(df, "y", nomes)
+    assert np.allclose(res["coeficientes"]["coef"].to_numpy(), ref.params.to_numpy(), rtol=1e-8, atol=1e-10)
+    assert np.allclose(res["coeficientes"]["erro_padrao"].to_numpy(), ref_bse.to_numpy(), rtol=1e-8)
+    assert np.isclose(res["r2_ajustado"], ref.rsquared_adj)
+
+    _report(f"ols n={n:,} p={p}", t_ref, _timeit(lambda: regressao_multipla(df, "y", nomes), repeat=1))
+
+    n = 200_000
+    df = pd.DataFrame({
+        "x1": rng.normal(size=n),
+        "x2": rng.normal(size=n),
+        "maquina": rng.choice([f"M{i:02d}" for i in range(60)], n),
+        "turno": rng.choice(["A", "B", "C"], n),
+    })
+    df["y"] = 2.0 * df["x1"] - df["x2"] + df["maquina"].str[1:].astype(int) / 10.0 + rng.normal(size=n)
+
+    t0 = time.perf_counter()
+    ref = smf.ols("y ~ x1 + x2 + C(maquina) + C(turno)", data=df).fit()
+    ref_bse = ref.bse
+    t_ref = time.perf_counter() - t0
+    res = regressao_multipla(df, "y", ["x1", "x2", "maquina", "turno"])
+    assert np.isclose(res["coeficientes"].loc["x1", "coef"], ref.params["x1"], rtol=1e-8)
+    assert np.isclose(res["coeficientes"].loc["maquina[M07]", "erro_padrao"], ref_bse["C(maquina)[T.M07]"], rtol=1e-8)
+    assert np.isclose(res["f_stat"], ref.fvalue, rtol=1e-8)
+
+    _report(
+        f"ols com dummies n={n:,} p={len(ref.params)}",
+        t_ref,
+        _timeit(lambda: regressao_multipla(df, "y", ["x1", "x2", "maquina", "turno"]), repeat=1),
+    )
+
+
+def bench_regressao_logistica() -> None:
+    """Logística por IRLS em blocos vs statsmodels Logit (Newton com X denso)."""
+    import statsmodels.formula.api as smf
+
+    from pytab_app.modules.regressao import regressao_logistica
+
+    rng = np.random.default_rng(SEED)
+
+    n, p = 500_000, 20
+    X = rng.normal(size=(n, p))
+    nomes = [f"x{i}" for i in range(p)]
+    df = pd.DataFrame(X, columns=nomes)
+    df["maquina"] = rng.choice([f"M{i:02d}" for i in range(30)], n)
+    eta = X @ rng.normal(scale=0.3, size=p) + df["maquina"].str[1:].astype(int).to_numpy() / 30.0 - 0.5
+    df["status"] = np.where(rng.random(n) < 1.0 / (1.0 + np.exp(-eta)), "aprovado", "reprovado")
+    df["y"] = (df["status"] == "aprovado").astype(int)
+    formula = "y ~ " + " + ".join(nomes) + " + C(maquina)"
+
+    t0 = time.perf_counter()
+    ref = smf.logit(formula, data=df).fit(disp=0)
+    ref_bse = ref.bse
+    t_ref = time.perf_counter() - t0
+    res = regressao_logistica(df, "status", nomes + ["maquina"], sucesso="aprovado")
+    assert np.isclose(res["coeficientes"].loc["x0", "coef"], ref.params["x0"], rtol=1e-6)
+    assert np.isclose(res["coeficientes"].loc["maquina[M07]", "erro_padrao"], ref_bse["C(maquina)[T.M07]"], rtol=1e-6)
+    assert np.isclose(res["deviance"], -2.0 * ref.llf, rtol=1e-9)
+    assert np.isclose(res["pseudo_r2"], ref.prsquared, rtol=1e-6)
+
+    _report(
+        f"logit n={n:,} p={len(ref.params)}",
+        t_ref,
+        _timeit(lambda: regressao_logistica(df, "status", nomes + ["maquina"], sucesso="aprovado"), repeat=1),
+    )
+
+
+def bench_regressao_incremental() -> None:
+    """OLS acumulado bloco a bloco (R combinável) vs concatenar os blocos + statsmodels OLS."""
+    import statsmodels.formula.api as smf
+
+    from pytab_app.modules.regressao import acumular_mmq, regressao_de_mmq
+
+    rng = np.random.default_rng(SEED)
+
+    n, p, linhas_bloco = 1_000_000, 20, 100_000
+    nomes = [f"x{i}" for i in range(p)]
+    blocos = []
+    for _ in range(n // linhas_bloco):
+        X = rng.normal(size=(linhas_bloco, p))
+        b = pd.DataFrame(X, columns=nomes)
+        b["turno"] = rng.choice(["A", "B", "C"], linhas_bloco)
+        b["y"] = X.sum(axis=1) + (b["turno"] == "B") + rng.normal(size=linhas_bloco)
+        blocos.append(b)
+    preditoras = nomes + ["turno"]
+
+    t0 = time.perf_counter()
+    ref = smf.ols("y ~ " + " + ".join(preditoras), data=pd.concat(blocos, ignore_index=True)).fit()
+    ref_bse = ref.bse
+    t_ref = time.perf_counter() - t0
+    res = regressao_de_mmq(acumular_mmq(blocos, "y", preditoras))
+    assert np.isclose(res["coeficientes"].loc["x3", "coef"], ref.params["x3"], rtol=1e-8)
+    assert np.isclose(res["coeficientes"].loc["turno[B]", "erro_padrao"], ref_bse["turno[T.B]"], rtol=1e-8)
+    assert np.isclose(res["r2"], ref.rsquared, rtol=1e-10)
+
+    _report(
+        f"ols em {len(blocos)} blocos n={n:,} p={len(ref.params)}",
+        t_ref,
+        _timeit(lambda: regressao_de_mmq(acumular_mmq(blocos, "y", preditoras)), repeat=1),
+    )
+
+
+def bench_regressao_diagnosticos() -> None:
+    """
+    Alavancagem/Cook/studentizados a partir do R do ajuste vs statsmodels
+    OLSInfluence (hat via pinv(X); o studentizado externo do statsmodels
+    reajusta sem cada linha, então a referência usa o interno + fórmula fechada).
+    """
+    import statsmodels.api as sm
+
+    from pytab_app.modules.regressao import diagnosticos_regressao, regressao_multipla
+
+    rng = np.random.default_rng(SEED)
+
+    n, p = 500_000, 30
+    X = rng.normal(size=(n, p))
+    nomes = [f"x{i}" for i in range(p)]
+    df = pd.DataFrame(X, columns=nomes)
+    df["y"] = X @ rng.normal(size=p) + rng.standard_t(3, size=n)
+    res = regressao_multipla(df, "y", nomes)
+
+    t0 = time.perf_counter()
+    infl = sm.OLS(df["y"], sm.add_constant(df[nomes])).fit().get_influence()
+    ref_h = infl.hat_matrix_diag
+    ref_cook = infl.cooks_distance[0]
+    r = infl.resid_studentized
+    gl = n - p - 1
+    ref_t = r * np.sqrt((gl - 1) / (gl - r**2))
+    t_ref = time.perf_counter() - t0
+    diag = diagnosticos_regressao(df, res)
+    assert np.allclose(diag["alavancagem"].to_numpy(), ref_h, rtol=1e-8, atol=1e-15)
+    assert np.allclose(diag["residuo_studentizado"].to_numpy(), ref_t, rtol=1e-8)
+    assert np.allclose(diag["distancia_cook"].to_numpy(), ref_cook, rtol=1e-8, atol=1e-15)
+
+    _report(f"diagnosticos n={n:,} p={p + 1}", t_ref, _timeit(lambda: diagnosticos_regressao(df, res), repeat=1))
+
+
+def bench_triagem_alvo() -> None:
+    """Triagem contra um KPI em lotes vs um teste do SciPy por coluna."""
+    from scipy import stats
+
+    from pytab_app.modules.triagem_alvo import triagem_alvo
+
+    rng = np.random.default_rng(SEED)
+    n, p_num, p_cat = 20_000, 4_000, 1_000
+    X = rng.normal(size=(n, p_num))
+    colunas = {f"x{i}": X[:, i] for i in range(p_num)}
+    colunas.update({f"c{i}": pd.Categorical(rng.integers(0, 8, n)) for i in range(p_cat)})
+    colunas["kpi"] = X[:, 0] + rng.normal(size=n)
+    df = pd.DataFrame(colunas)
+    y = df["kpi"].to_numpy()
+
+    def ref():
+        out = {}
+        for i in range(p_num):
+            out[f"x{i}"] = stats.pearsonr(X[:, i], y).pvalue
+        for i in range(p_cat):
+            codigos = df[f"c{i}"].cat.codes.to_numpy()
+            out[f"c{i}"] = stats.f_oneway(*[y[codigos == k] for k in range(8)]).pvalue
+        return pd.Series(out)
+
+    t0 = time.perf_counter()
+    esperado = ref()
+    t_ref = time.perf_counter() - t0
+    res = triagem_alvo(df, "kpi", correcao=None).set_index("coluna")["p_value"]
+    assert np.allclose(res.loc[esperado.index], esperado, rtol=1e-6, atol=1e-12)
+
+    _report(
+        f"triagem KPI n={n:,} colunas={p_num + p_cat:,}",
+        t_ref,
+        _timeit(lambda: triagem_alvo(df, "kpi"), repeat=1),
+    )
+
+
+_BENCHMARKS: Dict[str, Callable[[], None]] = {
+    "anova_oneway": bench_anova_oneway,
+    "poder_amostral": bench_poder_amostral,
+    "correlacao_pearson": bench_correlacao_pearson,
+    "correlacao_postos": bench_correlacao_postos,
+    "correlacao_topk": bench_correlacao_topk,
+    "correlacao_blocos": bench_correlacao_blocos,
+    "correlacao_parcial": bench_correlacao_parcial,
+    "triagem_alvo": bench_triagem_alvo,
+    "pareto_alta_cardinalidade": bench_pareto_alta_cardinalidade,
+    "pareto_cubo": bench_pareto_cubo,
+    "pareto_tendencia": bench_pareto_tendencia,
+    "pareto_contagem": bench_pareto_contagem,
+    "regressao_multipla": bench_regressao_multipla,
+    "regressao_logistica": bench_regressao_logistica,
+    "regressao_incremental": bench_regressao_incremental,
+    "regressao_diagnosticos": bench_regressao_diagnosticos,
+}
+
+
+# ================================
+# MAIN
+# ================================
+
+def main(filtro: str = "") -> None:
+    for nome, fn in _BENCHMARKS.items():
+        if filtro and filtro not in nome:
+            continue
+        fn()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else "")
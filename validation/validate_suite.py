@@ -21,6 +21,20 @@ from pytab_app.modules.testes_estatisticos import (
     teste_quiquadrado as pytab_chi_square,
     teste_normalidade as pytab_normality,
 )
+from pytab_app.modules.regressao import (
+    acumular_mmq as pytab_accumulate_ols,
+    diagnosticos_regressao as pytab_regression_diagnostics,
+    regressao_de_mmq as pytab_ols_from_accumulator,
+    regressao_logistica as pytab_logistic_regression,
+    regressao_multipla as pytab_multiple_regression,
+)
+from pytab_app.modules.correlacoes import (
+    acumular_comomentos as pytab_accumulate_comoments,
+    correlacao_de_comomentos as pytab_corr_from_comoments,
+    matriz_correlacao as pytab_corr_matrix,
+)
+from pytab_app.modules.pareto import tendencia_pareto as pytab_pareto_trend
+from pytab_app.modules.aggregation import _PERIODICITY_TO_RULE
 
 
 # ================================
@@ -623,6 +637,222 @@ def _mixed(df: pd.DataFrame, expected: dict) -> Dict[str, Any]:
     return {"type": expected["type"], "status": _status_rollup(checks), "checks": checks, "got": got}
 
 
+def _apply_category_order(df: pd.DataFrame, expected: dict) -> pd.DataFrame:
+    """Converte para category (ordenada) as colunas de `category_order`."""
+    df = df.copy()
+    for col, levels in (expected.get("category_order") or {}).items():
+        df[col] = pd.Categorical(df[col], categories=levels, ordered=True)
+    return df
+
+
+def _statsmodels_term(term: str, predictors: list) -> str:
+    """Nome do termo PyTab (`col[nivel]`, `Intercepto`) no padrão do statsmodels/patsy."""
+    if term == "Intercepto":
+        return "Intercept"
+    col, _, level = term.partition("[")
+    if level and col in predictors:
+        return f"C({col})[T.{level[:-1]}]"
+    return term
+
+
+def _regression_chunked(df: pd.DataFrame, expected: dict) -> Dict[str, Any]:
+    """
+    OLS acumulado em blocos (`acumular_mmq` + `regressao_de_mmq`) vs o ajuste
+    em memória e vs statsmodels, com blocos que não veem todos os níveis.
+    """
+    import statsmodels.formula.api as smf
+
+    target = expected["target"]
+    predictors = expected["predictors"]
+    categorical = expected.get("categorical", [])
+    size = int(expected["chunk_size"])
+    df = _apply_category_order(df, expected)
+
+    chunks = [df.iloc[i:i + size] for i in range(0, len(df), size)]
+    res = pytab_ols_from_accumulator(pytab_accumulate_ols(chunks, target, predictors))
+    ref = pytab_multiple_regression(df, target, predictors)
+
+    terms = [f"C({c})" if c in categorical else c for c in predictors]
+    sm_fit = smf.ols(f"{target} ~ " + " + ".join(terms), data=df).fit()
+
+    coefs = res["coeficientes"]
+    got = {
+        "terms": coefs.index.tolist(),
+        "coef": coefs["coef"].to_dict(),
+        "r2": res["r2"],
+        "n": res["n"],
+    }
+    checks = {
+        "terms": compare_list(got["terms"], ref["coeficientes"].index.tolist()),
+        "n": compare_numeric(res["n"], int(sm_fit.nobs), abs_tol=0, rel_tol=0),
+        "r2": compare_numeric(res["r2"], sm_fit.rsquared, abs_tol=1e-10),
+    }
+    for term, row in coefs.iterrows():
+        checks[f"coef_{term}"] = compare_numeric(
+            row["coef"], sm_fit.params[_statsmodels_term(term, categorical)], abs_tol=1e-8
+        )
+        checks[f"se_{term}"] = compare_numeric(
+            row["erro_padrao"], sm_fit.bse[_statsmodels_term(term, categorical)], abs_tol=1e-8
+        )
+
+    # o ajuste acumulado precisa servir para os diagnósticos sobre os mesmos dados
+    diag = pytab_regression_diagnostics(df, res)
+    checks["diagnostics_rows"] = compare_numeric(len(diag), int(sm_fit.nobs), abs_tol=0, rel_tol=0)
+
+    return {"type": expected["type"], "status": _status_rollup(checks), "checks": checks, "got": got}
+
+
+def _max_abs_error(got: Any, ref: Any) -> float:
+    """Maior erro absoluto entre dois vetores (NaN nas mesmas posições não conta)."""
+    g = np.asarray(got, dtype=float)
+    r = np.asarray(ref, dtype=float)
+    if g.shape != r.shape or not np.array_equal(np.isnan(g), np.isnan(r)):
+        return float("inf")
+    return float(np.nanmax(np.abs(g - r), initial=0.0))
+
+
+def _regression_multiple(df: pd.DataFrame, expected: dict) -> Dict[str, Any]:
+    """
+    `regressao_multipla` com uma coluna colinear (aliased) e
+    `diagnosticos_regressao` vs statsmodels OLS / OLSInfluence.
+    """
+    import statsmodels.formula.api as smf
+
+    target = expected["target"]
+    predictors = expected["predictors"]
+    categorical = expected.get("categorical", [])
+    aliased = expected.get("aliased", [])
+
+    res = pytab_multiple_regression(df, target, predictors)
+    terms = [f"C({c})" if c in categorical else c for c in predictors if c not in aliased]
+    data = df.dropna(subset=[target] + predictors)
+    sm_fit = smf.ols(f"{target} ~ " + " + ".join(terms), data=data).fit()
+
+    coefs = res["coeficientes"].drop(index=aliased)
+    got = {"aliased": res["aliased"], "coef": coefs["coef"].to_dict(), "r2_adj": res["r2_ajustado"]}
+    checks = {
+        "aliased": compare_list(res["aliased"], aliased),
+        "aliased_coef_nan": compare_exact(bool(res["coeficientes"].loc[aliased, "coef"].isna().all()), True),
+        "n": compare_numeric(res["n"], int(sm_fit.nobs), abs_tol=0, rel_tol=0),
+        "r2_adj": compare_numeric(res["r2_ajustado"], sm_fit.rsquared_adj, abs_tol=1e-10),
+        "f_stat": compare_numeric(res["f_stat"], sm_fit.fvalue, abs_tol=1e-8),
+        "p_value": compare_numeric(res["p_value"], sm_fit.f_pvalue, abs_tol=1e-12, rel_tol=1e-6),
+    }
+    for term, row in coefs.iterrows():
+        sm_term = _statsmodels_term(term, categorical)
+        checks[f"coef_{term}"] = compare_numeric(row["coef"], sm_fit.params[sm_term], abs_tol=1e-8)
+        checks[f"se_{term}"] = compare_numeric(row["erro_padrao"], sm_fit.bse[sm_term], abs_tol=1e-8)
+
+    diag = pytab_regression_diagnostics(df, res)
+    infl = sm_fit.get_influence()
+    checks["leverage"] = compare_numeric(_max_abs_error(diag["alavancagem"], infl.hat_matrix_diag), 0.0, abs_tol=1e-10)
+    checks["cooks_distance"] = compare_numeric(
+        _max_abs_error(diag["distancia_cook"], infl.cooks_distance[0]), 0.0, abs_tol=1e-10
+    )
+    checks["studentized_residuals"] = compare_numeric(
+        _max_abs_error(diag["residuo_studentizado"], infl.resid_studentized_external), 0.0, abs_tol=1e-8
+    )
+    checks["diagnostics_index"] = compare_list(diag.index.tolist(), data.index.tolist())
+
+    return {"type": expected["type"], "status": _status_rollup(checks), "checks": checks, "got": got}
+
+
+def _regression_logistic(df: pd.DataFrame, expected: dict) -> Dict[str, Any]:
+    """
+    `regressao_logistica` vs statsmodels Logit e, numa preditora que separa
+    os resultados perfeitamente, o sinal de separação.
+    """
+    import statsmodels.formula.api as smf
+
+    target = expected["target"]
+    success = expected["success"]
+    predictors = expected["predictors"]
+    categorical = expected.get("categorical", [])
+
+    res = pytab_logistic_regression(df, target, predictors, sucesso=success)
+    data = df.dropna(subset=[target] + predictors).assign(_y=lambda d: (d[target] == success).astype(int))
+    terms = [f"C({c})" if c in categorical else c for c in predictors]
+    sm_fit = smf.logit("_y ~ " + " + ".join(terms), data=data).fit(disp=0)
+
+    coefs = res["coeficientes"]
+    got = {"coef": coefs["coef"].to_dict(), "deviance": res["deviance"], "pseudo_r2": res["pseudo_r2"]}
+    checks = {
+        "converged": compare_exact(res["convergiu"], True),
+        "deviance": compare_numeric(res["deviance"], -2.0 * sm_fit.llf, abs_tol=1e-8),
+        "null_deviance": compare_numeric(res["deviance_nula"], -2.0 * sm_fit.llnull, abs_tol=1e-8),
+        "pseudo_r2": compare_numeric(res["pseudo_r2"], sm_fit.prsquared, abs_tol=1e-10),
+        "p_value": compare_numeric(res["p_value"], sm_fit.llr_pvalue, abs_tol=1e-12, rel_tol=1e-6),
+    }
+    for term, row in coefs.iterrows():
+        sm_term = _statsmodels_term(term, categorical)
+        checks[f"coef_{term}"] = compare_numeric(row["coef"], sm_fit.params[sm_term], abs_tol=1e-7)
+        checks[f"se_{term}"] = compare_numeric(row["erro_padrao"], sm_fit.bse[sm_term], abs_tol=1e-7)
+        checks[f"odds_ratio_{term}"] = compare_numeric(row["odds_ratio"], np.exp(sm_fit.params[sm_term]), abs_tol=1e-7)
+
+    separated = pytab_logistic_regression(df, target, [expected["separating_predictor"]], sucesso=success)
+    got["separation"] = separated["separacao"]
+    checks["separation_flag"] = compare_exact(separated["separacao"], True)
+    checks["separation_deviance"] = compare_numeric(separated["deviance"], 0.0, abs_tol=1e-3)
+
+    return {"type": expected["type"], "status": _status_rollup(checks), "checks": checks, "got": got}
+
+
+def _correlation_chunked(df: pd.DataFrame, expected: dict) -> Dict[str, Any]:
+    """Correlação por co-momentos acumulados em blocos vs `matriz_correlacao` e pandas."""
+    cols = expected["columns"]
+    size = int(expected["chunk_size"])
+
+    chunks = [df.iloc[i:i + size] for i in range(0, len(df), size)]
+    corr = pytab_corr_from_comoments(pytab_accumulate_comoments(chunks, cols))
+    ref = pytab_corr_matrix(df, cols)
+    pd_corr = df[cols].corr()
+
+    got = {"correlation": corr.to_dict()}
+    checks = {"columns": compare_list(corr.columns.tolist(), cols)}
+    for i, a in enumerate(cols):
+        for b in cols[i + 1:]:
+            checks[f"corr_{a}__{b}"] = compare_numeric(corr.loc[a, b], ref.loc[a, b], abs_tol=1e-6)
+            checks[f"pandas_{a}__{b}"] = compare_numeric(corr.loc[a, b], pd_corr.loc[a, b], abs_tol=1e-6)
+
+    return {"type": expected["type"], "status": _status_rollup(checks), "checks": checks, "got": got}
+
+
+def _pareto_trend(df: pd.DataFrame, expected: dict) -> Dict[str, Any]:
+    """`tendencia_pareto` em todas as periodicidades vs groupby + resample do pandas."""
+    date_col = expected["date_column"]
+    cat = expected["category_column"]
+    val = expected.get("value_column")
+
+    data = df.assign(**{date_col: pd.to_datetime(df[date_col])})
+    data = data.dropna(subset=[date_col, cat] + ([val] if val else []))
+    values = data[val] if val else pd.Series(1.0, index=data.index)
+
+    checks: Dict[str, Any] = {}
+    got: Dict[str, Any] = {}
+    for periodicity, rule in _PERIODICITY_TO_RULE.items():
+        res = pytab_pareto_trend(df, date_col, cat, val, periodicity, top_n=int(expected.get("top_n", 5)))
+        serie = res["serie"]
+
+        by_period = values.groupby(data[date_col]).sum().resample(rule).sum()
+        counts = values.groupby(data[date_col]).count().resample(rule).sum()
+        by_period = by_period[counts > 0]
+        by_cat = values.groupby([data[cat], data[date_col]]).sum()
+        ref = by_cat.groupby(level=0).resample(rule, level=1).sum()
+
+        ref_values = [ref.get((c, p), 0.0) for c, p in zip(serie["categoria"], serie["periodo"])]
+        leaders = ref.unstack(0).fillna(0.0).loc[by_period.index].idxmax(axis=1)
+
+        got[periodicity] = {"periods": len(res["totais"]), "leaders": res["lideres"].tolist()}
+        checks[f"{periodicity}_periods"] = compare_list(
+            [str(p) for p in res["totais"].index], [str(p) for p in by_period.index]
+        )
+        checks[f"{periodicity}_totals"] = compare_numeric(_max_abs_error(res["totais"], by_period), 0.0, abs_tol=1e-8)
+        checks[f"{periodicity}_values"] = compare_numeric(_max_abs_error(serie["valor"], ref_values), 0.0, abs_tol=1e-8)
+        checks[f"{periodicity}_leaders"] = compare_list(res["lideres"].tolist(), leaders.tolist())
+
+    return {"type": expected["type"], "status": _status_rollup(checks), "checks": checks, "got": got}
+
+
 # ================================
 # MAIN
 # ================================
@@ -642,6 +872,11 @@ _VALIDATORS = {
     "xbar_r_chart": _xbar_r_chart,
     "imr_chart": _imr_chart,
     "mixed": _mixed,
+    "regression_chunked": _regression_chunked,
+    "regression_multiple": _regression_multiple,
+    "regression_logistic": _regression_logistic,
+    "correlation_chunked": _correlation_chunked,
+    "pareto_trend": _pareto_trend,
 }
 
 